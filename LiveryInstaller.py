@@ -3,8 +3,12 @@
 import os
 import sys
 import zipfile
+import io
+import struct
+import zlib
 import shutil
 import json
+import hashlib
 import re # Keep re for various tasks including layout generation
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
@@ -14,8 +18,11 @@ import subprocess # For running ptp_converter.exe
 import configparser
 from datetime import datetime
 import threading
+import queue
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
 
 # --- Helper function to find resources (for PyInstaller) ---
 def get_resource_path(relative_path: str) -> str:
@@ -32,8 +39,16 @@ def get_resource_path(relative_path: str) -> str:
 # --- Constants ---
 CONFIG_DIR_NAME = ".pmdg_livery_installer"
 CONFIG_FILE_NAME = "config.json"
+INSTALLED_ARCHIVES_FILE_NAME = "installed_archives.json" # Fingerprints of installed archives and the livery folders they produced
+INSTALLED_ARCHIVES_FORMAT = 1
 DEFAULT_MIN_GAME_VERSION = "1.37.19"
 PTP_CONVERTER_EXE_NAME = "ptp_converter.exe"
+PTP_CONVERTER_ENV_VAR = "PMDG_PTP_CONVERTER" # Overrides the bundled converter, e.g. with tools/fake_ptp_converter.py off Windows
+PTP_CONVERTER_BASE_TIMEOUT = 120 # Seconds a converter run may take, plus PTP_CONVERTER_TIMEOUT_PER_MB per MB of PTP
+PTP_CONVERTER_TIMEOUT_PER_MB = 1.0
+PTP_CONVERTER_POLL_INTERVAL = 0.5
+PTP_CONVERTER_SLOW_SECONDS = 60 # Runs slower than this are listed in the batch summary
+PTP_CONVERTER_FATAL_PATTERNS = ("error: system.applicationexception: cab extraction error", "invalid parameters passed to extraction function")
 
 # Base folder names in Community for livery packages
 VARIANT_PACKAGE_MAP = {
@@ -122,6 +137,554 @@ def _unix_to_filetime(unix_ts) -> int:
         print(f"Warning: Invalid timestamp encountered: {unix_ts}. Using current time.")
         return int((time.time() + SEC_TO_UNIX_EPOCH) * WINDOWS_TICKS)
 
+# Names skipped when deciding whether an archive has a single root folder (same rule as on extracted folders)
+ARCHIVE_SKIP_PREFIXES = ('.', '__MACOSX', '__temp_')
+ARCHIVE_EXTENSIONS = ('.zip', '.ptp')
+ZIP_PROBE_MAX_MEMBER_READ = 1024 * 1024 # Descriptor files bigger than this are not read by the probe
+ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+COPY_CHUNK_SIZE = 32 * 1024 * 1024 # Files bigger than this are copied as several byte ranges in parallel
+COPY_PROGRESS_INTERVAL = 0.5 # Seconds between status bar updates while copying
+DEFAULT_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+MAX_EXTRACT_WORKERS = 32
+PARALLEL_EXTRACT_MIN_BYTES = 16 * 1024 * 1024 # Smaller archives are inflated on a single thread
+ZIP_LOCAL_HEADER_SIZE = 30
+NESTED_ZIP_MEMORY_LIMIT = 64 * 1024 * 1024 # Nested ZIPs up to this size are read into memory, larger ones spooled to a temp file
+PTP_EXPANSION_FACTOR = 1.5 # Preflight: unpacked content of a PTP (or nested ZIP) is assumed this much bigger than the archive
+PREFLIGHT_FREE_SPACE_MARGIN = 1024 * 1024 * 1024 # Preflight warns when a batch would leave less than this free on a volume
+DEFAULT_INSTALL_THROUGHPUT = 50 * 1024 * 1024 # Bytes/s assumed for the time estimate until a batch has been measured
+MAX_NESTED_ARCHIVE_DEPTH = 4 # Packs nested deeper than this (ZIP in ZIP in ZIP...) are reported as errors
+DEFAULT_PACK_WORKERS = min(4, os.cpu_count() or 1)
+MAX_PACK_WORKERS = 16
+PTP_CACHE_DIR_NAME = "ptp_cache" # Under CONFIG_DIR_NAME: reorganized PTP output, one entry per PTP content hash
+PTP_CACHE_ENTRY_FILE_NAME = "entry.json"
+PTP_CACHE_FORMAT = 1 # Bump when _reorganize_ptp_output changes its output; entries of other formats are ignored
+DEFAULT_PTP_CACHE_MAX_MB = 4096
+MAX_PTP_CACHE_MAX_MB = 1024 * 1024
+LAYOUT_RECORDS_DIR_NAME = "layout_records" # Under CONFIG_DIR_NAME: per-livery layout.json entries of each package, see _generate_layout_file
+LAYOUT_RECORDS_FORMAT = 1
+LAYOUT_SCAN_WORKERS = 8 # Livery folders scanned at the same time for layout.json (I/O bound, so more than the CPU count helps on slow drives)
+STALE_TEMP_MAX_AGE_SECONDS = 6 * 3600 # Staging folders older than this at startup are left over from a crashed or killed run
+STALE_TEMP_PACKAGE_PREFIXES = ("__temp_", "__ptp_staged_content_") # In package roots and their SimObjects/Airplanes folders
+STALE_TEMP_SYSTEM_PREFIXES = ("pmdg_ptp_input_", "pmdg_dry_run_") # In the system temp folder
+DEDUPE_STORE_DIR_NAME = "__dedupe_store" # In the package root: one hardlink per distinct texture content, named by SHA-256; not in layout.json
+DEDUPE_HASH_CACHE_FILE_NAME = "dedupe_hash_cache.json" # Under CONFIG_DIR_NAME: texture hashes by path, reused while size and mtime match
+DEDUPE_HASH_CACHE_FORMAT = 1
+DEDUPE_FILE_EXTENSIONS = ('.dds', '.ktx2') # Only textures are linked; texture.cfg and other small text files are edited in place
+DEDUPE_MIN_FILE_SIZE = 64 * 1024
+DEDUPE_HASH_WORKERS = min(8, os.cpu_count() or 1)
+DEDUPE_TEMP_SUFFIX = ".__dedupe_tmp" # Link being swapped in over a duplicate; leftovers of an interrupted run are removed on the next one
+
+# PTP files are Microsoft cabinets, possibly behind a short header; see _read_cab_directory
+CAB_SIGNATURE = b"MSCF"
+CAB_SEARCH_LIMIT = 64 * 1024 # How far into a PTP the cabinet header is looked for
+CAB_HEADER_SIZE = 36
+CAB_COMPRESSION_NONE = 0
+CAB_COMPRESSION_MSZIP = 1
+CAB_MSZIP_WINDOW = 32 * 1024 # MSZIP blocks may refer back to this much output of the previous block
+
+# Root-level livery files that are handled separately (or are PTP specific) and never copied as "extras"
+LIVERY_EXCLUDED_ROOT_FILES = ("aircraft.cfg", "options.ini", "layout.json", "manifest.json",
+                              "config.cfg", "aircraft.ini", "settings.dat", "model.cfg")
+# Extra root-level files copied next to aircraft.cfg (panel.cfg, sound.cfg, fonts, ...)
+LIVERY_EXTRA_FILE_EXTENSIONS = ('.cfg', '.xml', '.dat', '.txt', '.flags', '.ttf', '.otf', '.ini', '.sound', '.air', '.flt', '.fdm')
+# Package files never written into a livery folder, wherever they appear in an archive
+LIVERY_SKIPPED_MEMBER_NAMES = ("layout.json", "manifest.json")
+
+def _parse_cfg_title(cfg_content: str) -> str | None:
+    """Returns the title from aircraft.cfg content, preferring the one in [FLTSIM.0]."""
+    fltsim_match = re.search(r'\[FLTSIM\.0\].*?title\s*=\s*"(.*?)"', cfg_content, re.DOTALL | re.IGNORECASE)
+    if fltsim_match and fltsim_match.group(1).strip():
+        return fltsim_match.group(1).strip()
+    simple_match = re.search(r'^\s*title\s*=\s*"(.*?)"', cfg_content, re.MULTILINE | re.IGNORECASE)
+    if simple_match and simple_match.group(1).strip():
+        return simple_match.group(1).strip()
+    return None
+
+def _parse_cfg_atc_id(cfg_content: str) -> str | None:
+    """Returns the filesystem-safe atc_id of [FLTSIM.0] from aircraft.cfg content."""
+    fltsim0_match = re.search(r'\[fltsim\.0\](.*?)(\n\s*\[|$)', cfg_content, re.DOTALL | re.IGNORECASE)
+    if fltsim0_match:
+        section_content = fltsim0_match.group(1)
+        atc_id_match = re.search(r'^\s*atc_id\s*=\s*"?([a-zA-Z0-9_.\- ]+)"?', section_content, re.MULTILINE | re.IGNORECASE)
+        if atc_id_match and atc_id_match.group(1).strip():
+            safe_atc_id = re.sub(r'[\\/*?:"<>|]', '_', atc_id_match.group(1).strip())
+            if safe_atc_id: return safe_atc_id
+    return None
+
+def _zip_children(member_paths: list[str], prefix: str) -> dict[str, bool]:
+    """Direct children (name -> is_dir) of the folder 'prefix' inside a ZIP, from its member paths."""
+    children: dict[str, bool] = {}
+    for member_path in member_paths:
+        if not member_path.startswith(prefix): continue
+        head, sep, _ = member_path[len(prefix):].partition('/')
+        if head:
+            children[head] = children.get(head, False) or bool(sep)
+    return children
+
+def _plan_livery_zip_members(member_paths: list[str], livery_root: str, texture_folders: list[str],
+                             atc_id: str | None) -> tuple[list[tuple[str, str]], str | None]:
+    """
+    Maps the members of a single-livery ZIP to paths relative to its SimObjects/Airplanes/<livery> folder,
+    using the same selection rules as the staged copy (aircraft.cfg, model*, texture.*, root extras).
+    Returns ([(member path, relative destination)], member path of the .ini meant for LocalState or None).
+    Directory entries keep their trailing '/'. Members outside 'livery_root' and __MACOSX entries are skipped.
+    """
+    texture_folders_rel = [folder[len(livery_root):] for folder in texture_folders if folder.startswith(livery_root)]
+    excluded_root_files = set(LIVERY_EXCLUDED_ROOT_FILES)
+    if atc_id: excluded_root_files.add(f"{atc_id}.ini".lower())
+
+    planned: list[tuple[str, str]] = []
+    ini_candidates: list[str] = []
+    for member_path in member_paths:
+        if not member_path.startswith(livery_root): continue
+        rel_path = member_path[len(livery_root):]
+        parts = rel_path.split('/')
+        if not rel_path or any(part.startswith(('__MACOSX', '__temp_')) or part == '..' for part in parts): continue
+        name_lower = parts[-1].lower()
+        if name_lower in LIVERY_SKIPPED_MEMBER_NAMES: continue
+        if name_lower == "options.ini" or (atc_id and name_lower == f"{atc_id}.ini".lower()):
+            ini_candidates.append(member_path)
+
+        destinations: list[str] = []
+        if len(parts) == 1: # File next to aircraft.cfg
+            if name_lower == "aircraft.cfg":
+                destinations.append("aircraft.cfg")
+            elif name_lower not in excluded_root_files and os.path.splitext(name_lower)[1] in LIVERY_EXTRA_FILE_EXTENSIONS:
+                destinations.append(parts[0])
+        else:
+            if parts[0].lower().startswith("model"):
+                destinations.append(rel_path)
+            for texture_folder_rel in texture_folders_rel:
+                if rel_path.startswith(texture_folder_rel):
+                    texture_dest = texture_folder_rel.rstrip('/').rsplit('/', 1)[-1] + '/' + rel_path[len(texture_folder_rel):]
+                    if texture_dest not in destinations: destinations.append(texture_dest)
+        planned.extend((member_path, destination) for destination in destinations)
+
+    # Same preference as the staged copy: options.ini first, then a pre-named <atc_id>.ini (shallowest first)
+    ini_candidates.sort(key=lambda p: (p.rsplit('/', 1)[-1].lower() != "options.ini", p.count('/'), p.lower()))
+    ini_member = next((p for p in ini_candidates if not p.endswith('/')), None)
+    return planned, ini_member
+
+def _open_zip_source(zip_source: Path | bytes) -> zipfile.ZipFile:
+    """Opens a ZIP given as a path or as in-memory bytes (e.g. a ZIP read from inside another ZIP)."""
+    return zipfile.ZipFile(io.BytesIO(zip_source) if isinstance(zip_source, (bytes, bytearray)) else zip_source, 'r')
+
+def _zip_stored_member_span(raw_zip_file, member_info: zipfile.ZipInfo) -> tuple[int, int] | None:
+    """
+    (data_offset, length) of a STORED, unencrypted member, read from its local file header in the open binary
+    'raw_zip_file'. None when the member is compressed (or the header looks wrong) and must go through zipfile.
+    """
+    if member_info.compress_type != zipfile.ZIP_STORED or member_info.flag_bits & 0x1:
+        return None
+    raw_zip_file.seek(member_info.header_offset)
+    local_header = raw_zip_file.read(ZIP_LOCAL_HEADER_SIZE)
+    if len(local_header) != ZIP_LOCAL_HEADER_SIZE or local_header[:4] != b"PK\x03\x04":
+        return None
+    name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    return member_info.header_offset + ZIP_LOCAL_HEADER_SIZE + name_length + extra_length, member_info.compress_size
+
+def _copy_file_byte_range(src_file, dst_file, offset: int, count: int) -> None:
+    """
+    Copies 'count' bytes at 'offset' of 'src_file' to the current position of the unbuffered 'dst_file'.
+    Uses os.copy_file_range / os.sendfile so the data never enters Python; falls back to a buffered copy
+    where the OS (e.g. Windows) or the filesystem does not support them.
+    """
+    src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < count:
+                chunk_copied = os.copy_file_range(src_fd, dst_fd, count - copied, offset + copied)
+                if chunk_copied == 0: break
+                copied += chunk_copied
+        except OSError:
+            pass # Unsupported filesystem / cross-device on older kernels: continue below from where it stopped
+    if copied < count and hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        try:
+            while copied < count:
+                chunk_copied = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+                if chunk_copied == 0: break
+                copied += chunk_copied
+        except OSError:
+            pass
+    if copied < count:
+        src_file.seek(offset + copied)
+        while copied < count:
+            chunk = src_file.read(min(ZIP_COPY_BUFFER_SIZE, count - copied))
+            if not chunk: break
+            dst_file.write(chunk)
+            copied += len(chunk)
+    if copied < count:
+        raise zipfile.BadZipFile(f"ZIP data ends {count - copied} bytes early")
+
+def _index_livery_tree(root: Path, max_depth: int | None = None) -> dict:
+    """
+    Indexes the tree below 'root' in one os.scandir pass, in os.walk (top-down) order and skipping '__temp_*'
+    folders like the find_* helpers do: 'files'/'dirs' map lowercase names to paths, 'dirs_by_prefix' maps the
+    lowercase name up to its first '.' (e.g. 'texture.') to folder paths, 'sizes' maps file paths to sizes.
+    'max_depth' limits how many folder levels are listed (1: only the children of 'root').
+    """
+    tree_index = {'root': str(root), 'files': {}, 'dirs': {}, 'dirs_by_prefix': {}, 'sizes': {}}
+    pending_dirs = [(str(root), 1)]
+    while pending_dirs:
+        dir_path, depth = pending_dirs.pop()
+        try:
+            with os.scandir(dir_path) as dir_entries:
+                dir_entries = list(dir_entries)
+        except OSError:
+            continue
+        child_dirs = []
+        for dir_entry in dir_entries:
+            name_lower = dir_entry.name.lower()
+            try:
+                is_dir = dir_entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if dir_entry.name.startswith("__temp_"): continue
+                tree_index['dirs'].setdefault(name_lower, []).append(dir_entry.path)
+                if '.' in name_lower:
+                    tree_index['dirs_by_prefix'].setdefault(name_lower[:name_lower.index('.') + 1], []).append(dir_entry.path)
+                if not dir_entry.is_symlink() and (max_depth is None or depth < max_depth):
+                    child_dirs.append((dir_entry.path, depth + 1))
+            else:
+                tree_index['files'].setdefault(name_lower, []).append(dir_entry.path)
+                try:
+                    tree_index['sizes'][dir_entry.path] = dir_entry.stat().st_size
+                except OSError:
+                    pass
+        pending_dirs.extend(reversed(child_dirs)) # First child is walked next, as in os.walk
+    return tree_index
+
+def _tree_index_lookup(tree_index: dict, table: str, key: str, directory: Path) -> list[str] | None:
+    """Paths in tree_index[table][key] at or below 'directory', in walk order; None if 'directory' is not in the indexed tree."""
+    directory_str = str(directory)
+    indexed_paths = tree_index[table].get(key, [])
+    if directory_str == tree_index['root']:
+        return list(indexed_paths)
+    if not directory_str.startswith(tree_index['root'] + os.sep):
+        return None
+    if any(part.startswith("__temp_") for part in directory_str[len(tree_index['root']) + 1:].split(os.sep)):
+        return None # Not indexed
+    return [path for path in indexed_paths if path.startswith(directory_str + os.sep)]
+
+def _write_layout_json(layout_json_path: Path, content_entries: list, compact: bool = False):
+    """
+    Streams sorted (path, size, date) entries to layout.json without building the whole document in memory.
+    The default output is byte for byte what json.dump(..., indent=4) writes; 'compact' drops all whitespace
+    (one entry per line), which MSFS reads the same way and which is about 40% smaller.
+    """
+    with open(layout_json_path, 'w', encoding='utf-8', newline='\n') as f_out:
+        if not content_entries:
+            f_out.write('{"content":[]}' if compact else '{\n    "content": []\n}')
+            return
+        if compact:
+            f_out.write('{"content":[\n')
+            entry_format, entry_separator = '{{"path":{},"size":{},"date":{}}}', ',\n'
+        else:
+            f_out.write('{\n    "content": [\n')
+            entry_format = '        {{\n            "path": {},\n            "size": {},\n            "date": {}\n        }}'
+            entry_separator = ',\n'
+        for entry_index, (path, size, date) in enumerate(content_entries):
+            if entry_index: f_out.write(entry_separator)
+            f_out.write(entry_format.format(json.dumps(path), size, date))
+        f_out.write('\n]}' if compact else '\n    ]\n}')
+
+def _folder_copy_pairs(source_dir: Path, dest_dir: Path) -> list[tuple[Path, Path]]:
+    """Creates the folder tree of 'source_dir' under 'dest_dir' (empty folders too, like copytree) and returns its (source, target) file pairs."""
+    file_pairs = []
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for dir_path, dir_names, file_names in os.walk(source_dir):
+        target_dir = dest_dir / Path(dir_path).relative_to(source_dir)
+        for dir_name in dir_names:
+            (target_dir / dir_name).mkdir(exist_ok=True)
+        file_pairs.extend((Path(dir_path) / file_name, target_dir / file_name) for file_name in file_names)
+    return file_pairs
+
+def _copy_files(file_pairs: list[tuple[Path, Path]], workers: int = 1, on_file_copied: Callable[[Path], None] | None = None,
+                on_bytes_copied: Callable[[int], None] | None = None) -> int:
+    """
+    Copies (source, target) file pairs like shutil.copy2, on up to 'workers' threads. Files bigger than COPY_CHUNK_SIZE
+    are split into byte ranges copied concurrently into the preallocated target (see _copy_file_byte_range).
+    An existing target is unlinked first, never rewritten in place (it may be hardlinked elsewhere).
+    'on_bytes_copied(n)' is called after each file or range, 'on_file_copied(target)' once per finished file, both
+    from worker threads. Returns the number of bytes copied; the first error is raised once the other workers stop.
+    """
+    copy_tasks: list[tuple[Path, Path, int, int]] = [] # (source, target, offset, length)
+    ranges_left: dict[Path, int] = {}
+    chunked_targets: set[Path] = set() # Preallocated; ranges are written into them in place
+    for source_path, target_path in file_pairs:
+        file_size = os.stat(source_path).st_size
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.unlink(missing_ok=True)
+        if file_size > COPY_CHUNK_SIZE and workers > 1:
+            with open(target_path, 'wb') as target_file:
+                target_file.truncate(file_size)
+            offsets = range(0, file_size, COPY_CHUNK_SIZE)
+            copy_tasks.extend((source_path, target_path, offset, min(COPY_CHUNK_SIZE, file_size - offset)) for offset in offsets)
+            ranges_left[target_path] = len(offsets)
+            chunked_targets.add(target_path)
+        else:
+            copy_tasks.append((source_path, target_path, 0, file_size))
+            ranges_left[target_path] = 1
+
+    ranges_left_lock = threading.Lock()
+    abort_copy = threading.Event()
+    def copy_range(source_path: Path, target_path: Path, offset: int, length: int) -> int:
+        if abort_copy.is_set(): return 0
+        with open(source_path, 'rb') as source_file, open(target_path, 'r+b' if target_path in chunked_targets else 'wb', buffering=0) as target_file:
+            target_file.seek(offset)
+            _copy_file_byte_range(source_file, target_file, offset, length)
+        if on_bytes_copied: on_bytes_copied(length)
+        with ranges_left_lock:
+            ranges_left[target_path] -= 1
+            file_done = ranges_left[target_path] == 0
+        if file_done:
+            shutil.copystat(source_path, target_path)
+            if on_file_copied: on_file_copied(target_path)
+        return length
+
+    worker_count = max(1, min(workers, len(copy_tasks)))
+    if worker_count == 1:
+        return sum(copy_range(*copy_task) for copy_task in copy_tasks)
+    copied_bytes = 0
+    # Largest ranges first, so a big texture does not start last
+    copy_tasks.sort(key=lambda copy_task: copy_task[3], reverse=True)
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="file_copy") as copy_pool:
+        copy_futures = [copy_pool.submit(copy_range, *copy_task) for copy_task in copy_tasks]
+        try:
+            for copy_future in as_completed(copy_futures): copied_bytes += copy_future.result()
+        except BaseException:
+            abort_copy.set() # Queued ranges return at once; running ones finish their range
+            raise
+    return copied_bytes
+
+def _stage_file_alias(source_path: Path, alias_path: Path) -> str:
+    """
+    Makes 'alias_path' a name for 'source_path' without copying its data where possible: a hardlink (same volume),
+    else a symlink (may need Developer Mode on Windows), else a real copy. Returns 'hardlink', 'symlink' or 'copy'.
+    """
+    try:
+        os.link(source_path, alias_path)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        os.symlink(source_path.resolve(), alias_path)
+        return "symlink"
+    except (OSError, NotImplementedError):
+        pass
+    _copy_files([(source_path, alias_path)])
+    return "copy"
+
+def _directory_size(directory: Path) -> int:
+    """Total size of the files below 'directory' (0 if it does not exist)."""
+    total_size = 0
+    for dir_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            try:
+                total_size += os.stat(os.path.join(dir_path, file_name), follow_symlinks=False).st_size
+            except OSError:
+                pass
+    return total_size
+
+def _file_sha256(file_path: Path) -> str:
+    """Hex SHA-256 of a file's content, read in ZIP_COPY_BUFFER_SIZE chunks."""
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(ZIP_COPY_BUFFER_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+def _file_crc32(file_path: Path) -> int:
+    """CRC-32 of a file's content, the same checksum a ZIP stores per member."""
+    crc = 0
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(ZIP_COPY_BUFFER_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+def _zip_member_target(base_dir: Path, member_path: str) -> Path:
+    """
+    Target path of a member below base_dir, with the same name cleanup as ZipFile.extract: '\\' separates folders
+    too, and empty, '.' and '..' parts are dropped, so the result never leaves base_dir whatever the member name.
+    """
+    parts = [part for part in member_path.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    if os.name == 'nt':
+        parts = [re.sub(r'[:<>|"?*]', '_', part).rstrip('.') or '_' for part in parts]
+    return base_dir.joinpath(*parts)
+
+def _zip_single_root_prefix(member_paths: list[str], prefix: str = "") -> str:
+    """Descends into a lone top-level folder, mirroring what is done on extracted archives."""
+    children = _zip_children(member_paths, prefix)
+    if len(children) == 1:
+        (name, is_dir), = children.items()
+        if is_dir and not name.startswith(ARCHIVE_SKIP_PREFIXES):
+            return f"{prefix}{name}/"
+    return prefix
+
+def _read_cab_cstring(cab_file) -> bytes:
+    raw_string = bytearray()
+    while True:
+        char = cab_file.read(1)
+        if char in (b"", b"\0"): return bytes(raw_string)
+        raw_string += char
+
+def _read_cab_directory(cab_file) -> dict:
+    """
+    Reads the folder and file tables of the Microsoft cabinet inside a PTP, whose 'MSCF' header is looked for
+    in the first CAB_SEARCH_LIMIT bytes. Returns {'data_reserve', 'folders', 'files'}: folders are
+    (first data block offset, block count, compression type), files are dicts with 'name', 'size',
+    'folder', 'offset' (in the folder's uncompressed stream) and 'mtime'.
+    Raises ValueError for anything other than a single, self-contained cabinet.
+    """
+    cab_file.seek(0)
+    cab_base = cab_file.read(CAB_SEARCH_LIMIT).find(CAB_SIGNATURE)
+    if cab_base < 0:
+        raise ValueError("no cabinet header found")
+    cab_file.seek(cab_base)
+    header = cab_file.read(CAB_HEADER_SIZE)
+    if len(header) != CAB_HEADER_SIZE:
+        raise ValueError("truncated cabinet header")
+    (_, _, _, _, files_offset, _, version_minor, version_major,
+     folder_count, file_count, flags, _, _) = struct.unpack("<4sIIIIIBBHHHHH", header)
+    if version_major != 1:
+        raise ValueError(f"unsupported cabinet version {version_major}.{version_minor}")
+    if flags & 0x0003:
+        raise ValueError("cabinet is split over several files")
+    folder_reserve = data_reserve = 0
+    if flags & 0x0004: # Per-cabinet, per-folder and per-block reserved areas
+        header_reserve, folder_reserve, data_reserve = struct.unpack("<HBB", cab_file.read(4))
+        cab_file.seek(header_reserve, os.SEEK_CUR)
+
+    folders = []
+    for _ in range(folder_count):
+        data_offset, data_block_count, compression = struct.unpack("<IHH", cab_file.read(8))
+        cab_file.seek(folder_reserve, os.SEEK_CUR)
+        folders.append((cab_base + data_offset, data_block_count, compression & 0x000F))
+
+    cab_file.seek(cab_base + files_offset)
+    files = []
+    for _ in range(file_count):
+        file_size, folder_offset, folder_index, dos_date, dos_time, attributes = struct.unpack("<IIHHHH", cab_file.read(16))
+        raw_name = _read_cab_cstring(cab_file)
+        if folder_index >= folder_count: # 0xFFFD-0xFFFF: continued from/to another cabinet
+            raise ValueError(f"file {raw_name!r} continues in another cabinet")
+        try:
+            mtime = datetime(1980 + (dos_date >> 9), (dos_date >> 5) & 0x0F, dos_date & 0x1F,
+                             dos_time >> 11, (dos_time >> 5) & 0x3F, (dos_time & 0x1F) * 2).timestamp()
+        except ValueError:
+            mtime = None
+        files.append({'name': raw_name.decode('utf-8' if attributes & 0x80 else 'cp1252', errors='replace').replace('\\', '/'),
+                      'size': file_size, 'folder': folder_index, 'offset': folder_offset, 'mtime': mtime})
+    return {'data_reserve': data_reserve, 'folders': folders, 'files': files}
+
+def _cab_block_checksum(packed_block: bytes, size_fields: bytes) -> int:
+    """
+    CFDATA checksum, as written by makecab and checked by cabextract: XOR of the block's little-endian 32-bit words,
+    its last 1-3 bytes read big-endian, and the block header's two size fields ('size_fields', 4 bytes).
+    """
+    word_bytes = len(packed_block) & ~3
+    folded_words = int.from_bytes(packed_block[:word_bytes], 'little')
+    word_count = word_bytes // 4
+    while word_count > 1: # XOR the upper half of the words onto the lower half, in C, until one word is left
+        half_count = (word_count + 1) // 2
+        folded_words = (folded_words & ((1 << (half_count * 32)) - 1)) ^ (folded_words >> (half_count * 32))
+        word_count = half_count
+    return folded_words ^ int.from_bytes(packed_block[word_bytes:], 'big') ^ int.from_bytes(size_fields, 'little')
+
+def _iter_cab_folder_data(cab_file, cab_folder: tuple[int, int, int], data_reserve: int):
+    """
+    Yields the uncompressed data blocks of one cabinet folder. Only stored and MSZIP folders are supported.
+    Blocks with a stored checksum (0 means none) are verified, so a damaged block is an error, not wrong output.
+    """
+    data_offset, data_block_count, compression = cab_folder
+    if compression not in (CAB_COMPRESSION_NONE, CAB_COMPRESSION_MSZIP):
+        raise ValueError(f"unsupported cabinet compression type {compression} (only stored and MSZIP are read natively)")
+    cab_file.seek(data_offset)
+    mszip_history = b""
+    for _ in range(data_block_count):
+        block_header = cab_file.read(8)
+        if len(block_header) != 8:
+            raise ValueError("truncated cabinet data block")
+        block_checksum, packed_size, unpacked_size = struct.unpack("<IHH", block_header)
+        cab_file.seek(data_reserve, os.SEEK_CUR)
+        packed_block = cab_file.read(packed_size)
+        if len(packed_block) != packed_size:
+            raise ValueError("truncated cabinet data block")
+        if block_checksum and _cab_block_checksum(packed_block, block_header[4:8]) != block_checksum:
+            raise ValueError("cabinet data block checksum mismatch")
+        if compression == CAB_COMPRESSION_NONE:
+            data_block = packed_block
+        else:
+            # Each MSZIP block is a complete raw deflate stream that may reference the previous block's output
+            if packed_block[:2] != b"CK":
+                raise ValueError("bad MSZIP block signature")
+            inflater = zlib.decompressobj(-zlib.MAX_WBITS, zdict=mszip_history) if mszip_history else zlib.decompressobj(-zlib.MAX_WBITS)
+            data_block = inflater.decompress(packed_block[2:]) + inflater.flush()
+            mszip_history = (mszip_history + data_block)[-CAB_MSZIP_WINDOW:]
+        if len(data_block) != unpacked_size:
+            raise ValueError("cabinet data block has the wrong size")
+        yield data_block
+
+def _extract_cab_files(cab_file, cab_directory: dict, target_dir: Path) -> int:
+    """
+    Extracts every file listed by _read_cab_directory below 'target_dir', streaming each folder once,
+    block by block, into the files it contains. Returns the number of bytes written.
+    """
+    for cab_entry in cab_directory['files']:
+        name_parts = [part for part in cab_entry['name'].split('/') if part not in ('', '.')]
+        if not name_parts or '..' in name_parts or cab_entry['name'].startswith('/') or ':' in name_parts[0]:
+            raise ValueError(f"cabinet contains unsafe path: {cab_entry['name']}")
+
+    bytes_written = 0
+    for folder_index, cab_folder in enumerate(cab_directory['folders']):
+        folder_entries = sorted((entry for entry in cab_directory['files'] if entry['folder'] == folder_index), key=lambda entry: entry['offset'])
+        finished_entries = []
+        for cab_entry in folder_entries:
+            if cab_entry['size'] == 0:
+                target_path = _zip_member_target(target_dir, cab_entry['name'])
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                target_path.touch()
+                finished_entries.append((cab_entry, target_path))
+        pending_entries = [entry for entry in folder_entries if entry['size'] > 0]
+        if not pending_entries:
+            continue
+
+        open_targets: list[tuple[dict, Path, object]] = []
+        try:
+            stream_position = 0
+            for data_block in _iter_cab_folder_data(cab_file, cab_folder, cab_directory['data_reserve']):
+                block_end = stream_position + len(data_block)
+                while pending_entries and pending_entries[0]['offset'] < block_end:
+                    cab_entry = pending_entries.pop(0)
+                    target_path = _zip_member_target(target_dir, cab_entry['name'])
+                    target_path.parent.mkdir(parents=True, exist_ok=True)
+                    open_targets.append((cab_entry, target_path, open(target_path, 'wb')))
+                still_open = []
+                for cab_entry, target_path, target_file in open_targets:
+                    slice_start = max(cab_entry['offset'], stream_position) - stream_position
+                    slice_end = min(cab_entry['offset'] + cab_entry['size'], block_end) - stream_position
+                    if slice_end > slice_start:
+                        target_file.write(data_block[slice_start:slice_end])
+                        bytes_written += slice_end - slice_start
+                    if cab_entry['offset'] + cab_entry['size'] <= block_end:
+                        target_file.close()
+                        finished_entries.append((cab_entry, target_path))
+                    else:
+                        still_open.append((cab_entry, target_path, target_file))
+                open_targets = still_open
+                stream_position = block_end
+                if not pending_entries and not open_targets: break
+            if pending_entries or open_targets:
+                raise ValueError("cabinet data ends before all of its files")
+        finally:
+            for _, _, target_file in open_targets: target_file.close()
+
+        for cab_entry, target_path in finished_entries:
+            if cab_entry['mtime']: os.utime(target_path, (cab_entry['mtime'], cab_entry['mtime']))
+    return bytes_written
+
 class PMDGLiveryInstaller:
     AIRCRAFT_HIERARCHY = {
         "Boeing 777": ["777-200ER", "777-300ER", "777F"],
@@ -147,12 +710,20 @@ class PMDGLiveryInstaller:
             else: print(f"Warning: Icon file not found at {icon_path_abs}")
         except Exception as e: print(f"Warning: Could not set window icon: {e}")
 
-        self.ptp_converter_exe = get_resource_path(PTP_CONVERTER_EXE_NAME)
+        self.ptp_converter_exe = os.environ.get(PTP_CONVERTER_ENV_VAR) or get_resource_path(PTP_CONVERTER_EXE_NAME)
+        if os.environ.get(PTP_CONVERTER_ENV_VAR):
+            print(f"Using PTP converter from {PTP_CONVERTER_ENV_VAR}: {self.ptp_converter_exe}")
         if not os.path.exists(self.ptp_converter_exe):
             print(f"CRITICAL WARNING: {PTP_CONVERTER_EXE_NAME} not found. PTP functionality will be unavailable.")
             self.ptp_converter_exe = None
 
         self.selected_zip_files: list[str] = []
+        self.measured_install_throughput: float | None = None # Bytes/s of past batches, saved in config.json
+        self._destination_locks: dict[str, threading.Lock] = {}
+        self._destination_locks_guard = threading.Lock()
+        self._ptp_cache_lock = threading.Lock()
+        self._deferred_deletions: queue.Queue[Path] = queue.Queue() # Replaced livery folders, deleted by _deferred_deletion_worker
+        self._deferred_deletion_thread: threading.Thread | None = None
 
         self.bg_color = "#f0f0f0"; self.header_bg = "#1a3f5c"; self.header_fg = "white"
         self.button_color = "#2c5f8a"; self.button_hover = "#3d7ab3"; self.accent_color = "#007acc"
@@ -216,6 +787,7 @@ class PMDGLiveryInstaller:
 
         self.load_config()
         master.protocol("WM_DELETE_WINDOW", self.on_close)
+        threading.Thread(target=self._sweep_stale_temp_folders, args=(self.community_path_var.get(),), name="temp_sweeper", daemon=True).start()
 
     def _setup_setup_tab(self, parent: ttk.Frame):
         parent.columnconfigure(1, weight=1)
@@ -266,7 +838,41 @@ class PMDGLiveryInstaller:
         ttk.Button(parent, text="Browse...", command=self.select_reference_folder).grid(row=reference_row_start_in_parent, column=2, padx=5, pady=(20, 5))
         ttk.Label(parent, text="Any installed PMDG 777 or 737 livery folder (for manifest/layout templates).", style="Info.TLabel").grid(row=reference_row_start_in_parent + 1, column=1, columnspan=2, sticky=tk.W, padx=5)
 
-        save_button_row_in_parent = reference_row_start_in_parent + 2
+        advanced_frame = ttk.LabelFrame(parent, text="Advanced / Performance", padding=10)
+        advanced_frame.grid(row=reference_row_start_in_parent + 2, column=0, columnspan=3, sticky=tk.EW, pady=(20, 5))
+        advanced_frame.columnconfigure(2, weight=1)
+        ttk.Label(advanced_frame, text="Extraction / copy threads:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=3)
+        self.extract_workers_var = tk.IntVar(value=DEFAULT_EXTRACT_WORKERS)
+        ttk.Spinbox(advanced_frame, from_=1, to=MAX_EXTRACT_WORKERS, textvariable=self.extract_workers_var, width=5).grid(row=0, column=1, sticky=tk.W, pady=3)
+        ttk.Label(advanced_frame, text="Members of large ZIPs are decompressed, and livery folders copied, in parallel. Use 1 for serial extraction and copying.", style="Info.TLabel").grid(row=0, column=2, sticky=tk.W, padx=5)
+        ttk.Label(advanced_frame, text="Parallel liveries:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=3)
+        self.pack_workers_var = tk.IntVar(value=DEFAULT_PACK_WORKERS)
+        ttk.Spinbox(advanced_frame, from_=1, to=MAX_PACK_WORKERS, textvariable=self.pack_workers_var, width=5).grid(row=1, column=1, sticky=tk.W, pady=3)
+        ttk.Label(advanced_frame, text="Liveries in ZIP packs and PTP conversions of multi-livery PTPs processed at the same time.", style="Info.TLabel").grid(row=1, column=2, sticky=tk.W, padx=5)
+        self.verify_stored_crc_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Verify CRC of uncompressed ZIP members", variable=self.verify_stored_crc_var).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="Uncompressed (stored) textures are copied without decoding; enable to re-check their checksum.", style="Info.TLabel").grid(row=2, column=2, sticky=tk.W, padx=5)
+        ttk.Label(advanced_frame, text="PTP cache size (MB):").grid(row=3, column=0, sticky=tk.W, padx=5, pady=3)
+        self.ptp_cache_max_mb_var = tk.IntVar(value=DEFAULT_PTP_CACHE_MAX_MB)
+        ttk.Spinbox(advanced_frame, from_=0, to=MAX_PTP_CACHE_MAX_MB, increment=512, textvariable=self.ptp_cache_max_mb_var, width=7).grid(row=3, column=1, sticky=tk.W, pady=3)
+        ttk.Label(advanced_frame, text="Converted PTPs are kept so reinstalling the same PTP skips the conversion. Use 0 to disable.", style="Info.TLabel").grid(row=3, column=2, sticky=tk.W, padx=5)
+        self.incremental_reinstall_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(advanced_frame, text="Update installed liveries incrementally", variable=self.incremental_reinstall_var).grid(row=4, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="Reinstalling a livery rewrites only changed files instead of deleting and copying the whole folder.", style="Info.TLabel").grid(row=4, column=2, sticky=tk.W, padx=5)
+        self.skip_installed_archives_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(advanced_frame, text="Skip archives that are already installed", variable=self.skip_installed_archives_var).grid(row=5, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="An archive installed before, byte for byte, whose liveries are still present is not installed again.", style="Info.TLabel").grid(row=5, column=2, sticky=tk.W, padx=5)
+        self.dedupe_after_install_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Deduplicate textures after install", variable=self.dedupe_after_install_var).grid(row=6, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="Identical textures of different liveries in the package are hardlinked so they are stored once.", style="Info.TLabel").grid(row=6, column=2, sticky=tk.W, padx=5)
+        self.layout_full_rescan_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Rescan the whole package for layout.json", variable=self.layout_full_rescan_var).grid(row=7, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="By default only liveries installed in the batch, or whose folders changed, are rescanned. Enable if files were edited by hand.", style="Info.TLabel").grid(row=7, column=2, sticky=tk.W, padx=5)
+        self.layout_compact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Write compact layout.json", variable=self.layout_compact_var).grid(row=8, column=0, columnspan=2, sticky=tk.W, padx=5, pady=3)
+        ttk.Label(advanced_frame, text="No indentation: a much smaller file for MSFS to read at startup in packages with many liveries.", style="Info.TLabel").grid(row=8, column=2, sticky=tk.W, padx=5)
+
+        save_button_row_in_parent = reference_row_start_in_parent + 3
         ttk.Separator(parent, orient=tk.HORIZONTAL).grid(row=save_button_row_in_parent, column=0, columnspan=3, sticky=tk.EW, pady=25)
         ttk.Button(parent, text="Save Settings", command=self.save_config).grid(row=save_button_row_in_parent + 1, column=0, columnspan=3, pady=10)
 
@@ -340,8 +946,14 @@ class PMDGLiveryInstaller:
         action_frame.columnconfigure(0, weight=1)
         action_frame.rowconfigure(2, weight=1)
 
-        self.install_button = ttk.Button(action_frame, text="Install Livery(s) & Generate Layout", command=self.start_install_thread, style="Accent.TButton")
-        self.install_button.grid(row=0, column=0, pady=(0, 15))
+        action_buttons_frame = ttk.Frame(action_frame, style="TFrame")
+        action_buttons_frame.grid(row=0, column=0, pady=(0, 15))
+        self.install_button = ttk.Button(action_buttons_frame, text="Install Livery(s) & Generate Layout", command=self.start_install_thread, style="Accent.TButton")
+        self.install_button.grid(row=0, column=0, padx=5)
+        self.dry_run_button = ttk.Button(action_buttons_frame, text="Dry Run (Plan Only)", command=lambda: self.start_install_thread(dry_run=True))
+        self.dry_run_button.grid(row=0, column=1, padx=5)
+        self.dedupe_button = ttk.Button(action_buttons_frame, text="Deduplicate Textures", command=self.start_dedupe_thread)
+        self.dedupe_button.grid(row=0, column=2, padx=5)
 
         progress_frame = ttk.Frame(action_frame, style="TFrame")
         progress_frame.grid(row=1, column=0, sticky=tk.EW, pady=(0, 10))
@@ -486,13 +1098,42 @@ class PMDGLiveryInstaller:
             self.log(f"Traceback for texture.cfg modification: {traceback.format_exc()}", "DETAIL")
 
 
+    def _convert_sub_ptp(self, sub_ptp_file_to_process: Path, processing_dir: Path, common_config: dict) -> tuple[Path, list[str] | None]:
+        """
+        Converts and reorganizes one sub-PTP of a multi-livery PTP in its own folder (or takes it from the PTP cache);
+        runs on a converter pool thread.
+        Returns (prepared content folder, original Config.cfg/aircraft.cfg lines for EOL detection). Raises on failure.
+        """
+        ptp_cache_key = self._ptp_cache_key(sub_ptp_file_to_process, common_config)
+        cached_ptp = self._get_cached_ptp_content(ptp_cache_key, sub_ptp_file_to_process, common_config)
+        if cached_ptp:
+            return cached_ptp
+
+        processing_dir.mkdir(parents=True, exist_ok=True)
+        with common_config['converter_slots']: # Bounds converter runs across nested pack/sub-PTP pools
+            conv_ok_sub, extracted_sub_ptp_content_folder, ptp_conv_err_msg_sub = self._run_ptp_converter(sub_ptp_file_to_process, processing_dir, common_config['converter_runs'])
+        if not conv_ok_sub: raise RuntimeError(ptp_conv_err_msg_sub or f"Conversion failed for sub-PTP: {sub_ptp_file_to_process.name}")
+
+        original_cfg_for_eol_detection: list[str] | None = None
+        src_cfg_path = extracted_sub_ptp_content_folder / "Config.cfg"
+        if not src_cfg_path.is_file(): src_cfg_path = extracted_sub_ptp_content_folder / "aircraft.cfg"
+        if src_cfg_path.is_file():
+            with open(src_cfg_path, 'r', encoding='utf-8', errors='ignore') as f_orig_cfg:
+                original_cfg_for_eol_detection = f_orig_cfg.readlines()
+
+        reorg_ok_sub, reorg_msg_sub = self._reorganize_ptp_output(extracted_sub_ptp_content_folder)
+        if not reorg_ok_sub: raise RuntimeError(f"Reorganization failed for sub-PTP '{sub_ptp_file_to_process.name}': {reorg_msg_sub}")
+        self._store_ptp_in_cache(ptp_cache_key, sub_ptp_file_to_process, extracted_sub_ptp_content_folder, original_cfg_for_eol_detection, common_config)
+        return extracted_sub_ptp_content_folder, original_cfg_for_eol_detection
+
     def _process_extracted_ptp_content(self,
                                        initial_ptp_extract_path: Path, 
                                        original_top_level_ptp_path: Path,
                                        common_config: dict,
                                        results_summary_list: list[dict],
                                        batch_success_counter: list[int], 
-                                       batch_failure_flag_for_archive: list[bool]
+                                       batch_failure_flag_for_archive: list[bool],
+                                       ptp_cache_key: str | None = None # Stores a single-livery PTP in the PTP cache after reorganization
                                        ) -> None:
         self.log(f"Examining PTP content from '{original_top_level_ptp_path.name}' in: {initial_ptp_extract_path}", "DETAIL")
         settings_dat_path = initial_ptp_extract_path / "Settings.dat"
@@ -544,88 +1185,88 @@ class PMDGLiveryInstaller:
 
         if is_multi_livery_ptp and sub_livery_ptp_files_info:
             self.log(f"Processing {len(sub_livery_ptp_files_info)} sub-liveries from '{original_top_level_ptp_path.name}'.", "INFO")
-            for sub_livery_index, (ptp_filename_in_archive, livery_name_from_settings) in enumerate(sub_livery_ptp_files_info):
-                sub_ptp_file_to_process = initial_ptp_extract_path / ptp_filename_in_archive
-                display_name_for_log_and_summary = f"{original_top_level_ptp_path.name} -> {livery_name_from_settings} ({ptp_filename_in_archive})"
-
-                if not sub_ptp_file_to_process.is_file():
-                    self.log(f"Sub-PTP file '{ptp_filename_in_archive}' not found at '{sub_ptp_file_to_process}'. Skipping.", "ERROR")
-                    results_summary_list.append({"file": display_name_for_log_and_summary, "success": False, "detail": f"Sub-PTP file '{ptp_filename_in_archive}' not found."})
-                    batch_failure_flag_for_archive[0] = True
-                    continue
+            # Conversions run ahead on a bounded pool, each sub-PTP in its own folder; installs below stay in Settings.dat
+            # order, so the first sub-livery is still the texture base the others fall back to.
+            with ThreadPoolExecutor(max_workers=max(1, common_config.get('pack_workers', 1)), thread_name_prefix="sub_ptp_convert") as convert_pool:
+                sub_ptp_conversions = {}
+                for sub_livery_index, (ptp_filename_in_archive, _) in enumerate(sub_livery_ptp_files_info):
+                    sub_ptp_file_to_process = initial_ptp_extract_path / ptp_filename_in_archive
+                    if sub_ptp_file_to_process.is_file():
+                        nested_temp_sub_ptp_processing_dir = initial_ptp_extract_path / f"__sub_ptp_proc_{sub_ptp_file_to_process.stem}_{sub_livery_index}_{datetime.now().strftime('%f')}"
+                        sub_ptp_conversions[sub_livery_index] = convert_pool.submit(
+                            self._convert_sub_ptp, sub_ptp_file_to_process, nested_temp_sub_ptp_processing_dir, common_config)
+
+                for sub_livery_index, (ptp_filename_in_archive, livery_name_from_settings) in enumerate(sub_livery_ptp_files_info):
+                    sub_ptp_file_to_process = initial_ptp_extract_path / ptp_filename_in_archive
+                    display_name_for_log_and_summary = f"{original_top_level_ptp_path.name} -> {livery_name_from_settings} ({ptp_filename_in_archive})"
+
+                    if not sub_ptp_file_to_process.is_file():
+                        self.log(f"Sub-PTP file '{ptp_filename_in_archive}' not found at '{sub_ptp_file_to_process}'. Skipping.", "ERROR")
+                        results_summary_list.append({"file": display_name_for_log_and_summary, "success": False, "detail": f"Sub-PTP file '{ptp_filename_in_archive}' not found."})
+                        batch_failure_flag_for_archive[0] = True
+                        continue
 
-                self.log(f"--- Processing Sub-PTP: {display_name_for_log_and_summary} ---", "STEP")
-                nested_temp_sub_ptp_processing_dir = initial_ptp_extract_path / f"__sub_ptp_proc_{sub_ptp_file_to_process.stem}_{datetime.now().strftime('%f')}"
-                
-                original_cfg_for_eol_detection: list[str] | None = None
+                    self.log(f"--- Processing Sub-PTP: {display_name_for_log_and_summary} ---", "STEP")
 
-                try:
-                    nested_temp_sub_ptp_processing_dir.mkdir(parents=True, exist_ok=True)
-                    conv_ok_sub, extracted_sub_ptp_content_folder, ptp_conv_err_msg_sub = self._run_ptp_converter(sub_ptp_file_to_process, nested_temp_sub_ptp_processing_dir)
-                    if not conv_ok_sub: raise RuntimeError(ptp_conv_err_msg_sub or f"Conversion failed for sub-PTP: {ptp_filename_in_archive}")
-
-                    src_cfg_path = extracted_sub_ptp_content_folder / "Config.cfg"
-                    if not src_cfg_path.is_file(): src_cfg_path = extracted_sub_ptp_content_folder / "aircraft.cfg"
-                    if src_cfg_path.is_file():
-                        with open(src_cfg_path, 'r', encoding='utf-8', errors='ignore') as f_orig_cfg:
-                            original_cfg_for_eol_detection = f_orig_cfg.readlines()
-
-                    reorg_ok_sub, reorg_msg_sub = self._reorganize_ptp_output(extracted_sub_ptp_content_folder)
-                    if not reorg_ok_sub: raise RuntimeError(f"Reorganization failed for sub-PTP '{ptp_filename_in_archive}': {reorg_msg_sub}")
-                    
-                    # Determine the SimObjects folder name for the current sub-livery BEFORE calling _process_single_livery
-                    temp_sanitized_suffix = re.sub(r'[\\/*?:"<>|]', '_', livery_name_from_settings).strip().replace('.', '_')
-                    if not temp_sanitized_suffix: temp_sanitized_suffix = f"UnnamedSubLivery_{sub_ptp_file_to_process.stem}"
-                    current_sub_livery_simobjects_folder_name = f"{common_config['base_aircraft_folder_name']} {temp_sanitized_suffix}"
-                    current_sub_livery_installed_path = common_config['main_package_folder'] / "SimObjects" / "Airplanes" / current_sub_livery_simobjects_folder_name
-
-                    livery_ok, detail = self._process_single_livery(
-                        extracted_sub_ptp_content_folder,
-                        sub_ptp_file_to_process,
-                        common_config,
-                        specific_livery_name=livery_name_from_settings
-                    )
+                    try:
+                        # Converted and reorganized by _convert_sub_ptp on the pool (waits here if not done yet)
+                        extracted_sub_ptp_content_folder, original_cfg_for_eol_detection = sub_ptp_conversions[sub_livery_index].result()
+
+                        # Determine the SimObjects folder name for the current sub-livery BEFORE calling _process_single_livery
+                        temp_sanitized_suffix = re.sub(r'[\\/*?:"<>|]', '_', livery_name_from_settings).strip().replace('.', '_')
+                        if not temp_sanitized_suffix: temp_sanitized_suffix = f"UnnamedSubLivery_{sub_ptp_file_to_process.stem}"
+                        current_sub_livery_simobjects_folder_name = f"{common_config['base_aircraft_folder_name']} {temp_sanitized_suffix}"
+                        current_sub_livery_installed_path = common_config['main_package_folder'] / "SimObjects" / "Airplanes" / current_sub_livery_simobjects_folder_name
+
+                        livery_ok, detail = self._process_single_livery(
+                            extracted_sub_ptp_content_folder,
+                            sub_ptp_file_to_process,
+                            common_config,
+                            specific_livery_name=livery_name_from_settings
+                        )
 
-                    if livery_ok:
-                        batch_success_counter[0] += 1
-                        # Now that _process_single_livery has run and copied files, find the actual texture folder
-                        installed_texture_dirs = self.find_texture_dirs_in_dir(current_sub_livery_installed_path)
-                        current_sub_livery_installed_texture_folder_path: Path | None = None
-                        if installed_texture_dirs:
-                            current_sub_livery_installed_texture_folder_path = Path(installed_texture_dirs[0]) # Assume first one is primary
-                            self.log(f"Found installed texture folder for '{livery_name_from_settings}': {current_sub_livery_installed_texture_folder_path}", "DETAIL")
-                        else:
-                            self.log(f"No 'texture.*' folder found in installed path '{current_sub_livery_installed_path}' for '{livery_name_from_settings}'. Fallback linking might be skipped.", "WARNING")
+                        if livery_ok:
+                            batch_success_counter[0] += 1
+                            # Now that _process_single_livery has run and copied files, find the actual texture folder
+                            # Texture folders are installed directly in the livery folder: list only that level
+                            installed_texture_dirs = self.find_texture_dirs_in_dir(current_sub_livery_installed_path,
+                                                                                   _index_livery_tree(current_sub_livery_installed_path, max_depth=1))
+                            current_sub_livery_installed_texture_folder_path: Path | None = None
+                            if installed_texture_dirs:
+                                current_sub_livery_installed_texture_folder_path = Path(installed_texture_dirs[0]) # Assume first one is primary
+                                self.log(f"Found installed texture folder for '{livery_name_from_settings}': {current_sub_livery_installed_texture_folder_path}", "DETAIL")
+                            else:
+                                self.log(f"No 'texture.*' folder found in installed path '{current_sub_livery_installed_path}' for '{livery_name_from_settings}'. Fallback linking might be skipped.", "WARNING")
                         
-                        if sub_livery_index == 0: 
-                            pack_base_livery_simobjects_folder_name = current_sub_livery_simobjects_folder_name
-                            if current_sub_livery_installed_texture_folder_path and current_sub_livery_installed_texture_folder_path.is_dir():
-                                pack_base_livery_texture_folder_name = current_sub_livery_installed_texture_folder_path.name
-                                pack_base_livery_texture_folder_path = current_sub_livery_installed_texture_folder_path
-                                self.log(f"Set '{pack_base_livery_simobjects_folder_name}\\{pack_base_livery_texture_folder_name}' as potential texture base for this PTP pack.", "DETAIL")
-                        elif pack_base_livery_simobjects_folder_name and pack_base_livery_texture_folder_name and \
-                             current_sub_livery_installed_texture_folder_path and \
-                             current_sub_livery_installed_texture_folder_path.is_dir():
-                            self.log(f"Attempting to add fallback for '{livery_name_from_settings}' to base '{pack_base_livery_simobjects_folder_name}\\{pack_base_livery_texture_folder_name}'.", "INFO")
-                            self._add_texture_fallback_if_needed(
-                                current_sub_livery_installed_texture_folder_path,
-                                pack_base_livery_simobjects_folder_name,
-                                pack_base_livery_texture_folder_name,
-                                original_cfg_for_eol_detection
-                            )
-                        elif pack_base_livery_texture_folder_path: # Base is set, but current sub-livery's texture folder wasn't found
-                            self.log(f"Cannot add texture fallback for '{livery_name_from_settings}': its own texture folder was not found after installation.", "WARNING")
-                        # else: No base livery texture folder was set from the first sub-livery, so can't add fallback.
-
-                    else: # livery_ok is False
-                        batch_failure_flag_for_archive[0] = True
+                            if sub_livery_index == 0: 
+                                pack_base_livery_simobjects_folder_name = current_sub_livery_simobjects_folder_name
+                                if current_sub_livery_installed_texture_folder_path and current_sub_livery_installed_texture_folder_path.is_dir():
+                                    pack_base_livery_texture_folder_name = current_sub_livery_installed_texture_folder_path.name
+                                    pack_base_livery_texture_folder_path = current_sub_livery_installed_texture_folder_path
+                                    self.log(f"Set '{pack_base_livery_simobjects_folder_name}\\{pack_base_livery_texture_folder_name}' as potential texture base for this PTP pack.", "DETAIL")
+                            elif pack_base_livery_simobjects_folder_name and pack_base_livery_texture_folder_name and \
+                                 current_sub_livery_installed_texture_folder_path and \
+                                 current_sub_livery_installed_texture_folder_path.is_dir():
+                                self.log(f"Attempting to add fallback for '{livery_name_from_settings}' to base '{pack_base_livery_simobjects_folder_name}\\{pack_base_livery_texture_folder_name}'.", "INFO")
+                                self._add_texture_fallback_if_needed(
+                                    current_sub_livery_installed_texture_folder_path,
+                                    pack_base_livery_simobjects_folder_name,
+                                    pack_base_livery_texture_folder_name,
+                                    original_cfg_for_eol_detection
+                                )
+                            elif pack_base_livery_texture_folder_path: # Base is set, but current sub-livery's texture folder wasn't found
+                                self.log(f"Cannot add texture fallback for '{livery_name_from_settings}': its own texture folder was not found after installation.", "WARNING")
+                            # else: No base livery texture folder was set from the first sub-livery, so can't add fallback.
+
+                        else: # livery_ok is False
+                            batch_failure_flag_for_archive[0] = True
                     
-                    results_summary_list.append({"file": display_name_for_log_and_summary, "success": livery_ok, "detail": detail})
+                        results_summary_list.append({"file": display_name_for_log_and_summary, "success": livery_ok, "detail": detail})
 
-                except Exception as e_sub_proc:
-                    self.log(f"ERROR processing sub-PTP '{display_name_for_log_and_summary}': {e_sub_proc}", "ERROR")
-                    results_summary_list.append({"file": display_name_for_log_and_summary, "success": False, "detail": str(e_sub_proc)})
-                    batch_failure_flag_for_archive[0] = True
+                    except Exception as e_sub_proc:
+                        self.log(f"ERROR processing sub-PTP '{display_name_for_log_and_summary}': {e_sub_proc}", "ERROR")
+                        results_summary_list.append({"file": display_name_for_log_and_summary, "success": False, "detail": str(e_sub_proc)})
+                        batch_failure_flag_for_archive[0] = True
         
         else: # Single PTP structure
             self.log(f"Processing '{original_top_level_ptp_path.name}' as a single PTP structure.", "INFO")
@@ -633,6 +1274,7 @@ class PMDGLiveryInstaller:
                 # No need to get original_cfg_for_eol_detection here as _add_texture_fallback_if_needed is not called for single PTPs
                 reorg_ok, reorg_msg = self._reorganize_ptp_output(initial_ptp_extract_path)
                 if not reorg_ok: raise RuntimeError(f"PTP reorganization failed: {reorg_msg}")
+                self._store_ptp_in_cache(ptp_cache_key, original_top_level_ptp_path, initial_ptp_extract_path, None, common_config)
                 
                 livery_ok, detail = self._process_single_livery(initial_ptp_extract_path, original_top_level_ptp_path, common_config, specific_livery_name=None)
                 results_summary_list.append({"file": original_top_level_ptp_path.name, "success": livery_ok, "detail": detail})
@@ -696,8 +1338,8 @@ class PMDGLiveryInstaller:
         add_bold_text("Reference PMDG Livery Folder:")
         add_text("Needed for copying manifest.json and layout.json templates if the livery package is new. Can be from any PMDG 777 or 737 livery.", indent=1)
         add_bold_text(f"{PTP_CONVERTER_EXE_NAME}:")
-        add_text(f"This tool requires '{PTP_CONVERTER_EXE_NAME}' to process .ptp files. Ensure it is in the same folder as this livery installer.", indent=1)
-        add_text("If missing, .ptp file installation will fail.", indent=1)
+        add_text(f".ptp files are read with a built-in reader. '{PTP_CONVERTER_EXE_NAME}' is used as a fallback for PTPs it cannot read (e.g. LZX-compressed); keep it in the same folder as this livery installer.", indent=1)
+        add_text("If it is missing, only those PTPs will fail to install.", indent=1)
         add_bold_text("Long File Path Handling (Windows):")
         add_text("MSFS and its add-ons can use very long file paths. To ensure this tool can correctly scan all livery files, "
                  "especially during 'layout.json' generation, enabling 'Win32 long paths' in your Windows OS is recommended.", indent=1)
@@ -717,7 +1359,7 @@ class PMDGLiveryInstaller:
 
         add_bold_text("Installation Errors:")
         add_text("- Ensure the archive file(s) (.zip or .ptp) are not corrupt. ZIPs should contain expected folders (texture.*, model, aircraft.cfg, optionally options.ini or <atc_id>.ini).", indent=1)
-        add_text(f"- For .ptp files, ensure {PTP_CONVERTER_EXE_NAME} is functional and in the same folder as this application.", indent=1)
+        add_text(f"- For .ptp files the built-in reader cannot handle, ensure {PTP_CONVERTER_EXE_NAME} is functional and in the same folder as this application.", indent=1)
         add_text("- Verify the selected Reference Livery Folder is valid and functional.", indent=1)
         
         add_bold_text("Nested ZIPs:")
@@ -730,7 +1372,7 @@ class PMDGLiveryInstaller:
         add_section_header("About")
         add_text(f"PMDG 737 & 777 Livery Installer {self.app_version}")
         add_text("This tool prepares, copies, and configures livery files for the PMDG 737 & 777 families in MSFS.", style="TLabel")
-        add_text(f"It handles folder creation, file extraction (ZIPs, including nested; PTPs using {PTP_CONVERTER_EXE_NAME}), " 
+        add_text(f"It handles folder creation, file extraction (ZIPs, including nested; PTPs with a built-in cabinet reader or {PTP_CONVERTER_EXE_NAME}), " 
                  "aircraft.cfg modification, options.ini/<atc_id>.ini handling, and automatically generates "
                  "layout.json and updates manifest.json.", style="TLabel")
         add_text("Disclaimer: Use at your own risk. Not affiliated with PMDG or Microsoft.", style="Info.TLabel")
@@ -931,6 +1573,16 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             "pmdg_77er_path": self.pmdg_77er_path_var.get(), "pmdg_77w_path": self.pmdg_77w_path_var.get(), "pmdg_77f_path": self.pmdg_77f_path_var.get(),
             "pmdg_736_path": self.pmdg_736_path_var.get(), "pmdg_737_path": self.pmdg_737_path_var.get(),
             "pmdg_738_path": self.pmdg_738_path_var.get(), "pmdg_739_path": self.pmdg_739_path_var.get(),
+            "extract_workers": self._get_extract_workers(),
+            "pack_workers": self._get_pack_workers(),
+            "verify_stored_crc": self.verify_stored_crc_var.get(),
+            "incremental_reinstall": self.incremental_reinstall_var.get(),
+            "skip_installed_archives": self.skip_installed_archives_var.get(),
+            "dedupe_after_install": self.dedupe_after_install_var.get(),
+            "layout_full_rescan": self.layout_full_rescan_var.get(),
+            "layout_compact": self.layout_compact_var.get(),
+            "ptp_cache_max_mb": self._get_ptp_cache_max_bytes() // (1024 * 1024),
+            "measured_install_throughput": self.measured_install_throughput,
         }
         try:
             config_dir = Path.home() / CONFIG_DIR_NAME
@@ -958,6 +1610,16 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 self.pmdg_737_path_var.set(config_data.get("pmdg_737_path", ""))
                 self.pmdg_738_path_var.set(config_data.get("pmdg_738_path", ""))
                 self.pmdg_739_path_var.set(config_data.get("pmdg_739_path", ""))
+                self.extract_workers_var.set(config_data.get("extract_workers", DEFAULT_EXTRACT_WORKERS))
+                self.pack_workers_var.set(config_data.get("pack_workers", DEFAULT_PACK_WORKERS))
+                self.verify_stored_crc_var.set(bool(config_data.get("verify_stored_crc", False)))
+                self.incremental_reinstall_var.set(bool(config_data.get("incremental_reinstall", True)))
+                self.skip_installed_archives_var.set(bool(config_data.get("skip_installed_archives", True)))
+                self.dedupe_after_install_var.set(bool(config_data.get("dedupe_after_install", False)))
+                self.layout_full_rescan_var.set(bool(config_data.get("layout_full_rescan", False)))
+                self.layout_compact_var.set(bool(config_data.get("layout_compact", False)))
+                self.ptp_cache_max_mb_var.set(config_data.get("ptp_cache_max_mb", DEFAULT_PTP_CACHE_MAX_MB))
+                self.measured_install_throughput = config_data.get("measured_install_throughput")
                 self.log("Configuration loaded.", "INFO")
             except json.JSONDecodeError as e:
                 self.log(f"Error decoding configuration file: {e}. Please review or delete: {config_path}", "ERROR")
@@ -967,21 +1629,63 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         else:
             self.log("Configuration file not found. Please configure paths in the Setup tab.", "INFO")
 
-    def get_livery_name(self, archive_path_or_folder: Path, temp_extract_dir: Path | None) -> str:
+    def _update_config_file(self, updated_values: dict):
+        """Merges 'updated_values' into the saved config file, leaving other (possibly unsaved) settings alone."""
+        config_path = Path.home() / CONFIG_DIR_NAME / CONFIG_FILE_NAME
+        try:
+            config_data = {}
+            if config_path.is_file():
+                with open(config_path, "r", encoding='utf-8') as f: config_data = json.load(f)
+            config_data.update(updated_values)
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(config_path, "w", encoding='utf-8') as f:
+                json.dump(config_data, f, indent=4)
+        except Exception as e:
+            self.log(f"Could not update configuration file '{config_path}': {e}", "WARNING")
+
+    def _get_extract_workers(self) -> int:
+        """Configured number of ZIP extraction threads, clamped to a sane range."""
+        try:
+            return max(1, min(int(self.extract_workers_var.get()), MAX_EXTRACT_WORKERS))
+        except (tk.TclError, ValueError):
+            return DEFAULT_EXTRACT_WORKERS
+
+    def _get_pack_workers(self) -> int:
+        """Configured number of pack liveries installed in parallel, clamped to a sane range."""
+        try:
+            return max(1, min(int(self.pack_workers_var.get()), MAX_PACK_WORKERS))
+        except (tk.TclError, ValueError):
+            return DEFAULT_PACK_WORKERS
+
+    def _get_ptp_cache_max_bytes(self) -> int:
+        """Configured PTP cache size cap in bytes; 0 disables the cache."""
+        try:
+            return max(0, min(int(self.ptp_cache_max_mb_var.get()), MAX_PTP_CACHE_MAX_MB)) * 1024 * 1024
+        except (tk.TclError, ValueError):
+            return DEFAULT_PTP_CACHE_MAX_MB * 1024 * 1024
+
+    def _lock_livery_destination(self, livery_dest_path: Path) -> threading.Lock:
+        """
+        Acquires and returns the lock for a livery destination folder, so two pack liveries resolving to the
+        same SimObjects folder are installed one after the other instead of interleaving their files.
+        """
+        with self._destination_locks_guard:
+            dest_lock = self._destination_locks.setdefault(str(livery_dest_path).lower(), threading.Lock())
+        dest_lock.acquire()
+        return dest_lock
+
+    def get_livery_name(self, archive_path_or_folder: Path, temp_extract_dir: Path | None, tree_index: dict | None = None) -> str:
         if temp_extract_dir and temp_extract_dir.is_dir():
             try:
-                cfg_path_str = self.find_file_in_dir(temp_extract_dir, "aircraft.cfg")
+                cfg_path_str = self.find_file_in_dir(temp_extract_dir, "aircraft.cfg", tree_index)
                 if cfg_path_str and Path(cfg_path_str).is_file():
                     with open(cfg_path_str, 'r', encoding='utf-8', errors='ignore') as cfg_file:
-                        content = cfg_file.read()
-                        fltsim_match = re.search(r'\[FLTSIM\.0\].*?title\s*=\s*"(.*?)"', content, re.DOTALL | re.IGNORECASE)
-                        if fltsim_match and fltsim_match.group(1).strip():
-                            return fltsim_match.group(1).strip()
-                        simple_match = re.search(r'^\s*title\s*=\s*"(.*?)"', content, re.MULTILINE | re.IGNORECASE)
-                        if simple_match and simple_match.group(1).strip():
-                            return simple_match.group(1).strip()
+                        title = _parse_cfg_title(cfg_file.read())
+                        if title: return title
             except Exception as e: self.log(f"Could not read aircraft.cfg for name detection: {e}", "WARNING")
-        
+        return self._livery_name_from_filename(archive_path_or_folder)
+
+    def _livery_name_from_filename(self, archive_path_or_folder: Path) -> str:
         default_name = Path(archive_path_or_folder).stem
         clean_name = re.sub(r'^(pmdg[-_]?)?(777|737|736|738|739|bbj|bdsf|bcf|er|f|w)?([-_]?(200er|300er|f|w|600|700|800|900|bbj|bbj2|bdsf|bcf|er))?([-_]?)', '', default_name, flags=re.IGNORECASE).strip('-_ ')
         clean_name = ' '.join(re.sub(r'[-_]+', ' ', clean_name).split()).strip()
@@ -991,14 +1695,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         if not cfg_path.is_file(): return None
         try:
             with open(cfg_path, 'r', encoding='utf-8', errors='ignore') as f: content = f.read()
-            fltsim0_match = re.search(r'\[fltsim\.0\](.*?)(\n\s*\[|$)', content, re.DOTALL | re.IGNORECASE)
-            if fltsim0_match:
-                section_content = fltsim0_match.group(1)
-                atc_id_match = re.search(r'^\s*atc_id\s*=\s*"?([a-zA-Z0-9_.\- ]+)"?', section_content, re.MULTILINE | re.IGNORECASE)
-                if atc_id_match and atc_id_match.group(1).strip():
-                    atc_id = atc_id_match.group(1).strip()
-                    safe_atc_id = re.sub(r'[\\/*?:"<>|]', '_', atc_id)
-                    if safe_atc_id: return safe_atc_id
+            return _parse_cfg_atc_id(content)
         except Exception as e: self.log(f"Error extracting ATC ID from {cfg_path}: {e}", "ERROR")
         return None
 
@@ -1041,17 +1738,20 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         if not self.selected_zip_files: 
             errors.append("- No livery archive files (.zip or .ptp) selected.")
         else:
-            if any(Path(f).suffix.lower() == ".ptp" for f in self.selected_zip_files) and \
-               (not self.ptp_converter_exe or not os.path.exists(self.ptp_converter_exe)):
-                errors.append(f"- A .ptp file selected, but '{PTP_CONVERTER_EXE_NAME}' was not found.")
             for f_path_str in self.selected_zip_files:
                 f_p = Path(f_path_str)
                 if not f_p.is_file(): errors.append(f"- Selected livery file not found: {f_path_str}")
                 elif f_p.suffix.lower() not in [".zip", ".ptp"]: errors.append(f"- File '{f_p.name}' is not .zip or .ptp.")
         return errors
 
-    def find_file_in_dir(self, directory: Path, filename_lower: str) -> str | None:
-        """Recursively searches for a file (case-insensitive) in a directory."""
+    def find_file_in_dir(self, directory: Path, filename_lower: str, tree_index: dict | None = None) -> str | None:
+        """
+        Recursively searches for a file (case-insensitive) in a directory. With a 'tree_index' of the directory or
+        a folder above it (see _index_livery_tree) the answer comes from memory; paths gone since are skipped.
+        """
+        indexed_paths = _tree_index_lookup(tree_index, 'files', filename_lower, directory) if tree_index else None
+        if indexed_paths is not None:
+            return next((path for path in indexed_paths if os.path.isfile(path)), None)
         search_path = Path(directory)
         if not search_path.is_dir():
             self.log(f"find_file_in_dir: Provided directory does not exist or is invalid: {search_path}", "WARNING")
@@ -1065,8 +1765,12 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                     return os.path.join(root, file_name)
         return None
 
-    def find_dir_in_dir(self, directory: Path, dirname_lower: str) -> str | None:
-        """Recursively searches for a directory (case-insensitive) in a directory."""
+    def find_dir_in_dir(self, directory: Path, dirname_lower: str, tree_index: dict | None = None) -> str | None:
+        """Recursively searches for a directory (case-insensitive) in a directory, top level first. See find_file_in_dir for 'tree_index'."""
+        indexed_paths = _tree_index_lookup(tree_index, 'dirs', dirname_lower, directory) if tree_index else None
+        if indexed_paths is not None:
+            indexed_paths = [path for path in indexed_paths if os.path.isdir(path)]
+            return next((path for path in indexed_paths if os.path.dirname(path) == str(directory)), indexed_paths[0] if indexed_paths else None)
         search_dir = Path(directory)
         if not search_dir.is_dir():
             self.log(f"find_dir_in_dir: Provided directory does not exist or is invalid: {search_dir}", "WARNING")
@@ -1086,8 +1790,14 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                         return str(found_path)
         return None
 
-    def find_texture_dirs_in_dir(self, directory: Path) -> list[str]:
-        """Finds all directories starting with 'texture.' (case-insensitive) at any level."""
+    def find_texture_dirs_in_dir(self, directory: Path, tree_index: dict | None = None) -> list[str]:
+        """Finds all directories starting with 'texture.' (case-insensitive) at any level. See find_file_in_dir for 'tree_index'."""
+        indexed_paths = _tree_index_lookup(tree_index, 'dirs_by_prefix', "texture.", directory) if tree_index else None
+        if indexed_paths is not None:
+            texture_dirs = [path for path in indexed_paths if os.path.isdir(path)]
+            if not texture_dirs:
+                self.log(f"No 'texture.*' folders found in {directory}", "DETAIL")
+            return texture_dirs
         texture_dirs = []
         search_dir = Path(directory)
         if not search_dir.is_dir():
@@ -1111,7 +1821,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 self.log(f"No 'texture.*' folders found in {directory}", "DETAIL")
         return texture_dirs
 
-    def start_install_thread(self):
+    def start_install_thread(self, dry_run: bool = False):
         errors = self.verify_settings()
         
         selected_variant = self.aircraft_variant_var.get()
@@ -1148,40 +1858,446 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
         self.progress_var.set(0)
+        files_to_install = list(self.selected_zip_files) 
+        if any(Path(f).suffix.lower() == ".ptp" for f in files_to_install) and \
+           (not self.ptp_converter_exe or not os.path.exists(self.ptp_converter_exe)):
+            self.log(f"'{PTP_CONVERTER_EXE_NAME}' was not found. PTPs are read with the built-in reader; "
+                     "any PTP it cannot read (e.g. LZX-compressed) will fail.", "WARNING")
+        self.install_button.config(state=tk.DISABLED)
+        self.dry_run_button.config(state=tk.DISABLED)
+        self.dedupe_button.config(state=tk.DISABLED)
+        if dry_run:
+            # The plan itself reports what would fail; no disk space check needed
+            self.status_var.set("Planning installation (dry run)...")
+            self.log("Starting dry run: planning installation, nothing will be written...", "STEP")
+            install_thread = threading.Thread(target=self.install_livery_logic, args=(files_to_install, None, True), daemon=True)
+            install_thread.start()
+            return
+        # Probing every archive can take a while (large batches, network drives): keep it off the Tk thread
+        self.status_var.set("Checking archives and disk space...")
+        preflight_thread = threading.Thread(target=self._preflight_worker, args=(files_to_install,), daemon=True)
+        preflight_thread.start()
+
+    def _preflight_worker(self, archive_paths: list[str]):
+        """Preflight thread: runs _preflight_batch and hands the result to _confirm_preflight_and_start on the Tk thread."""
+        try:
+            archive_probes, space_errors, space_warnings = self._preflight_batch(archive_paths)
+        except Exception as e_preflight:
+            self.log(f"Preflight failed: {e_preflight}. Installation not started.", "ERROR")
+            import traceback; self.log(f"Traceback: {traceback.format_exc()}", "DETAIL")
+            self.master.after(0, self._cancel_before_install)
+            return
+        self.master.after(0, lambda: self._confirm_preflight_and_start(archive_paths, archive_probes, space_errors, space_warnings))
+
+    def _confirm_preflight_and_start(self, archive_paths: list[str], archive_probes: dict[str, dict],
+                                     space_errors: list[str], space_warnings: list[str]):
+        """
+        Tk thread: refuses the batch (error dialog) when disk space is short, asks for confirmation when it
+        would get tight, then starts install_livery_logic with the probes of the preflight.
+        """
+        if space_errors:
+            self.log("Preflight: not enough free disk space for this batch. Installation not started.", "ERROR")
+            messagebox.showerror("Not Enough Disk Space",
+                                 "The selected archives need more space than is available:\n\n" + "\n".join(space_errors) +
+                                 "\n\nFree up space or select fewer archives.")
+            self._cancel_before_install()
+            return
+        if space_warnings:
+            self.log("Preflight: free disk space will be low after this batch.", "WARNING")
+            if not messagebox.askyesno("Low Disk Space",
+                                       f"Less than {PREFLIGHT_FREE_SPACE_MARGIN / 1024**3:.0f} GB would be left free after installing:\n\n" + "\n".join(space_warnings) +
+                                       "\n\nContinue anyway?"):
+                self.log("Installation cancelled by user after the disk space warning.", "INFO")
+                self._cancel_before_install()
+                return
         self.status_var.set("Starting installation...")
         self.log("Starting installation process...", "STEP")
-        self.install_button.config(state=tk.DISABLED)
-        files_to_install = list(self.selected_zip_files) 
-        install_thread = threading.Thread(target=self.install_livery_logic, args=(files_to_install,), daemon=True)
+        install_thread = threading.Thread(target=self.install_livery_logic, args=(archive_paths, archive_probes, False), daemon=True)
         install_thread.start()
 
-    def _extract_archive(self, archive_path: Path, temp_dir: Path):
-        self.log(f"Extracting ZIP archive '{archive_path.name}' to {temp_dir}...", "INFO")
-        if archive_path.suffix.lower() != ".zip":
-                raise ValueError(f"Unsupported file type for _extract_archive: {archive_path.name}. Only .zip.")
+    def _cancel_before_install(self):
+        """Tk thread: the batch was not started; re-enables the buttons and keeps the selection."""
+        self.status_var.set("Installation cancelled")
+        self._finalize_installation_ui(reset_fields=False)
+
+    def _estimate_batch_requirements(self, archive_paths: list[str], archive_probes: dict[str, dict]) -> dict:
+        """
+        Rough disk needs of a batch from ZIP central directories and PTP file sizes; nothing is extracted.
+        'final_bytes' ends up in the Community package; 'package_temp_bytes' is the largest per-archive
+        __temp_archive_* folder (each is removed before the next archive); 'system_temp_bytes' is the largest
+        PTP input copy in the system temp folder; 'work_bytes' is everything written, for the time estimate.
+        """
+        estimate = {'final_bytes': 0, 'package_temp_bytes': 0, 'system_temp_bytes': 0, 'work_bytes': 0}
+        for archive_path_str in archive_paths:
+            archive_path = Path(archive_path_str)
+            try:
+                archive_size = archive_path.stat().st_size
+            except OSError:
+                continue # Missing files fail in the install loop with a proper message
+            archive_final_bytes = archive_temp_bytes = 0
+            if archive_path.suffix.lower() == ".ptp":
+                # Converter output goes to the package temp folder, then is copied to SimObjects
+                archive_final_bytes = archive_temp_bytes = int(archive_size * PTP_EXPANSION_FACTOR)
+                estimate['system_temp_bytes'] = max(estimate['system_temp_bytes'], archive_size)
+            else:
+                probe = archive_probes.get(archive_path_str)
+                if not probe or probe['kind'] == 'error':
+                    continue
+                uncompressed_bytes = probe['total_uncompressed_bytes']
+                if probe['kind'] == 'single': # Installed straight from the ZIP, no temp copy
+                    archive_final_bytes = uncompressed_bytes
+                elif probe['kind'] == 'nested': # Nested archives are still compressed: assume they expand like PTPs
+                    archive_final_bytes = int(uncompressed_bytes * PTP_EXPANSION_FACTOR)
+                    archive_temp_bytes = uncompressed_bytes
+                else: # Extracted to temp, then copied
+                    archive_final_bytes = archive_temp_bytes = uncompressed_bytes
+            estimate['final_bytes'] += archive_final_bytes
+            estimate['package_temp_bytes'] = max(estimate['package_temp_bytes'], archive_temp_bytes)
+            estimate['work_bytes'] += archive_final_bytes + archive_temp_bytes
+        return estimate
+
+    def _preflight_batch(self, archive_paths: list[str]) -> tuple[dict[str, dict], list[str], list[str]]:
+        """
+        Checks, before anything is extracted, that the Community and temp volumes can hold the batch and
+        logs an estimated duration based on the throughput measured in past batches. Runs on the preflight thread.
+        Returns (archive_probes, volumes short of space, volumes left with little space), one line per volume;
+        the probes are reused by install_livery_logic.
+        """
+        archive_probes = self._probe_archive_batch(archive_paths)
+        estimate = self._estimate_batch_requirements(archive_paths, archive_probes)
+
+        # Package temp folders live inside the Community package; PTP input copies in the system temp folder
+        volume_needs: dict[int, list] = {}
+        for volume_path, needed_bytes in ((Path(self.community_path_var.get()), estimate['final_bytes'] + estimate['package_temp_bytes']),
+                                          (Path(tempfile.gettempdir()), estimate['system_temp_bytes'])):
+            try:
+                volume_entry = volume_needs.setdefault(volume_path.stat().st_dev, [volume_path, 0])
+            except OSError as e_stat:
+                self.log(f"Preflight: cannot check free space for '{volume_path}': {e_stat}", "WARNING")
+                continue
+            volume_entry[1] += needed_bytes
+
+        space_errors, space_warnings = [], []
+        for volume_path, needed_bytes in volume_needs.values():
+            if not needed_bytes: continue
+            try:
+                free_bytes = shutil.disk_usage(volume_path).free
+            except OSError as e_usage:
+                self.log(f"Preflight: cannot check free space for '{volume_path}': {e_usage}", "WARNING")
+                continue
+            volume_line = f"- {volume_path}: about {needed_bytes / 1024**3:.2f} GB needed, {free_bytes / 1024**3:.2f} GB free"
+            self.log(f"Preflight {volume_line[2:]}.", "DETAIL")
+            if needed_bytes > free_bytes: space_errors.append(volume_line)
+            elif free_bytes - needed_bytes < PREFLIGHT_FREE_SPACE_MARGIN: space_warnings.append(volume_line)
+
+        throughput = self.measured_install_throughput or DEFAULT_INSTALL_THROUGHPUT
+        estimated_seconds = estimate['work_bytes'] / throughput
+        self.log(f"Preflight: ~{estimate['final_bytes'] / 1024**3:.2f} GB to install, ~{estimate['work_bytes'] / 1024**3:.2f} GB written in total; "
+                 f"estimated time {int(estimated_seconds // 60)} min {int(estimated_seconds % 60)} s "
+                 f"({'measured' if self.measured_install_throughput else 'default'} throughput {throughput / (1024 * 1024):.0f} MB/s).", "INFO")
+        return archive_probes, space_errors, space_warnings
+
+    def _probe_zip_archive(self, zip_source: Path | bytes, archive_label: str) -> dict:
+        """
+        Classifies a ZIP from its central directory, without extracting it.
+        Only the small descriptor members (aircraft.cfg, Settings.dat, texture.cfg) are read.
+        'kind' is 'single', 'nested' (pack of .zip/.ptp), 'multi' (several liveries) or 'unknown'.
+        Member prefixes ('content_root', 'pack_root', 'livery_root') end with '/' or are empty.
+        """
         try:
-            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                MAX_PATH_COMPONENT_LEN = 240 
-                for member_info in zip_ref.infolist():
-                    member_path_str = member_info.filename
-                    normalized_member_path = Path(member_path_str).as_posix() 
-                    if normalized_member_path.startswith('/') or '/../' in normalized_member_path or normalized_member_path.endswith('/..') or ".." in normalized_member_path.split('/'):
-                        raise ValueError(f"ZIP archive contains potentially unsafe path: {member_path_str}")
-                    if len(member_path_str) > MAX_PATH_COMPONENT_LEN : 
-                            self.log(f"Warning: Long path component in ZIP: '{member_path_str[:100]}...'", "WARNING")
-                
-                zip_ref.extractall(temp_dir)
-            self.log(f"ZIP archive '{archive_path.name}' extracted successfully.", "SUCCESS")
+            with _open_zip_source(zip_source) as zip_ref:
+                infos = zip_ref.infolist()
+                member_paths = [info.filename.replace('\\', '/') for info in infos]
+                infos_by_path = {path: info for path, info in zip(member_paths, infos)}
+                usable_paths = [p for p in member_paths if not any(part.startswith('__MACOSX') for part in p.split('/'))]
+
+                # Same two-step single-folder descent as install_livery_logic + _is_nested_archive
+                content_root = _zip_single_root_prefix(member_paths)
+                pack_root = _zip_single_root_prefix(member_paths, content_root)
+
+                nested_archives, has_texture_folder, has_aircraft_cfg = [], False, False
+                for name, is_dir in _zip_children(member_paths, pack_root).items():
+                    if name.startswith(ARCHIVE_SKIP_PREFIXES): continue
+                    if is_dir:
+                        if name.lower().startswith('texture.'): has_texture_folder = True
+                    elif name.lower().endswith(ARCHIVE_EXTENSIONS): nested_archives.append(pack_root + name)
+                    elif name.lower() == 'aircraft.cfg': has_aircraft_cfg = True
+
+                # aircraft.cfg candidates below the content root, shallowest first
+                cfg_members = sorted((p for p in usable_paths if p.startswith(content_root) and p.rsplit('/', 1)[-1].lower() == 'aircraft.cfg'
+                                      and not any(part.startswith('__temp_') for part in p.split('/')[:-1])),
+                                     key=lambda p: (p.count('/'), p.lower()))
+                livery_roots = sorted({p[:len(p) - len('aircraft.cfg')] for p in cfg_members}, key=lambda p: (p.count('/'), p.lower()))
+                livery_root = cfg_members[0][:len(cfg_members[0]) - len('aircraft.cfg')] if cfg_members else content_root
+
+                def read_small_member(member_path: str) -> str | None:
+                    info = infos_by_path.get(member_path)
+                    if info is None or info.file_size > ZIP_PROBE_MAX_MEMBER_READ: return None
+                    return zip_ref.read(info).decode('utf-8', errors='ignore')
+
+                title = atc_id = None
+                if cfg_members:
+                    cfg_content = read_small_member(cfg_members[0])
+                    if cfg_content:
+                        title = _parse_cfg_title(cfg_content)
+                        atc_id = _parse_cfg_atc_id(cfg_content)
+
+                texture_folders: list[str] = []
+                for member_path in usable_paths:
+                    if not member_path.startswith(livery_root): continue
+                    parts = member_path[len(livery_root):].split('/')
+                    for depth, part in enumerate(parts[:-1]):
+                        if part.lower().startswith('texture.'):
+                            folder = livery_root + '/'.join(parts[:depth + 1]) + '/'
+                            if folder not in texture_folders: texture_folders.append(folder)
+                texture_fallbacks = {}
+                for folder in texture_folders:
+                    tex_cfg_path = next((p for p in usable_paths if p.lower() == f"{folder}texture.cfg".lower()), None)
+                    tex_cfg_content = read_small_member(tex_cfg_path) if tex_cfg_path else None
+                    if tex_cfg_content:
+                        texture_fallbacks[folder] = re.findall(r'^\s*fallback\.[0-9]+\s*=\s*(.*?)\s*$', tex_cfg_content, re.MULTILINE | re.IGNORECASE)
+
+                settings_type = None
+                settings_path = next((p for p in sorted(usable_paths, key=lambda p: p.count('/')) if p.rsplit('/', 1)[-1].lower() == 'settings.dat'), None)
+                settings_content = read_small_member(settings_path) if settings_path else None
+                if settings_content:
+                    type_match = re.search(r'^\s*Type\s*=\s*(.*?)\s*$', settings_content, re.MULTILINE | re.IGNORECASE)
+                    if type_match: settings_type = type_match.group(1).strip().lower()
+
+                if has_texture_folder or has_aircraft_cfg: kind = 'single'
+                elif nested_archives: kind = 'nested'
+                elif cfg_members: kind = 'single'
+                else: kind = 'unknown'
+                if kind == 'single' and (len(livery_roots) > 1 or settings_type == 'multi livery'):
+                    kind = 'multi'
+
+                return {
+                    'archive': archive_label, 'kind': kind,
+                    'content_root': content_root, 'pack_root': pack_root, 'livery_root': livery_root,
+                    'livery_roots': livery_roots, 'nested_archives': nested_archives,
+                    'title': title, 'atc_id': atc_id,
+                    'texture_folders': texture_folders, 'texture_fallbacks': texture_fallbacks,
+                    'settings_type': settings_type,
+                    'member_count': len(infos),
+                    'total_uncompressed_bytes': sum(info.file_size for info in infos),
+                }
+        except zipfile.BadZipFile:
+            raise ValueError(f"Invalid or corrupt ZIP archive: {archive_label}")
+
+    def _probe_archive_batch(self, archive_paths: list[str]) -> dict[str, dict]:
+        """Probes every selected ZIP up front. Failed probes are returned as {'kind': 'error', 'error': msg}."""
+        probes: dict[str, dict] = {}
+        probe_start = time.perf_counter()
+        for archive_path_str in archive_paths:
+            archive_path = Path(archive_path_str)
+            if archive_path.suffix.lower() != ".zip": continue
+            try:
+                probes[archive_path_str] = self._probe_zip_archive(archive_path, archive_path.name)
+            except Exception as e_probe:
+                probes[archive_path_str] = {'archive': archive_path.name, 'kind': 'error', 'error': str(e_probe)}
+        if probes:
+            kinds_count: dict[str, int] = {}
+            for probe in probes.values(): kinds_count[probe['kind']] = kinds_count.get(probe['kind'], 0) + 1
+            kinds_text = ", ".join(f"{count} {kind}" for kind, count in sorted(kinds_count.items()))
+            total_bytes = sum(p.get('total_uncompressed_bytes', 0) for p in probes.values())
+            self.log(f"Classified {len(probes)} ZIP archive(s) in {time.perf_counter() - probe_start:.2f}s ({kinds_text}); "
+                     f"{total_bytes / (1024 * 1024):.1f} MB uncompressed.", "INFO")
+        return probes
+
+    def _check_zip_member_paths(self, zip_ref: zipfile.ZipFile):
+        """Rejects members that would escape the extraction folder (zip-slip) and warns about very long paths."""
+        MAX_PATH_COMPONENT_LEN = 240 
+        for member_info in zip_ref.infolist():
+            member_path_str = member_info.filename
+            normalized_member_path = member_path_str.replace('\\', '/') # Backslashes are folder separators on Windows; as_posix() keeps them on POSIX
+            if normalized_member_path.startswith('/') or ".." in normalized_member_path.split('/'):
+                raise ValueError(f"ZIP archive contains potentially unsafe path: {member_path_str}")
+            if len(member_path_str) > MAX_PATH_COMPONENT_LEN : 
+                    self.log(f"Warning: Long path component in ZIP: '{member_path_str[:100]}...'", "WARNING")
+
+    def _extract_zip_members(self, zip_source: Path | bytes, member_targets: list[tuple[zipfile.ZipInfo, Path]],
+                             workers: int = 1, archive_label: str = "", verify_stored_crc: bool = False) -> int:
+        """
+        Extracts ZIP members to explicit target paths (members must already be zip-slip checked).
+        With several workers, each thread opens its own ZipFile handle and inflates a size-balanced
+        slice of the members; zlib releases the GIL, so large textures decompress on all cores.
+        STORED members (typically DDS textures) are not decoded at all: their raw byte range is copied
+        straight to the target (see _copy_file_byte_range), CRC-checked only if 'verify_stored_crc'.
+        Directory entries are created as folders. Returns the number of bytes written.
+        """
+        file_targets = []
+        for member_info, target_path in member_targets:
+            if member_info.is_dir(): target_path.mkdir(parents=True, exist_ok=True)
+            else: file_targets.append((member_info, target_path))
+        total_bytes = sum(member_info.file_size for member_info, _ in file_targets)
+
+        worker_count = max(1, min(workers, len(file_targets), MAX_EXTRACT_WORKERS))
+        if total_bytes < PARALLEL_EXTRACT_MIN_BYTES: worker_count = 1
+        # Largest members first, each one to the least loaded slice
+        member_slices: list[list[tuple[zipfile.ZipInfo, Path]]] = [[] for _ in range(worker_count)]
+        slice_loads = [0] * worker_count
+        for member_info, target_path in sorted(file_targets, key=lambda item: item[0].file_size, reverse=True):
+            slice_index = slice_loads.index(min(slice_loads))
+            member_slices[slice_index].append((member_info, target_path))
+            slice_loads[slice_index] += member_info.file_size
+
+        abort_extraction = threading.Event()
+        def extract_slice(member_slice: list[tuple[zipfile.ZipInfo, Path]]) -> int:
+            stored_bytes_copied = 0
+            in_memory_zip = isinstance(zip_source, (bytes, bytearray))
+            with _open_zip_source(zip_source) as worker_zip_ref, \
+                 (io.BytesIO(zip_source) if in_memory_zip else open(zip_source, 'rb')) as raw_zip_file:
+                for member_info, target_path in member_slice:
+                    if abort_extraction.is_set(): return stored_bytes_copied
+                    target_path.parent.mkdir(parents=True, exist_ok=True)
+                    stored_span = _zip_stored_member_span(raw_zip_file, member_info)
+                    if stored_span is None:
+                        with worker_zip_ref.open(member_info) as member_stream, open(target_path, 'wb') as target_file:
+                            shutil.copyfileobj(member_stream, target_file, ZIP_COPY_BUFFER_SIZE)
+                        continue
+                    data_offset, data_length = stored_span
+                    with open(target_path, 'wb', buffering=0) as target_file:
+                        if in_memory_zip: target_file.write(memoryview(zip_source)[data_offset:data_offset + data_length])
+                        else: _copy_file_byte_range(raw_zip_file, target_file, data_offset, data_length)
+                    if verify_stored_crc:
+                        member_crc = 0
+                        with open(target_path, 'rb') as written_file:
+                            for chunk in iter(lambda: written_file.read(ZIP_COPY_BUFFER_SIZE), b""):
+                                member_crc = zlib.crc32(chunk, member_crc)
+                        if member_crc != member_info.CRC:
+                            raise zipfile.BadZipFile(f"Bad CRC-32 for file '{member_info.filename}'")
+                    stored_bytes_copied += data_length
+            return stored_bytes_copied
+
+        extract_start = time.perf_counter()
+        if worker_count == 1:
+            stored_bytes_total = extract_slice(member_slices[0])
+        else:
+            with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="zip_extract") as extract_pool:
+                slice_futures = [extract_pool.submit(extract_slice, member_slice) for member_slice in member_slices]
+                stored_bytes_total = 0
+                try:
+                    for slice_future in as_completed(slice_futures): stored_bytes_total += slice_future.result()
+                except BaseException:
+                    abort_extraction.set() # Let the other workers stop after their current member
+                    raise
+        elapsed = max(time.perf_counter() - extract_start, 1e-6)
+        self.log(f"Extracted {len(file_targets)} member(s) from '{archive_label}': {total_bytes / (1024 * 1024):.1f} MB in {elapsed:.2f}s "
+                 f"({total_bytes / (1024 * 1024) / elapsed:.1f} MB/s, {worker_count} worker(s), "
+                 f"{stored_bytes_total / (1024 * 1024):.1f} MB stored data passed through{' with CRC check' if verify_stored_crc else ''}).", "DETAIL")
+        return total_bytes
+
+    def _extract_archive(self, archive_path: Path | bytes, temp_dir: Path, workers: int = 1, archive_label: str | None = None,
+                         verify_stored_crc: bool = False, staged_file_crcs: dict[str, int] | None = None):
+        """
+        Extracts a whole ZIP, given as a file path or as the bytes of a ZIP read from another archive. The CRC-32
+        stored for each extracted file is added to 'staged_file_crcs' (normalized path -> CRC), if given.
+        """
+        archive_label = archive_label or archive_path.name
+        self.log(f"Extracting ZIP archive '{archive_label}' to {temp_dir}...", "INFO")
+        if isinstance(archive_path, Path) and archive_path.suffix.lower() != ".zip":
+                raise ValueError(f"Unsupported file type for _extract_archive: {archive_label}. Only .zip.")
+        try:
+            with _open_zip_source(archive_path) as zip_ref:
+                self._check_zip_member_paths(zip_ref)
+                member_targets = [(info, _zip_member_target(temp_dir, info.filename)) for info in zip_ref.infolist()]
+            self._extract_zip_members(archive_path, member_targets, workers, archive_label, verify_stored_crc)
+            if staged_file_crcs is not None:
+                staged_file_crcs.update((os.path.normcase(str(target)), info.CRC) for info, target in member_targets if not info.is_dir())
+            self.log(f"ZIP archive '{archive_label}' extracted successfully.", "SUCCESS")
         except zipfile.BadZipFile:
-            raise ValueError(f"Invalid or corrupt ZIP archive: {archive_path.name}")
+            raise ValueError(f"Invalid or corrupt ZIP archive: {archive_label}")
         except (OSError, OverflowError) as e_os: 
             if "path too long" in str(e_os).lower() or (hasattr(e_os, 'winerror') and e_os.winerror == 206):
-                    raise RuntimeError(f"Failed to extract '{archive_path.name}': File path too long within ZIP - {e_os}")
-            raise RuntimeError(f"OS error extracting ZIP archive '{archive_path.name}': {e_os}")
+                    raise RuntimeError(f"Failed to extract '{archive_label}': File path too long within ZIP - {e_os}")
+            raise RuntimeError(f"OS error extracting ZIP archive '{archive_label}': {e_os}")
         except Exception as e:
-            raise RuntimeError(f"Failed to extract ZIP archive '{archive_path.name}': {e}")
+            raise RuntimeError(f"Failed to extract ZIP archive '{archive_label}': {e}")
+
+    def _extract_ptp_natively(self, ptp_file_to_process: Path, ptp_output_target_base_dir: Path) -> Path | None:
+        """
+        Reads the cabinet inside a PTP in-process (no copy, no subprocess, no move) into a new
+        '__ptp_staged_content_*' folder, the same staging layout the converter path produces.
+        Returns None, after removing any partial output, when the PTP uses something the built-in
+        reader does not support (e.g. LZX compression), so the caller can fall back to the converter.
+        """
+        target_final_content_staging_dir = ptp_output_target_base_dir / f"__ptp_staged_content_{ptp_file_to_process.stem}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        extract_start = time.perf_counter()
+        try:
+            with open(ptp_file_to_process, 'rb') as cab_file:
+                cab_directory = _read_cab_directory(cab_file)
+                target_final_content_staging_dir.mkdir(parents=True, exist_ok=True)
+                bytes_written = _extract_cab_files(cab_file, cab_directory, target_final_content_staging_dir)
+        except (ValueError, struct.error, zlib.error, OSError) as e_native:
+            self.log(f"Built-in PTP reader cannot read '{ptp_file_to_process.name}': {e_native}.", "INFO")
+            if target_final_content_staging_dir.exists():
+                shutil.rmtree(target_final_content_staging_dir, ignore_errors=True)
+            return None
+        self.log(f"PTP file '{ptp_file_to_process.name}' read with the built-in reader: {len(cab_directory['files'])} file(s), "
+                 f"{bytes_written / (1024 * 1024):.1f} MB in {time.perf_counter() - extract_start:.2f}s. Content staged in: {target_final_content_staging_dir}", "SUCCESS")
+        return target_final_content_staging_dir
+
+    def _supervise_ptp_converter(self, converter_command: list[str], converter_cwd: Path, converter_output_dir: Path,
+                                 timeout_seconds: float) -> tuple[str, str, dict]:
+        """
+        Runs the PTP converter with stdout/stderr read line by line on helper threads, killing it as soon as it prints
+        one of PTP_CONVERTER_FATAL_PATTERNS or runs longer than 'timeout_seconds', so a hung or failed conversion does
+        not hold up the batch. Returns (stdout, stderr, run record with returncode, abort_reason, wall_time, peak_output_bytes).
+        """
+        converter_output = {'stdout': [], 'stderr': []}
+        fatal_output_lines: list[str] = []
+        fatal_output_event = threading.Event()
+
+        def read_converter_stream(stream, stream_name: str):
+            for line in stream:
+                converter_output[stream_name].append(line.rstrip('\r\n'))
+                if not fatal_output_event.is_set() and any(pattern in line.lower() for pattern in PTP_CONVERTER_FATAL_PATTERNS):
+                    fatal_output_lines.append(line.strip())
+                    fatal_output_event.set()
+            stream.close()
+
+        run_start = time.perf_counter()
+        process = subprocess.Popen(converter_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, encoding='utf-8', errors='ignore', cwd=str(converter_cwd))
+        stream_readers = [threading.Thread(target=read_converter_stream, args=(process.stdout, 'stdout'), daemon=True),
+                          threading.Thread(target=read_converter_stream, args=(process.stderr, 'stderr'), daemon=True)]
+        for stream_reader in stream_readers: stream_reader.start()
+
+        abort_reason = ""
+        peak_output_bytes = 0
+        while True:
+            try:
+                process.wait(timeout=PTP_CONVERTER_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            peak_output_bytes = max(peak_output_bytes, _directory_size(converter_output_dir))
+            if fatal_output_event.is_set():
+                abort_reason = f"aborted after fatal output '{fatal_output_lines[0]}'"
+            elif time.perf_counter() - run_start > timeout_seconds:
+                abort_reason = f"timed out after {timeout_seconds:.0f}s"
+            if abort_reason:
+                self.log(f"{PTP_CONVERTER_EXE_NAME} {abort_reason}. Killing it.", "WARNING")
+                process.kill()
+                process.wait()
+                break
+        for stream_reader in stream_readers: stream_reader.join(timeout=5)
+
+        converter_run = {
+            'returncode': process.returncode,
+            'abort_reason': abort_reason,
+            'wall_time': time.perf_counter() - run_start,
+            'peak_output_bytes': max(peak_output_bytes, _directory_size(converter_output_dir)),
+        }
+        return "\n".join(converter_output['stdout']), "\n".join(converter_output['stderr']), converter_run
+
+    def _run_ptp_converter(self, ptp_file_to_process: Path, ptp_output_target_base_dir: Path,
+                           converter_runs: list[dict] | None = None) -> tuple[bool, Path | None, str]:
+        # Built-in cabinet reader first; ptp_converter.exe only for PTPs it cannot read
+        native_staging_dir = self._extract_ptp_natively(ptp_file_to_process, ptp_output_target_base_dir)
+        if native_staging_dir:
+            return True, native_staging_dir, ""
 
-    def _run_ptp_converter(self, ptp_file_to_process: Path, ptp_output_target_base_dir: Path) -> tuple[bool, Path | None, str]:
         if not self.ptp_converter_exe or not os.path.exists(self.ptp_converter_exe):
             error_msg = f"Error: {PTP_CONVERTER_EXE_NAME} not found. Cannot process {ptp_file_to_process.name}."
             self.log(error_msg, "ERROR")
@@ -1195,7 +2311,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         unique_final_content_folder_name = f"__ptp_staged_content_{ptp_file_to_process.stem}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
         target_final_content_staging_dir = ptp_output_target_base_dir / unique_final_content_folder_name
         
-        # Directorio temporal para la copia del PTP (ruta corta)
+        # Directorio temporal para el PTP de entrada (ruta corta, sin espacios)
         temp_storage_for_ptp_copy_str = tempfile.mkdtemp(prefix="pmdg_ptp_input_")
         temp_storage_for_ptp_copy_path = Path(temp_storage_for_ptp_copy_str)
         
@@ -1209,38 +2325,51 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         final_error_msg = ""
         try:
             target_final_content_staging_dir.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(ptp_file_to_process, absolute_path_to_copied_ptp)
-            self.log(f"Copied '{ptp_file_to_process.name}' to temp location '{absolute_path_to_copied_ptp}' for processing.", "DETAIL")
+            # The converter only needs a short, space-free path: link the PTP there, copy only if linking is impossible
+            staging_strategy = _stage_file_alias(ptp_file_to_process, absolute_path_to_copied_ptp)
+            if staging_strategy == "copy":
+                self.log(f"Copied '{ptp_file_to_process.name}' ({ptp_file_to_process.stat().st_size / (1024 * 1024):.1f} MB) to temp location "
+                         f"'{absolute_path_to_copied_ptp}' for processing; it could not be hardlinked or symlinked there.", "INFO")
+            else:
+                self.log(f"Staged '{ptp_file_to_process.name}' at '{absolute_path_to_copied_ptp}' for processing ({staging_strategy}, no copy).", "DETAIL")
 
             if converter_native_output_dir.exists(): # Limpiar salida nativa anterior si existe
                 shutil.rmtree(converter_native_output_dir)
 
             # Ejecutar ptp_converter.exe. CWD es el directorio del .exe, se pasa la ruta absoluta al PTP.
             self.log(f"Executing: \"{self.ptp_converter_exe}\" \"{str(absolute_path_to_copied_ptp)}\" (CWD: {str(converter_exe_dir)})", "CMD")
-            process = subprocess.run(
-                [self.ptp_converter_exe, str(absolute_path_to_copied_ptp)],
-                capture_output=True, text=True, check=False, encoding='utf-8', errors='ignore',
-                cwd=str(converter_exe_dir) 
-            )
-
-            ptp_converter_stdout = process.stdout.strip() if process.stdout else ""
-            ptp_converter_stderr = process.stderr.strip() if process.stderr else ""
+            ptp_size_mb = ptp_file_to_process.stat().st_size / (1024 * 1024)
+            converter_command = [self.ptp_converter_exe, str(absolute_path_to_copied_ptp)]
+            if self.ptp_converter_exe.lower().endswith(".py"): # Stand-in script (tools/fake_ptp_converter.py)
+                converter_command.insert(0, sys.executable)
+            ptp_converter_stdout, ptp_converter_stderr, converter_run = self._supervise_ptp_converter(
+                converter_command, converter_exe_dir, converter_native_output_dir,
+                PTP_CONVERTER_BASE_TIMEOUT + PTP_CONVERTER_TIMEOUT_PER_MB * ptp_size_mb)
+            converter_run['file'] = ptp_file_to_process.name
+            if converter_runs is not None: converter_runs.append(converter_run)
+            self.log(f"{PTP_CONVERTER_EXE_NAME} run for '{ptp_file_to_process.name}' ({ptp_size_mb:.1f} MB): exit code {converter_run['returncode']}, "
+                     f"{converter_run['wall_time']:.1f}s, peak output {converter_run['peak_output_bytes'] / (1024 * 1024):.1f} MB.", "DETAIL")
+
+            ptp_converter_stdout = ptp_converter_stdout.strip()
+            ptp_converter_stderr = ptp_converter_stderr.strip()
 
             if ptp_converter_stdout: self.log(f"Output from {PTP_CONVERTER_EXE_NAME}:\n{ptp_converter_stdout}", "DETAIL")
             
             ptp_failed = False
             tool_error_detected = ""
 
-            if process.returncode != 0:
-                tool_error_detected = f"PTP Converter exit code {process.returncode}."
+            if converter_run['abort_reason']:
+                tool_error_detected = f"PTP Converter {converter_run['abort_reason']}."
+                ptp_failed = True
+            elif converter_run['returncode'] != 0:
+                tool_error_detected = f"PTP Converter exit code {converter_run['returncode']}."
                 ptp_failed = True
             
             # Verificar stdout en busca de errores conocidos, ya que ptp_converter.exe puede no usar códigos de salida correctamente.
             if ptp_converter_stdout:
                 stdout_lower = ptp_converter_stdout.lower()
                 # Comprobar si "done!" NO está, Y hay un error, podría ser más fiable
-                if "error: system.applicationexception: cab extraction error" in stdout_lower or \
-                   "invalid parameters passed to extraction function" in stdout_lower:
+                if any(pattern in stdout_lower for pattern in PTP_CONVERTER_FATAL_PATTERNS):
                     tool_error_detected = "PTP Converter: CAB extraction error (reported in stdout)."
                     ptp_failed = True
                 elif "error:" in stdout_lower and "done!" not in stdout_lower and not tool_error_detected:
@@ -1311,7 +2440,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             if temp_storage_for_ptp_copy_path.exists():
                 try:
                     shutil.rmtree(temp_storage_for_ptp_copy_path)
-                    self.log(f"Cleaned up temp storage for PTP copy: {temp_storage_for_ptp_copy_path}", "DETAIL")
+                    self.log(f"Cleaned up temp storage for PTP input: {temp_storage_for_ptp_copy_path}", "DETAIL")
                 except Exception as e_clean_storage:
                     self.log(f"Warning: Could not clean up temp storage '{temp_storage_for_ptp_copy_path}': {e_clean_storage}", "WARNING")
             # La carpeta converter_native_output_in_exe_dir (si se creó en el dir del exe) ya no es el objetivo principal de salida.+
@@ -1559,38 +2688,550 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             self.log(f"Traceback: {traceback.format_exc()}", "DETAIL")
             return False, str(e)
 
-    def _is_nested_archive(self, directory: Path) -> bool:
-        # (Implementation from previous response, seems okay, ensure __temp_ checks are robust)
-        zip_count = 0; ptp_count = 0; other_file_folder_count = 0
-        has_texture_folder = False; has_aircraft_cfg = False
-        check_dir = directory
+    def _load_installed_archives(self) -> dict:
+        """Reads the installed-archive fingerprint store (see _archive_fingerprint); an empty store if missing or unreadable."""
+        store_path = Path.home() / CONFIG_DIR_NAME / INSTALLED_ARCHIVES_FILE_NAME
         try:
-            items = list(check_dir.iterdir())
-            if len(items) == 1 and items[0].is_dir() and not items[0].name.startswith(('.', '__MACOSX', '__temp_')):
-                check_dir = items[0]
-            
-            for item in check_dir.iterdir():
-                if item.name.startswith(('.', '__MACOSX', '__temp_')): continue
-                if item.is_file():
-                    if item.suffix.lower() == '.zip': zip_count += 1
-                    elif item.suffix.lower() == '.ptp': ptp_count += 1
-                    elif item.name.lower() == 'aircraft.cfg': has_aircraft_cfg = True; other_file_folder_count +=1
-                    else: other_file_folder_count += 1
-                elif item.is_dir():
-                    other_file_folder_count += 1
-                    if item.name.lower().startswith('texture.'): has_texture_folder = True
+            with open(store_path, "r", encoding='utf-8') as f:
+                installed_archives = json.load(f)
+            if installed_archives.get('format') == INSTALLED_ARCHIVES_FORMAT:
+                return installed_archives
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.log(f"Could not read installed archive records '{store_path}': {e}. Starting a new one.", "WARNING")
+        return {'format': INSTALLED_ARCHIVES_FORMAT, 'archives': {}, 'hashed_files': {}}
+
+    def _save_installed_archives(self, installed_archives: dict):
+        store_path = Path.home() / CONFIG_DIR_NAME / INSTALLED_ARCHIVES_FILE_NAME
+        try:
+            store_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(store_path, "w", encoding='utf-8') as f:
+                json.dump(installed_archives, f, indent=1)
         except OSError as e:
-            self.log(f"Error checking for nested archives in '{check_dir}': {e}", "WARNING"); return False
-        
-        archive_file_count = zip_count + ptp_count
-        if has_texture_folder or has_aircraft_cfg: is_nested = False
-        elif archive_file_count > 0 and other_file_folder_count <= 2 : is_nested = True
-        elif archive_file_count > 0 : is_nested = True
-        else: is_nested = False
-
-        if is_nested: self.log(f"Nested archive detected in '{check_dir.name}'.", "INFO")
-        return is_nested
-    
+            self.log(f"Could not save installed archive records '{store_path}': {e}", "WARNING")
+
+    def _archive_fingerprint(self, archive_path: Path, installed_archives: dict) -> str | None:
+        """
+        '<size>:<sha256>' of a selected archive. The hash of a file whose path, size and modification time are
+        unchanged since it was last hashed is reused from the store instead of reading the archive again.
+        """
+        try:
+            archive_stat = archive_path.stat()
+            hashed_file = installed_archives['hashed_files'].get(os.path.normcase(str(archive_path)))
+            if hashed_file and hashed_file['size'] == archive_stat.st_size and hashed_file['mtime_ns'] == archive_stat.st_mtime_ns:
+                archive_sha256 = hashed_file['sha256']
+            else:
+                archive_sha256 = _file_sha256(archive_path)
+                installed_archives['hashed_files'][os.path.normcase(str(archive_path))] = {
+                    'size': archive_stat.st_size, 'mtime_ns': archive_stat.st_mtime_ns, 'sha256': archive_sha256}
+            return f"{archive_stat.st_size}:{archive_sha256}"
+        except OSError as e:
+            self.log(f"Could not fingerprint '{archive_path.name}': {e}", "WARNING")
+            return None
+
+    def _installed_archive_key(self, archive_fingerprint: str, original_archive_path: Path, common_config: dict) -> str:
+        """Store key of an archive installed with the current settings (same content into another package/variant/name is a new install)."""
+        custom_livery_name = ""
+        if len(self.selected_zip_files) == 1 and Path(self.selected_zip_files[0]) == original_archive_path:
+            custom_livery_name = self.custom_name_var.get()
+        return "|".join((archive_fingerprint, os.path.normcase(str(common_config['main_package_folder'])),
+                         common_config['aircraft_variant'], custom_livery_name))
+
+    def _record_installed_archive(self, installed_archives: dict, archive_key: str | None, archive_name: str,
+                                  livery_folders: list[str], common_config: dict):
+        """
+        Records the livery folders an archive produced ('archive_key' None: not fingerprinted or not fully installed).
+        A folder belongs to the last archive installed into it, so it is dropped from the records of other archives.
+        """
+        package_key = os.path.normcase(str(common_config['main_package_folder']))
+        for other_key, other_record in list(installed_archives['archives'].items()):
+            if other_key.split("|")[1] == package_key:
+                other_record['livery_folders'] = [folder for folder in other_record['livery_folders'] if folder not in livery_folders]
+                if not other_record['livery_folders']:
+                    del installed_archives['archives'][other_key]
+        if archive_key:
+            installed_archives['archives'][archive_key] = {
+                'archive': archive_name, 'livery_folders': sorted(set(livery_folders)), 'installed': datetime.now().isoformat(timespec='seconds')}
+
+    def _installed_archive_skip_detail(self, installed_archives: dict, archive_key: str, common_config: dict) -> str | None:
+        """Why an archive can be skipped (recorded as installed and all its livery folders still present), or None."""
+        archive_record = installed_archives['archives'].get(archive_key)
+        if not archive_record or not archive_record['livery_folders']:
+            return None
+        airplanes_folder = common_config['main_package_folder'] / "SimObjects" / "Airplanes"
+        if not all((airplanes_folder / folder / "aircraft.cfg").is_file() for folder in archive_record['livery_folders']):
+            return None
+        return (f"Already installed and unchanged (as '{archive_record['archive']}' on {archive_record['installed']}): "
+                f"{len(archive_record['livery_folders'])} livery folder(s) present. Skipped.")
+
+    def _ptp_cache_key(self, ptp_file: Path, common_config: dict) -> str | None:
+        """SHA-256 of the PTP's bytes, the key of its PTP cache entry. None when the cache is disabled or the file can't be read."""
+        if not common_config.get('ptp_cache_dir'):
+            return None
+        known_sha256 = common_config.get('archive_sha256', {}).get(str(ptp_file)) # Selected PTPs were hashed for the fingerprint already
+        if known_sha256:
+            return known_sha256
+        try:
+            return _file_sha256(ptp_file)
+        except OSError as e:
+            self.log(f"Could not hash '{ptp_file.name}' for the PTP cache: {e}", "WARNING")
+            return None
+
+    def _read_ptp_cache_entry(self, cache_entry_dir: Path) -> dict | None:
+        """Metadata of a complete PTP cache entry of the current format, or None."""
+        try:
+            with open(cache_entry_dir / PTP_CACHE_ENTRY_FILE_NAME, 'r', encoding='utf-8') as f:
+                entry_info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry_info.get('format') != PTP_CACHE_FORMAT or not (cache_entry_dir / "content").is_dir():
+            return None
+        return entry_info
+
+    def _get_cached_ptp_content(self, ptp_cache_key: str | None, ptp_file: Path, common_config: dict) -> tuple[Path, list[str] | None] | None:
+        """
+        Looks 'ptp_cache_key' up in the PTP cache. On a hit returns (content folder, original Config.cfg lines);
+        the content is already reorganized and is installed from in place (it is only read), so neither the
+        converter nor _reorganize_ptp_output runs. Returns None on a miss.
+        """
+        if not ptp_cache_key:
+            return None
+        cache_entry_dir = common_config['ptp_cache_dir'] / ptp_cache_key
+        entry_info = self._read_ptp_cache_entry(cache_entry_dir)
+        with self._ptp_cache_lock:
+            common_config['ptp_cache_stats']['hits' if entry_info else 'misses'] += 1
+        if not entry_info:
+            self.log(f"PTP cache miss for '{ptp_file.name}'.", "DETAIL")
+            return None
+        try:
+            os.utime(cache_entry_dir / PTP_CACHE_ENTRY_FILE_NAME) # Last use, for LRU eviction
+        except OSError:
+            pass
+        self.log(f"PTP cache hit for '{ptp_file.name}' (converted earlier from '{entry_info.get('source_name')}'). Skipping conversion.", "INFO")
+        return cache_entry_dir / "content", entry_info.get('original_cfg_lines')
+
+    def _store_ptp_in_cache(self, ptp_cache_key: str | None, ptp_file: Path, prepared_content_folder: Path,
+                            original_cfg_lines: list[str] | None, common_config: dict):
+        """
+        Copies a reorganized PTP output into the PTP cache under 'ptp_cache_key'. The entry is built in a temp
+        folder and renamed into place, so a half-written entry is never used. Failures only cost a later conversion.
+        """
+        if not ptp_cache_key:
+            return
+        ptp_cache_dir: Path = common_config['ptp_cache_dir']
+        cache_entry_dir = ptp_cache_dir / ptp_cache_key
+        staging_entry_dir = ptp_cache_dir / f"__temp_{ptp_cache_key}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        try:
+            self._copy_livery_files(_folder_copy_pairs(prepared_content_folder, staging_entry_dir / "content"),
+                                    common_config.get('copy_workers', 1), f"PTP cache entry for '{ptp_file.name}'")
+            entry_size = _directory_size(staging_entry_dir / "content")
+            with open(staging_entry_dir / PTP_CACHE_ENTRY_FILE_NAME, 'w', encoding='utf-8') as f:
+                json.dump({"format": PTP_CACHE_FORMAT, "source_name": ptp_file.name, "size_bytes": entry_size,
+                           "original_cfg_lines": original_cfg_lines}, f)
+            with self._ptp_cache_lock:
+                if self._read_ptp_cache_entry(cache_entry_dir):
+                    return # Same PTP stored by another thread meanwhile (it may already be installing from it)
+                if cache_entry_dir.exists():
+                    shutil.rmtree(cache_entry_dir) # Entry of an older format or left incomplete
+                staging_entry_dir.rename(cache_entry_dir)
+            self.log(f"Stored converted '{ptp_file.name}' in the PTP cache ({entry_size / (1024 * 1024):.1f} MB).", "DETAIL")
+        except Exception as e:
+            self.log(f"Could not store '{ptp_file.name}' in the PTP cache: {e}", "WARNING")
+        finally:
+            if staging_entry_dir.exists():
+                shutil.rmtree(staging_entry_dir, ignore_errors=True)
+
+    def _evict_ptp_cache(self, ptp_cache_dir: Path, max_bytes: int):
+        """
+        Removes least recently used PTP cache entries (and leftovers of interrupted stores) until the cache fits
+        in 'max_bytes'. Runs after a batch, when no livery is being installed from the cache.
+        """
+        if not ptp_cache_dir.is_dir():
+            return
+        cache_entries = []
+        for entry_dir in ptp_cache_dir.iterdir():
+            if not entry_dir.is_dir():
+                continue
+            entry_info = self._read_ptp_cache_entry(entry_dir)
+            if entry_info is None:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            try:
+                last_used = (entry_dir / PTP_CACHE_ENTRY_FILE_NAME).stat().st_mtime
+            except OSError:
+                last_used = 0
+            cache_entries.append((last_used, entry_info.get('size_bytes', 0), entry_dir))
+
+        cache_size = sum(entry_size for _, entry_size, _ in cache_entries)
+        evicted_count = 0
+        for _, entry_size, entry_dir in sorted(cache_entries, key=lambda entry: entry[0]):
+            if cache_size <= max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            cache_size -= entry_size
+            evicted_count += 1
+        if evicted_count:
+            self.log(f"PTP cache: evicted {evicted_count} least recently used entries, {cache_size / (1024 * 1024):.1f} MB left.", "DETAIL")
+
+    def _process_ptp_file(self,
+                          ptp_file: Path,
+                          ptp_work_dir: Path,
+                          common_config: dict,
+                          results_summary_list: list[dict],
+                          batch_success_counter: list[int],
+                          batch_failure_flag_for_archive: list[bool]
+                          ) -> None:
+        """
+        Installs a selected or nested PTP file: straight from its PTP cache entry when there is one,
+        otherwise through the converter and _process_extracted_ptp_content (which fills the cache).
+        Raises RuntimeError when the conversion fails.
+        """
+        ptp_cache_key = self._ptp_cache_key(ptp_file, common_config)
+        cached_ptp = self._get_cached_ptp_content(ptp_cache_key, ptp_file, common_config)
+        if cached_ptp:
+            livery_ok, detail = self._process_single_livery(cached_ptp[0], ptp_file, common_config, specific_livery_name=None)
+            results_summary_list.append({"file": ptp_file.name, "success": livery_ok, "detail": detail})
+            if livery_ok: batch_success_counter[0] += 1
+            else: batch_failure_flag_for_archive[0] = True
+            return
+
+        with common_config['converter_slots']:
+            conv_ok, initial_extract_folder, ptp_conv_err_msg = self._run_ptp_converter(ptp_file, ptp_work_dir, common_config['converter_runs'])
+        if not conv_ok:
+            raise RuntimeError(ptp_conv_err_msg if ptp_conv_err_msg else f"PTP conversion failed for {ptp_file.name}.")
+
+        # initial_extract_folder is where _run_ptp_converter has staged the PTP's content
+        self._process_extracted_ptp_content(
+            initial_extract_folder,
+            ptp_file,
+            common_config,
+            results_summary_list,
+            batch_success_counter,
+            batch_failure_flag_for_archive,
+            ptp_cache_key
+        )
+
+    def _resolve_livery_destination(self,
+                                    original_archive_path: Path,
+                                    common_config: dict,
+                                    specific_livery_name: str | None,
+                                    detect_livery_name: Callable[[], str]
+                                    ) -> tuple[str, Path]:
+        """Returns (livery display name, final SimObjects/Airplanes folder) for a livery about to be installed."""
+        if specific_livery_name:
+            livery_display_name = specific_livery_name
+            # original_archive_path.name here would be like "Texture.1.PTP" or the nested ZIP name
+            self.log(f"Using specific name: '{livery_display_name}' (from PTP settings/nested archive for content of '{original_archive_path.name}')", "INFO")
+        # Check if this is the single, top-level archive selected by the user AND a custom name is provided in the UI
+        elif len(self.selected_zip_files) == 1 and Path(self.selected_zip_files[0]) == original_archive_path and self.custom_name_var.get():
+            livery_display_name = self.custom_name_var.get()
+            self.log(f"Using user-provided custom name: '{livery_display_name}' for the single selected archive: {original_archive_path.name}", "INFO")
+        else:
+            # Fallback for:
+            # - Multiple top-level archives selected by the user.
+            # - A single top-level archive selected, but no custom name provided.
+            # - Nested ZIP archives (that are not sub-PTPs handled by specific_livery_name).
+            livery_display_name = detect_livery_name()
+            self.log(f"Auto-detected/generated name: '{livery_display_name}' for {original_archive_path.name}", "INFO")
+
+        sanitized_fs_foldername_suffix = re.sub(r'[\\/*?:"<>|]', '_', livery_display_name).strip().replace('.', '_')
+        if not sanitized_fs_foldername_suffix:
+            sanitized_fs_foldername_suffix = f"UnnamedLivery_{original_archive_path.stem}_{datetime.now().strftime('%S%f')}"
+            self.log(f"Sanitized livery name was empty, using generated folder suffix: '{sanitized_fs_foldername_suffix}'.", "WARNING")
+
+        # Construct the final destination path for this specific livery
+        final_livery_folder_name_in_simobjects = f"{common_config['base_aircraft_folder_name']} {sanitized_fs_foldername_suffix}"
+        final_livery_dest_path = common_config['main_package_folder'] / "SimObjects" / "Airplanes" / final_livery_folder_name_in_simobjects
+        self.log(f"Final livery destination folder: {final_livery_dest_path}", "DETAIL")
+        return livery_display_name, final_livery_dest_path
+
+    def _prepare_livery_destination(self, final_livery_dest_path: Path, incremental: bool = False, copy_workers: int = 1) -> tuple[Path, bool]:
+        """
+        Returns (folder to build the livery in, seeded from the installed version). The livery is always built in a
+        new '__temp_swap_*' sibling of its destination and put in place by _swap_in_livery_folder, so an installed
+        version stays intact until the new one is complete. With 'incremental', the staging folder starts as a copy
+        of the installed livery (see _seed_livery_build_folder) and only changed files are written to it.
+        """
+        livery_build_path = final_livery_dest_path.with_name(f"__temp_swap_{final_livery_dest_path.name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+        livery_build_path.mkdir(parents=True)
+        self.log(f"Building livery in staging folder: {livery_build_path.name}", "DETAIL")
+        if incremental and final_livery_dest_path.is_dir():
+            self.log(f"Destination folder '{final_livery_dest_path.name}' already exists. Updating changed files only...", "INFO")
+            self._seed_livery_build_folder(final_livery_dest_path, livery_build_path, copy_workers)
+            return livery_build_path, True
+        if final_livery_dest_path.exists():
+            self.log(f"Destination folder '{final_livery_dest_path.name}' already exists. It is replaced once the new version is complete.", "WARNING")
+        return livery_build_path, False
+
+    def _seed_livery_build_folder(self, installed_livery_path: Path, livery_build_path: Path, copy_workers: int = 1):
+        """
+        Incremental update: fills the staging folder with hardlinks to the installed livery's files (copies where the
+        volume has no hardlinks). Changed files are then replaced there, never rewritten, so the installed folder is not
+        modified. The root aircraft.cfg is left out, as modify_aircraft_cfg edits the new one in place.
+        """
+        linked_count = 0
+        files_to_copy: list[tuple[Path, Path]] = []
+        for source_path, target_path in _folder_copy_pairs(installed_livery_path, livery_build_path):
+            if target_path.parent == livery_build_path and target_path.name.lower() == "aircraft.cfg":
+                continue
+            try:
+                os.link(source_path, target_path)
+                linked_count += 1
+            except OSError:
+                files_to_copy.append((source_path, target_path))
+        if files_to_copy:
+            self._copy_livery_files(files_to_copy, copy_workers, livery_build_path.name)
+        self.log(f"Staging folder seeded from the installed version: {linked_count} file(s) linked, {len(files_to_copy)} copied.", "DETAIL")
+
+    def _swap_in_livery_folder(self, livery_build_path: Path, final_livery_dest_path: Path):
+        """
+        Renames a livery built by _prepare_livery_destination into place. An installed version is first renamed to
+        a '__temp_trash_*' sibling and deleted in the background, so deleting it never holds up the install.
+        """
+        trash_path: Path | None = None
+        if final_livery_dest_path.exists():
+            trash_path = final_livery_dest_path.with_name(f"__temp_trash_{final_livery_dest_path.name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+            try:
+                os.rename(final_livery_dest_path, trash_path)
+            except OSError as e:
+                raise RuntimeError(f"Failed to replace existing livery folder '{final_livery_dest_path}': {e}. Check if MSFS or File Explorer is using it.")
+        try:
+            os.rename(livery_build_path, final_livery_dest_path)
+        except OSError:
+            if trash_path:
+                try:
+                    os.rename(trash_path, final_livery_dest_path) # Put the installed version back
+                except OSError as e_restore:
+                    self.log(f"Could not put the installed livery back after the failed replacement ({e_restore}). It is kept in "
+                             f"'{trash_path}': rename that folder to '{final_livery_dest_path.name}' to restore it.", "ERROR")
+            raise
+        self.log(f"Final livery destination folder in place: {final_livery_dest_path.name}", "SUCCESS")
+        if trash_path:
+            self._defer_folder_deletion(trash_path)
+
+    def _defer_folder_deletion(self, folder_path: Path):
+        """Queues a folder for deletion on the background deletion thread, starting the thread if needed."""
+        self._deferred_deletions.put(folder_path)
+        with self._destination_locks_guard:
+            if self._deferred_deletion_thread is None or not self._deferred_deletion_thread.is_alive():
+                self._deferred_deletion_thread = threading.Thread(target=self._deferred_deletion_worker, name="deferred_deletion", daemon=True)
+                self._deferred_deletion_thread.start()
+        self.log(f"Old folder '{folder_path.name}' queued for background deletion.", "DETAIL")
+
+    def _deferred_deletion_worker(self):
+        """Deletes queued folders one at a time. A folder it cannot delete keeps its '__temp_' name and is not listed in layout.json."""
+        while True:
+            folder_path = self._deferred_deletions.get()
+            try:
+                shutil.rmtree(folder_path)
+                self.log(f"Deleted old folder in the background: {folder_path.name}", "DETAIL")
+            except FileNotFoundError:
+                pass # Already removed, e.g. by the startup sweeper
+            except OSError as e:
+                self.log(f"Could not delete old folder '{folder_path}' in the background: {e}", "WARNING")
+            finally:
+                self._deferred_deletions.task_done()
+
+    def _is_unchanged_on_disk(self, dest_file: Path, incoming_size: int, incoming_crc: int) -> bool:
+        """True when 'dest_file' already holds the incoming content (same size first, then same CRC-32)."""
+        try:
+            return dest_file.is_file() and dest_file.stat().st_size == incoming_size and _file_crc32(dest_file) == incoming_crc
+        except OSError:
+            return False
+
+    def _prune_livery_folder(self, livery_dest_path: Path, kept_files: set[str]) -> int:
+        """
+        Incremental update: deletes files of the previous version that the new one does not have
+        (paths not in 'kept_files', compared with os.path.normcase) and folders left empty. Returns the files deleted.
+        """
+        removed_count = 0
+        for dir_path, _, file_names in os.walk(livery_dest_path, topdown=False):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                if os.path.normcase(file_path) not in kept_files:
+                    os.remove(file_path)
+                    removed_count += 1
+            if dir_path != str(livery_dest_path) and not os.listdir(dir_path):
+                os.rmdir(dir_path)
+        if removed_count:
+            self.log(f"Removed {removed_count} file(s) the new version of '{livery_dest_path.name}' no longer has.", "DETAIL")
+        return removed_count
+
+    def _copy_livery_files(self, file_pairs: list[tuple[Path, Path]], copy_workers: int, copy_label: str) -> int:
+        """_copy_files with throughput logging and the copied size shown in the status bar while it runs."""
+        total_bytes = sum(os.stat(source_path).st_size for source_path, _ in file_pairs)
+        copied_bytes = [0]
+        last_status_update = [0.0]
+        progress_lock = threading.Lock()
+        def report_bytes_copied(byte_count: int):
+            with progress_lock:
+                copied_bytes[0] += byte_count
+                now = time.perf_counter()
+                if now - last_status_update[0] < COPY_PROGRESS_INTERVAL:
+                    return
+                last_status_update[0] = now
+                status_text = f"Copying '{copy_label}': {copied_bytes[0] / (1024 * 1024):.0f} / {total_bytes / (1024 * 1024):.0f} MB"
+            self.master.after(0, lambda s=status_text: self.status_var.set(s))
+
+        copy_start = time.perf_counter()
+        _copy_files(file_pairs, copy_workers, on_bytes_copied=report_bytes_copied)
+        elapsed = max(time.perf_counter() - copy_start, 1e-6)
+        self.log(f"Copied {len(file_pairs)} file(s) to '{copy_label}': {total_bytes / (1024 * 1024):.1f} MB in {elapsed:.2f}s "
+                 f"({total_bytes / (1024 * 1024) / elapsed:.1f} MB/s, {max(1, min(copy_workers, len(file_pairs)))} worker(s)).", "DETAIL")
+        return total_bytes
+
+    def _is_staged_livery_source(self, livery_source_path: Path, common_config: dict) -> bool:
+        """
+        True when the livery source lies in this batch's '__temp_*' folders inside the target package, i.e. it is
+        deleted after the install anyway and its folders may be moved. PTP cache entries and the like are not.
+        """
+        try:
+            relative_source = livery_source_path.resolve().relative_to(common_config['main_package_folder'].resolve())
+        except (ValueError, OSError):
+            return False
+        return bool(relative_source.parts) and relative_source.parts[0].startswith("__temp_")
+
+    def _place_livery_folder(self, source_dir: Path, dest_dir: Path, source_is_staged: bool, kept_files: set[str] | None = None,
+                             copy_workers: int = 1, staged_file_crcs: dict[str, int] | None = None) -> str:
+        """
+        Puts a model/texture folder of a livery in place. A staged source on the destination's volume is renamed
+        into place (a metadata-only operation); anything else, or a failed rename, is copied on 'copy_workers'
+        threads. Returns "Moved" or "Copied". 'kept_files' (incremental update) collects the installed paths; an
+        existing 'dest_dir' is then updated file by file, leaving identical files untouched, and "Updated" is returned.
+        Source files found in 'staged_file_crcs' (extracted from a ZIP) are compared by their stored CRC, unread.
+        """
+        if kept_files is not None and dest_dir.is_dir():
+            written_count = unchanged_count = 0
+            files_to_copy: list[tuple[Path, Path]] = []
+            for dir_path, _, file_names in os.walk(source_dir):
+                for file_name in file_names:
+                    src_file = Path(dir_path) / file_name
+                    dest_file = dest_dir / src_file.relative_to(source_dir)
+                    kept_files.add(os.path.normcase(str(dest_file)))
+                    src_size = src_file.stat().st_size
+                    if dest_file.is_file() and dest_file.stat().st_size == src_size:
+                        src_crc = (staged_file_crcs or {}).get(os.path.normcase(str(src_file)))
+                        if src_crc is None:
+                            src_crc = _file_crc32(src_file) # Not extracted from a ZIP (folder, PTP): hashed once, only when the sizes match
+                        if self._is_unchanged_on_disk(dest_file, src_size, src_crc):
+                            unchanged_count += 1
+                            continue
+                    if dest_file.is_dir():
+                        shutil.rmtree(dest_file)
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    dest_file.unlink(missing_ok=True) # Replace, never rewrite in place (the old file may be linked elsewhere)
+                    if source_is_staged:
+                        try:
+                            os.replace(src_file, dest_file)
+                            written_count += 1
+                            continue
+                        except OSError:
+                            pass
+                    files_to_copy.append((src_file, dest_file))
+            if files_to_copy:
+                self._copy_livery_files(files_to_copy, copy_workers, dest_dir.name)
+                written_count += len(files_to_copy)
+            self.log(f"'{dest_dir.name}': {written_count} changed file(s) written, {unchanged_count} unchanged file(s) kept.", "DETAIL")
+            return "Updated"
+
+        placed_by = "Copied"
+        if source_is_staged and not dest_dir.exists():
+            try:
+                if os.stat(source_dir).st_dev == os.stat(dest_dir.parent).st_dev:
+                    os.rename(source_dir, dest_dir)
+                    placed_by = "Moved"
+            except OSError as e:
+                self.log(f"Could not move '{source_dir.name}' into place ({e}). Copying it instead.", "DETAIL")
+        if placed_by == "Copied":
+            self._copy_livery_files(_folder_copy_pairs(source_dir, dest_dir), copy_workers, dest_dir.name)
+        if kept_files is not None:
+            for dir_path, _, file_names in os.walk(dest_dir):
+                kept_files.update(os.path.normcase(os.path.join(dir_path, file_name)) for file_name in file_names)
+        return placed_by
+
+    def _copy_ini_to_localstate(self, source_ini_display_name: str, target_ini_name_in_localstate: str,
+                                common_config: dict, write_ini_to: Callable[[Path], None]) -> bool:
+        """Places the livery's .ini as '<atc_id>.ini' in the PMDG LocalState 'work/Aircraft' folder. 'write_ini_to' writes the file."""
+        pmdg_ls_pkg_path = common_config['pmdg_localstate_package_path'] # Path to pmdg-aircraft-737, etc. in LocalState
+        if not pmdg_ls_pkg_path.is_dir():
+            self.log(f"PMDG LocalState Package Path for '{common_config['aircraft_variant']}' is invalid: {pmdg_ls_pkg_path}. Cannot copy INI.", "ERROR")
+            return False
+        target_ini_storage_dir = pmdg_ls_pkg_path / "work" / "Aircraft"
+        target_ini_final_path_in_localstate = target_ini_storage_dir / target_ini_name_in_localstate
+        try:
+            target_ini_storage_dir.mkdir(parents=True, exist_ok=True)
+            write_ini_to(target_ini_final_path_in_localstate)
+            self.log(f"INI file '{source_ini_display_name}' copied as '{target_ini_name_in_localstate}' to: {target_ini_storage_dir}", "SUCCESS")
+            return True
+        except Exception as e_cp_ini:
+            self.log(f"Failed to copy INI '{source_ini_display_name}' to '{target_ini_final_path_in_localstate}': {e_cp_ini}", "ERROR")
+            return False
+
+    def _find_stale_temp_folders(self, community_path_str: str) -> list[Path]:
+        """
+        Staging folders this tool creates ('__temp_*' in the livery packages, PTP cache and system temp folder)
+        that were last modified more than STALE_TEMP_MAX_AGE_SECONDS ago, i.e. no running install still uses them.
+        A '__temp_trash_*' folder whose livery folder is missing is left out: it holds the only copy of that livery.
+        """
+        search_dirs: list[tuple[Path, tuple[str, ...]]] = []
+        if community_path_str:
+            for package_name in sorted(set(VARIANT_PACKAGE_MAP.values())):
+                package_root_path = Path(community_path_str) / package_name
+                search_dirs += [(package_root_path, STALE_TEMP_PACKAGE_PREFIXES), (package_root_path / "SimObjects" / "Airplanes", STALE_TEMP_PACKAGE_PREFIXES)]
+        search_dirs.append((Path.home() / CONFIG_DIR_NAME / PTP_CACHE_DIR_NAME, ("__temp_",)))
+        search_dirs.append((Path(tempfile.gettempdir()), STALE_TEMP_SYSTEM_PREFIXES))
+
+        stale_before = time.time() - STALE_TEMP_MAX_AGE_SECONDS
+        stale_folders = []
+        for search_dir, prefixes in search_dirs:
+            try:
+                with os.scandir(search_dir) as dir_entries:
+                    for dir_entry in dir_entries:
+                        if dir_entry.name.startswith(prefixes) and dir_entry.is_dir(follow_symlinks=False) \
+                           and dir_entry.stat(follow_symlinks=False).st_mtime < stale_before:
+                            # A replaced livery whose swap failed and could not be put back: the only copy left
+                            trash_of_livery = re.fullmatch(r"__temp_trash_(.+)_\d{20}", dir_entry.name)
+                            if trash_of_livery and not (search_dir / trash_of_livery.group(1)).exists():
+                                self.log(f"Keeping '{dir_entry.path}': livery folder '{trash_of_livery.group(1)}' no longer exists and this "
+                                         f"is its previous version. Rename the folder to restore it, or delete it.", "WARNING")
+                                continue
+                            stale_folders.append(Path(dir_entry.path))
+            except OSError:
+                continue # Package not installed, or not readable
+        return stale_folders
+
+    def _sweep_stale_temp_folders(self, community_path_str: str):
+        """Startup sweeper (background thread): deletes staging folders left behind by interrupted runs and logs the space reclaimed."""
+        try:
+            stale_folders = self._find_stale_temp_folders(community_path_str)
+            if not stale_folders:
+                return
+            reclaimed_bytes = removed_count = 0
+            for stale_folder in stale_folders:
+                folder_size = _directory_size(stale_folder)
+                shutil.rmtree(stale_folder, ignore_errors=True)
+                reclaimed_bytes += folder_size - _directory_size(stale_folder)
+                if stale_folder.exists():
+                    self.log(f"Could not fully delete stale temp folder '{stale_folder}' (files in use?).", "WARNING")
+                else:
+                    removed_count += 1
+                    self.log(f"Deleted stale temp folder: {stale_folder} ({folder_size / (1024 * 1024):.1f} MB)", "DETAIL")
+            self.log(f"Removed {removed_count} stale temp folder(s) left by interrupted runs; "
+                     f"{reclaimed_bytes / (1024 * 1024):.1f} MB reclaimed.", "INFO")
+        except Exception as e:
+            self.log(f"Stale temp folder cleanup failed: {e}", "WARNING")
+
+    def _remove_failed_livery_folder(self, livery_build_path: Path):
+        """Cleanup after a failed livery: its staging folder is deleted in the background. Any other folder is left alone."""
+        if not livery_build_path.exists():
+            return
+        if not livery_build_path.name.startswith("__temp_swap_"):
+            self.log(f"Not removing '{livery_build_path}' after the failure: only staging folders are discarded.", "WARNING")
+            return
+        self.log(f"Discarding staging folder of failed livery: {livery_build_path.name}", "WARNING")
+        self._defer_folder_deletion(livery_build_path)
+
     def _process_single_livery(self,
                                extracted_livery_source_path: Path,
                                original_archive_path: Path, # This is the path to the .zip or .ptp file being processed (or sub-PTP)
@@ -1608,103 +3249,82 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         processing_error_detail = "Unknown error during individual livery processing."
         livery_display_name = "Unknown Livery" # Default
         final_livery_dest_path: Path | None = None
+        livery_build_path: Path | None = None # Removed on failure
+        destination_lock: threading.Lock | None = None
 
         try:
-            # --- Determine the livery display name ---
-            if specific_livery_name:
-                livery_display_name = specific_livery_name
-                # original_archive_path.name here would be like "Texture.1.PTP" or the nested ZIP name
-                self.log(f"Using specific name: '{livery_display_name}' (from PTP settings/nested archive for content of '{original_archive_path.name}')", "INFO")
-            # Check if this is the single, top-level archive selected by the user AND a custom name is provided in the UI
-            elif len(self.selected_zip_files) == 1 and Path(self.selected_zip_files[0]) == original_archive_path and self.custom_name_var.get():
-                livery_display_name = self.custom_name_var.get()
-                self.log(f"Using user-provided custom name: '{livery_display_name}' for the single selected archive: {original_archive_path.name}", "INFO")
-            else:
-                # Fallback for:
-                # - Multiple top-level archives selected by the user.
-                # - A single top-level archive selected, but no custom name provided.
-                # - Nested ZIP archives (that are not sub-PTPs handled by specific_livery_name).
-                livery_display_name = self.get_livery_name(original_archive_path, extracted_livery_source_path)
-                self.log(f"Auto-detected/generated name: '{livery_display_name}' for {original_archive_path.name}", "INFO")
-
-            sanitized_fs_foldername_suffix = re.sub(r'[\\/*?:"<>|]', '_', livery_display_name).strip().replace('.', '_')
-            if not sanitized_fs_foldername_suffix:
-                sanitized_fs_foldername_suffix = f"UnnamedLivery_{original_archive_path.stem}_{datetime.now().strftime('%S%f')}"
-                self.log(f"Sanitized livery name was empty, using generated folder suffix: '{sanitized_fs_foldername_suffix}'.", "WARNING")
-
-            # Construct the final destination path for this specific livery
-            final_livery_folder_name_in_simobjects = f"{common_config['base_aircraft_folder_name']} {sanitized_fs_foldername_suffix}"
-            final_livery_dest_path = common_config['main_package_folder'] / "SimObjects" / "Airplanes" / final_livery_folder_name_in_simobjects
-            
-            self.log(f"Final livery destination folder: {final_livery_dest_path}", "DETAIL")
-
-            if final_livery_dest_path.exists():
-                self.log(f"Destination folder '{final_livery_dest_path.name}' already exists. Overwriting...", "WARNING")
-                try:
-                    shutil.rmtree(final_livery_dest_path)
-                    self.log(f"Existing destination folder deleted.", "DETAIL")
-                    time.sleep(0.1) # Brief pause to allow filesystem to catch up
-                except OSError as e:
-                    raise RuntimeError(f"Failed to delete existing livery folder '{final_livery_dest_path}': {e}. Check if MSFS or File Explorer is using it.")
-            
-            final_livery_dest_path.mkdir(parents=True, exist_ok=True)
-            self.log(f"Final livery destination folder created: {final_livery_dest_path.name}", "SUCCESS")
-
-            self.log(f"Copying files from prepared source: {extracted_livery_source_path} to {final_livery_dest_path.name}", "INFO")
-
-            # --- Locate and copy aircraft.cfg ---
-            aircraft_cfg_source_str = self.find_file_in_dir(extracted_livery_source_path, "aircraft.cfg")
+            # Walked once; every aircraft.cfg/texture/.ini lookup below is answered from this index
+            source_tree_index = _index_livery_tree(extracted_livery_source_path)
+            self.log(f"Indexed source: {len(source_tree_index['sizes'])} file(s), "
+                     f"{sum(source_tree_index['sizes'].values()) / (1024 * 1024):.1f} MB.", "DETAIL")
+            livery_display_name, final_livery_dest_path = self._resolve_livery_destination(
+                original_archive_path, common_config, specific_livery_name,
+                lambda: self.get_livery_name(original_archive_path, extracted_livery_source_path, source_tree_index))
+
+            # --- Locate aircraft.cfg (before anything is written) ---
+            aircraft_cfg_source_str = self.find_file_in_dir(extracted_livery_source_path, "aircraft.cfg", source_tree_index)
             if not aircraft_cfg_source_str or not Path(aircraft_cfg_source_str).is_file():
                 # Check one level deeper, common in simple zips: LiveryName/aircraft.cfg
                 if extracted_livery_source_path.is_dir():
                     for item in extracted_livery_source_path.iterdir():
                         if item.is_dir() and not item.name.startswith(('.', '__MACOSX', '__temp_')): # Avoid special/temp folders
-                            cfg_in_sub = self.find_file_in_dir(item, "aircraft.cfg")
+                            cfg_in_sub = self.find_file_in_dir(item, "aircraft.cfg", source_tree_index)
                             if cfg_in_sub:
                                 aircraft_cfg_source_str = cfg_in_sub
                                 self.log(f"Found aircraft.cfg in subfolder: {item.name}", "DETAIL")
                                 break
                 if not aircraft_cfg_source_str:            
                     raise FileNotFoundError(f"aircraft.cfg not found in processed source '{extracted_livery_source_path}' or its direct subfolders.")
-            
+
+            destination_lock = self._lock_livery_destination(final_livery_dest_path)
+            livery_build_path, updating_existing = self._prepare_livery_destination(final_livery_dest_path, common_config.get('incremental_reinstall', False),
+                                                                                    common_config.get('copy_workers', 1))
+            # Incremental update: every path the new version installs, so the rest can be pruned afterwards
+            kept_livery_files: set[str] | None = set() if updating_existing else None
+
+            self.log(f"Copying files from prepared source: {extracted_livery_source_path} to {final_livery_dest_path.name}", "INFO")
             aircraft_cfg_source_path = Path(aircraft_cfg_source_str)
-            aircraft_cfg_final_target_path = final_livery_dest_path / "aircraft.cfg"
-            shutil.copy2(aircraft_cfg_source_path, aircraft_cfg_final_target_path)
+            aircraft_cfg_final_target_path = livery_build_path / "aircraft.cfg"
+            _copy_files([(aircraft_cfg_source_path, aircraft_cfg_final_target_path)])
+            if kept_livery_files is not None: kept_livery_files.add(os.path.normcase(str(aircraft_cfg_final_target_path)))
             self.log(f"Copied '{aircraft_cfg_source_path.name}' to '{aircraft_cfg_final_target_path}'.", "DETAIL")
             
             # The directory containing the aircraft.cfg is considered the root of the livery content
             effective_content_source_dir = aircraft_cfg_source_path.parent
+            # Staged content (extracted/converted into the package's temp folders) is moved instead of copied
+            source_is_staged = self._is_staged_livery_source(effective_content_source_dir, common_config)
 
             # --- Copy model folder(s) ---
             model_folder_copied = False
-            for item in effective_content_source_dir.iterdir():
+            for item in list(effective_content_source_dir.iterdir()): # Listed up front: folders may be moved out below
                 if item.is_dir() and item.name.lower().startswith("model"):
                     model_src_path = item
-                    model_dest_path = final_livery_dest_path / model_src_path.name # Preserve original model folder name (e.g., model.XXX)
-                    self.log(f"Copying model folder '{model_src_path.name}' to '{model_dest_path}'...", "DETAIL")
-                    shutil.copytree(model_src_path, model_dest_path, dirs_exist_ok=True)
+                    model_dest_path = livery_build_path / model_src_path.name # Preserve original model folder name (e.g., model.XXX)
+                    placed_by = self._place_livery_folder(model_src_path, model_dest_path, source_is_staged, kept_livery_files,
+                                                          common_config.get('copy_workers', 1), common_config.get('staged_file_crcs'))
+                    self.log(f"{placed_by} model folder '{model_src_path.name}' to '{model_dest_path}'.", "DETAIL")
                     model_folder_copied = True 
             if not model_folder_copied:
                 self.log("No 'model.*' folder found in source. This is okay if model is shared or defined differently.", "DETAIL")
 
             # --- Copy texture folder(s) ---
-            texture_dirs_source_str_list = self.find_texture_dirs_in_dir(effective_content_source_dir)
+            texture_dirs_source_str_list = self.find_texture_dirs_in_dir(effective_content_source_dir, source_tree_index)
             if not texture_dirs_source_str_list:
                 self.log(f"Warning: No 'texture.*' folders found in processed source content directory '{effective_content_source_dir}'. Livery may not appear correctly.", "WARNING")
             else:
                 for tex_dir_src_str in texture_dirs_source_str_list:
                     tex_dir_src_path = Path(tex_dir_src_str)
-                    tex_dir_dest_path = final_livery_dest_path / tex_dir_src_path.name # Preserve original texture folder name
-                    shutil.copytree(tex_dir_src_path, tex_dir_dest_path, dirs_exist_ok=True)
-                    self.log(f"Copied texture folder '{tex_dir_src_path.name}' to '{tex_dir_dest_path}'.", "DETAIL")
+                    tex_dir_dest_path = livery_build_path / tex_dir_src_path.name # Preserve original texture folder name
+                    placed_by = self._place_livery_folder(tex_dir_src_path, tex_dir_dest_path, source_is_staged, kept_livery_files,
+                                                          common_config.get('copy_workers', 1), common_config.get('staged_file_crcs'))
+                    self.log(f"{placed_by} texture folder '{tex_dir_src_path.name}' to '{tex_dir_dest_path}'.", "DETAIL")
             
             # --- Copy other relevant files (e.g. panel.cfg, sound.cfg if they exist at the same level as aircraft.cfg) ---
-            copied_extras_count = 0
+            extra_files_to_copy: list[tuple[Path, Path]] = []
             atc_id_for_ini_handling = self.extract_atc_id(aircraft_cfg_final_target_path) # Get ATC ID from the *copied* aircraft.cfg
             
             # Define files that are typically handled separately or are part of the core structure already copied
-            files_to_exclude_lc = {"aircraft.cfg", "options.ini", "layout.json", "manifest.json", 
-                                   "config.cfg", "aircraft.ini", "settings.dat", "model.cfg"} # PTP specific files
+            files_to_exclude_lc = set(LIVERY_EXCLUDED_ROOT_FILES)
             if atc_id_for_ini_handling: # If an ATC ID was found, also exclude its potential .ini name
                 files_to_exclude_lc.add(f"{atc_id_for_ini_handling}.ini".lower())
 
@@ -1719,20 +3339,24 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 
                 if item_src_full_path.is_file():
                     # Copy common config/data/font files if present.
-                    common_extensions = ['.cfg', '.xml', '.dat', '.txt', '.flags', '.ttf', '.otf', '.ini', '.sound', '.air', '.flt', '.fdm']
                     # Check if it's not one of the already excluded .ini files by name
                     is_potentially_options_ini = item_name.lower() == "options.ini"
                     is_potentially_atc_id_ini = atc_id_for_ini_handling and item_name.lower() == f"{atc_id_for_ini_handling}.ini"
 
-                    if item_src_full_path.suffix.lower() in common_extensions and not is_potentially_options_ini and not is_potentially_atc_id_ini:
-                        item_dest_full_path = final_livery_dest_path / item_name
-                        try:
-                            shutil.copy2(item_src_full_path, item_dest_full_path)
-                            self.log(f"Copied extra file '{item_name}' to '{final_livery_dest_path.name}'.", "DETAIL")
-                            copied_extras_count += 1
-                        except Exception as e_copy_ex:
-                            self.log(f"Could not copy extra file '{item_name}': {e_copy_ex}", "WARNING")
-            if copied_extras_count > 0: self.log(f"Copied {copied_extras_count} additional relevant file(s).", "DETAIL")
+                    if item_src_full_path.suffix.lower() in LIVERY_EXTRA_FILE_EXTENSIONS and not is_potentially_options_ini and not is_potentially_atc_id_ini:
+                        extra_files_to_copy.append((item_src_full_path, livery_build_path / item_name))
+            copied_extra_files: list[Path] = []
+            if extra_files_to_copy:
+                try:
+                    _copy_files(extra_files_to_copy, common_config.get('copy_workers', 1), on_file_copied=copied_extra_files.append)
+                except Exception as e_copy_ex:
+                    self.log(f"Could not copy all extra files: {e_copy_ex}", "WARNING")
+            for item_dest_full_path in copied_extra_files:
+                if kept_livery_files is not None: kept_livery_files.add(os.path.normcase(str(item_dest_full_path)))
+                self.log(f"Copied extra file '{item_dest_full_path.name}' to '{final_livery_dest_path.name}'.", "DETAIL")
+            if copied_extra_files: self.log(f"Copied {len(copied_extra_files)} additional relevant file(s).", "DETAIL")
+            if kept_livery_files is not None:
+                self._prune_livery_folder(livery_build_path, kept_livery_files)
             self.log("Essential livery file copying complete.", "SUCCESS")
 
             # --- Process .ini file for LocalState ---
@@ -1746,33 +3370,23 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 target_ini_name_in_localstate = f"{atc_id_for_ini_handling}.ini"
                 
                 # Prefer "options.ini" if present in the source livery structure
-                options_ini_in_source_str = self.find_file_in_dir(effective_content_source_dir, "options.ini")
+                options_ini_in_source_str = self.find_file_in_dir(effective_content_source_dir, "options.ini", source_tree_index)
                 if options_ini_in_source_str and Path(options_ini_in_source_str).is_file():
                     source_ini_to_copy_path = Path(options_ini_in_source_str)
                     ini_file_found_in_source = True
                     self.log(f"Found '{source_ini_to_copy_path.name}' in source.", "DETAIL")
                 else: 
                     # If no "options.ini", check if an .ini file already named with ATC_ID exists
-                    atc_id_ini_in_source_str = self.find_file_in_dir(effective_content_source_dir, target_ini_name_in_localstate.lower())
+                    atc_id_ini_in_source_str = self.find_file_in_dir(effective_content_source_dir, target_ini_name_in_localstate.lower(), source_tree_index)
                     if atc_id_ini_in_source_str and Path(atc_id_ini_in_source_str).is_file():
                         source_ini_to_copy_path = Path(atc_id_ini_in_source_str)
                         ini_file_found_in_source = True
                         self.log(f"Found pre-named '{source_ini_to_copy_path.name}' in source.", "DETAIL")
             
             if ini_file_found_in_source and source_ini_to_copy_path and target_ini_name_in_localstate:
-                pmdg_ls_pkg_path = common_config['pmdg_localstate_package_path'] # Path to pmdg-aircraft-737, etc. in LocalState
-                if pmdg_ls_pkg_path.is_dir():
-                    target_ini_storage_dir = pmdg_ls_pkg_path / "work" / "Aircraft"
-                    target_ini_final_path_in_localstate = target_ini_storage_dir / target_ini_name_in_localstate
-                    try:
-                        target_ini_storage_dir.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(source_ini_to_copy_path, target_ini_final_path_in_localstate)
-                        self.log(f"INI file '{source_ini_to_copy_path.name}' copied as '{target_ini_name_in_localstate}' to: {target_ini_storage_dir}", "SUCCESS")
-                        ini_copied_to_localstate = True
-                    except Exception as e_cp_ini:
-                        self.log(f"Failed to copy INI '{source_ini_to_copy_path.name}' to '{target_ini_final_path_in_localstate}': {e_cp_ini}", "ERROR")
-                else:
-                    self.log(f"PMDG LocalState Package Path for '{common_config['aircraft_variant']}' is invalid: {pmdg_ls_pkg_path}. Cannot copy INI.", "ERROR")
+                ini_copied_to_localstate = self._copy_ini_to_localstate(
+                    source_ini_to_copy_path.name, target_ini_name_in_localstate, common_config,
+                    lambda target_path: _copy_files([(source_ini_to_copy_path, target_path)]))
             elif atc_id_for_ini_handling: # An ATC ID was found, but no suitable .ini file
                 self.log(f"Neither 'options.ini' nor '{atc_id_for_ini_handling}.ini' found in source '{effective_content_source_dir}'. No INI copied to LocalState.", "DETAIL")
             else: # No ATC ID found in aircraft.cfg
@@ -1783,9 +3397,12 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             self.modify_aircraft_cfg(aircraft_cfg_final_target_path, 
                                      common_config['aircraft_variant'], 
                                      livery_display_name) # Pass the determined livery_display_name
+            self._swap_in_livery_folder(livery_build_path, final_livery_dest_path)
+            livery_build_path = None
 
             livery_success = True
             processing_error_detail = f"Installed successfully as '{livery_display_name}'."
+            common_config.get('installed_livery_folders', []).append(final_livery_dest_path.name)
             if ini_file_found_in_source and not ini_copied_to_localstate and atc_id_for_ini_handling:
                 ini_name_msg = source_ini_to_copy_path.name if source_ini_to_copy_path else "INI file"
                 processing_error_detail += f" (Warning: {ini_name_msg} found but failed to copy to LocalState)"
@@ -1803,17 +3420,342 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             self.log(f"Traceback _process_single_livery: {traceback.format_exc()}", "DETAIL")
         
         # --- Cleanup on failure ---
-        if not livery_success and final_livery_dest_path and final_livery_dest_path.exists():
-            self.log(f"Cleaning up failed livery folder: {final_livery_dest_path}", "WARNING")
-            try:
-                shutil.rmtree(final_livery_dest_path)
-                self.log(f"Destination folder of failed livery removed: {final_livery_dest_path.name}", "INFO")
-            except Exception as e_cleanup:
-                self.log(f"Error removing failed livery folder '{final_livery_dest_path.name}': {e_cleanup}", "ERROR")
+        if not livery_success and livery_build_path:
+            self._remove_failed_livery_folder(livery_build_path)
+
+        if destination_lock:
+            destination_lock.release()
         
         return livery_success, processing_error_detail
 
-    def install_livery_logic(self, archive_paths_to_process: list[str]):
+    def _process_single_livery_from_zip(self,
+                                        zip_source: Path | bytes,
+                                        original_archive_path: Path,
+                                        zip_probe: dict,
+                                        common_config: dict,
+                                        specific_livery_name: str | None = None
+                                        ) -> tuple[bool, str]:
+        """
+        Installs a single-livery ZIP directly from the archive: each member the installer keeps is written
+        straight to its final path under SimObjects/Airplanes/<livery>, with no temp extraction and no second copy.
+        Members that would be discarded anyway (__MACOSX, layout.json, manifest.json, other folders) are never inflated.
+        'zip_probe' is the result of _probe_zip_archive for 'zip_source'.
+        """
+        livery_success = False
+        processing_error_detail = "Unknown error during individual livery processing."
+        livery_display_name = "Unknown Livery"
+        final_livery_dest_path: Path | None = None
+        livery_build_path: Path | None = None # Removed on failure
+        destination_lock: threading.Lock | None = None
+
+        try:
+            livery_display_name, livery_dest_path = self._resolve_livery_destination(
+                original_archive_path, common_config, specific_livery_name,
+                lambda: zip_probe['title'] or self._livery_name_from_filename(original_archive_path))
+
+            with _open_zip_source(zip_source) as zip_ref:
+                self._check_zip_member_paths(zip_ref)
+                infos_by_path = {info.filename.replace('\\', '/'): info for info in zip_ref.infolist()}
+                atc_id_for_ini_handling = zip_probe['atc_id']
+                planned_members, ini_member_path = _plan_livery_zip_members(
+                    list(infos_by_path), zip_probe['livery_root'], zip_probe['texture_folders'], atc_id_for_ini_handling)
+                if not any(rel_dest == "aircraft.cfg" for _, rel_dest in planned_members):
+                    raise FileNotFoundError(f"aircraft.cfg not found in ZIP '{original_archive_path.name}'.")
+
+                destination_lock = self._lock_livery_destination(livery_dest_path)
+                final_livery_dest_path = livery_dest_path
+                livery_build_path, updating_existing = self._prepare_livery_destination(livery_dest_path, common_config.get('incremental_reinstall', False),
+                                                                                        common_config.get('copy_workers', 1))
+                member_targets = [(infos_by_path[member_path], _zip_member_target(livery_build_path, rel_dest)) for member_path, rel_dest in planned_members]
+                unchanged_count = 0
+                if updating_existing:
+                    # Incremental update (in the seeded staging folder): members whose size and CRC-32 match the file on disk are not written at all
+                    self._prune_livery_folder(livery_build_path, {os.path.normcase(str(target)) for _, target in member_targets})
+                    changed_targets = []
+                    for info, target in member_targets:
+                        if info.is_dir(): # Folder entries only make sure the folder exists; its seeded files stay
+                            if target.exists() and not target.is_dir(): target.unlink() # A file of the old version is now a folder
+                            target.mkdir(parents=True, exist_ok=True)
+                            continue
+                        if self._is_unchanged_on_disk(target, info.file_size, info.CRC):
+                            unchanged_count += 1
+                            continue
+                        if target.is_dir(): shutil.rmtree(target) # A folder of the old version is now a file
+                        target.unlink(missing_ok=True) # Replace, never rewrite in place (the old file may be linked elsewhere)
+                        changed_targets.append((info, target))
+                    member_targets = changed_targets
+                self.log(f"Extracting {len(member_targets)} of {len(infos_by_path)} ZIP member(s) directly to {final_livery_dest_path.name}"
+                         f"{f' ({unchanged_count} unchanged file(s) kept)' if updating_existing else ''}", "INFO")
+                bytes_written = self._extract_zip_members(
+                    zip_source, member_targets,
+                    common_config.get('extract_workers', 1), original_archive_path.name, common_config.get('verify_stored_crc', False))
+                self.log(f"Wrote {bytes_written} bytes for '{livery_display_name}' "
+                         f"({len(infos_by_path) - len(planned_members)} member(s) skipped).", "SUCCESS")
+
+                # --- Process .ini file for LocalState (read straight from the archive) ---
+                self.log("Processing .ini file for LocalState...", "INFO")
+                ini_copied_to_localstate = False
+                if not atc_id_for_ini_handling:
+                    self.log("ATC ID not found in aircraft.cfg; cannot process .ini for LocalState.", "WARNING")
+                elif not ini_member_path:
+                    self.log(f"Neither 'options.ini' nor '{atc_id_for_ini_handling}.ini' found in '{original_archive_path.name}'. No INI copied to LocalState.", "DETAIL")
+                else:
+                    def write_ini_from_zip(target_ini_path: Path):
+                        with zip_ref.open(infos_by_path[ini_member_path]) as ini_stream, open(target_ini_path, 'wb') as ini_file:
+                            shutil.copyfileobj(ini_stream, ini_file)
+                    ini_copied_to_localstate = self._copy_ini_to_localstate(
+                        ini_member_path.rsplit('/', 1)[-1], f"{atc_id_for_ini_handling}.ini", common_config, write_ini_from_zip)
+
+            aircraft_cfg_final_target_path = livery_build_path / "aircraft.cfg"
+            self.log(f"Modifying aircraft.cfg at: {aircraft_cfg_final_target_path}...", "INFO")
+            self.modify_aircraft_cfg(aircraft_cfg_final_target_path, common_config['aircraft_variant'], livery_display_name)
+            self._swap_in_livery_folder(livery_build_path, final_livery_dest_path)
+            livery_build_path = None
+
+            livery_success = True
+            processing_error_detail = f"Installed successfully as '{livery_display_name}'."
+            common_config.get('installed_livery_folders', []).append(final_livery_dest_path.name)
+            if ini_member_path and atc_id_for_ini_handling and not ini_copied_to_localstate:
+                processing_error_detail += f" (Warning: {ini_member_path.rsplit('/', 1)[-1]} found but failed to copy to LocalState)"
+
+        except (FileNotFoundError, ValueError, RuntimeError, OSError, zipfile.BadZipFile) as e_proc:
+            processing_error_detail = str(e_proc)
+            current_name_for_log = specific_livery_name or livery_display_name or original_archive_path.name
+            self.log(f"LIVERY PROCESSING FAILED ({current_name_for_log}): {processing_error_detail}", "ERROR")
+        except Exception as e_unexp:
+            current_name_for_log = specific_livery_name or livery_display_name or original_archive_path.name
+            processing_error_detail = f"Unexpected error processing livery {current_name_for_log}: {str(e_unexp)}"
+            self.log(f"FATAL LIVERY ERROR ({current_name_for_log}): {processing_error_detail}", "ERROR")
+            import traceback
+            self.log(f"Traceback _process_single_livery_from_zip: {traceback.format_exc()}", "DETAIL")
+
+        if not livery_success and livery_build_path:
+            self._remove_failed_livery_folder(livery_build_path)
+
+        if destination_lock:
+            destination_lock.release()
+
+        return livery_success, processing_error_detail
+
+    def _load_nested_zip(self, outer_zip_ref: zipfile.ZipFile, member_info: zipfile.ZipInfo, spill_dir: Path) -> bytes | Path:
+        """
+        Reads a ZIP stored inside another ZIP without extracting the outer archive.
+        Small members are returned as bytes; members above NESTED_ZIP_MEMORY_LIMIT are streamed to a file in 'spill_dir'.
+        """
+        if member_info.file_size <= NESTED_ZIP_MEMORY_LIMIT:
+            return outer_zip_ref.read(member_info)
+        spill_path = spill_dir / f"__nested_{_zip_member_target(spill_dir, member_info.filename).name}"
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        with outer_zip_ref.open(member_info) as member_stream, open(spill_path, 'wb') as f_out:
+            shutil.copyfileobj(member_stream, f_out, ZIP_COPY_BUFFER_SIZE)
+        self.log(f"Nested ZIP '{member_info.filename}' ({member_info.file_size} bytes) spooled to {spill_path}.", "DETAIL")
+        return spill_path
+
+    def _iter_zip_pack_leaves(self,
+                              zip_source: Path | bytes,
+                              pack_label: str,
+                              zip_probe: dict,
+                              work_base: Path,
+                              depth: int = 1):
+        """
+        Walks a ZIP pack recursively and yields one leaf per livery archive found at any depth, as a dict:
+        {'label', 'name', 'kind' ('zip'|'ptp'|'error'), 'source', 'probe', 'work_dir', 'error'}.
+        Nested packs are read from their parent's member stream (see _load_nested_zip), never extracted.
+        Leaves are materialized only when the caller asks for the next one, which keeps memory bounded.
+        """
+        with _open_zip_source(zip_source) as zip_ref:
+            for nested_idx, nested_member in enumerate(zip_probe['nested_archives']):
+                nested_name = nested_member.rsplit('/', 1)[-1]
+                leaf = {'label': f"{pack_label} -> {nested_name}", 'name': nested_name, 'kind': 'error',
+                        'source': None, 'probe': None, 'error': "",
+                        # Unique temp subdir for anything this leaf still needs on disk (PTPs, spooled or multi-livery ZIPs)
+                        'work_dir': work_base / f"__zip_nested_proc_{Path(nested_name).stem}_{depth}_{nested_idx}_{datetime.now().strftime('%f')}"}
+                sub_pack = None
+                try:
+                    member_info = zip_ref.getinfo(nested_member)
+                    if nested_name.lower().endswith(".ptp"):
+                        # The PTP converter needs a real file: write just this member, not the whole pack
+                        leaf['work_dir'].mkdir(parents=True, exist_ok=True)
+                        nested_ptp_path = _zip_member_target(leaf['work_dir'], nested_name)
+                        with zip_ref.open(member_info) as member_stream, open(nested_ptp_path, 'wb') as f_out:
+                            shutil.copyfileobj(member_stream, f_out, ZIP_COPY_BUFFER_SIZE)
+                        leaf.update(kind='ptp', source=nested_ptp_path)
+                    else:
+                        nested_zip_source = self._load_nested_zip(zip_ref, member_info, leaf['work_dir'])
+                        nested_zip_probe = self._probe_zip_archive(nested_zip_source, leaf['label'])
+                        if nested_zip_probe['kind'] == 'nested':
+                            if depth >= MAX_NESTED_ARCHIVE_DEPTH:
+                                raise ValueError(f"Pack nested more than {MAX_NESTED_ARCHIVE_DEPTH} levels deep; not processed.")
+                            sub_pack = (nested_zip_source, nested_zip_probe)
+                        else:
+                            leaf.update(kind='zip', source=nested_zip_source, probe=nested_zip_probe)
+                except Exception as e_leaf:
+                    leaf.update(kind='error', error=str(e_leaf))
+
+                if sub_pack:
+                    self.log(f"'{leaf['label']}' is itself a ZIP pack ({len(sub_pack[1]['nested_archives'])} sub-archive(s), level {depth + 1}).", "INFO")
+                    yield from self._iter_zip_pack_leaves(sub_pack[0], leaf['label'], sub_pack[1], work_base, depth + 1)
+                else:
+                    yield leaf
+
+    def _install_pack_leaf(self, leaf: dict, common_config: dict) -> tuple[list[dict], int, bool]:
+        """
+        Installs one leaf yielded by _iter_zip_pack_leaves. Runs on a pack worker thread, so it records into
+        its own result list and counters, returned as (results, successful_liveries, had_failure).
+        """
+        leaf_results: list[dict] = []
+        leaf_success_counter = [0]
+        leaf_failure_flag = [False]
+        leaf_path_for_naming = Path(leaf['name']) # Livery name fallback uses the nested file name, as before
+        self.log(f"--- Pack livery: {leaf['label']} ---", "STEP")
+        try:
+            if leaf['kind'] == 'error':
+                raise RuntimeError(leaf['error'])
+            if leaf['kind'] == 'ptp':
+                self._process_ptp_file(
+                    leaf['source'], # The nested PTP written to the leaf's work folder
+                    leaf['work_dir'],
+                    common_config,
+                    leaf_results,
+                    leaf_success_counter,
+                    leaf_failure_flag
+                )
+            else:
+                if leaf['probe']['kind'] == 'single':
+                    # Single-livery nested ZIP: install straight from the in-memory (or spooled) copy
+                    liv_ok, det = self._process_single_livery_from_zip(leaf['source'], leaf_path_for_naming, leaf['probe'], common_config)
+                else:
+                    # Unrecognized layout inside the pack: extract it and let _process_single_livery auto-detect
+                    nested_zip_extract_target = leaf['work_dir'] / f"__extracted_sub_zip_{leaf_path_for_naming.stem}"
+                    nested_zip_extract_target.mkdir(parents=True, exist_ok=True)
+                    self._extract_archive(leaf['source'], nested_zip_extract_target, common_config['extract_workers'], leaf['label'],
+                                          common_config['verify_stored_crc'], common_config.get('staged_file_crcs'))
+                    liv_ok, det = self._process_single_livery(nested_zip_extract_target / leaf['probe']['content_root'], leaf_path_for_naming, common_config)
+                leaf_results.append({"file": leaf['label'], "success": liv_ok, "detail": det})
+                if liv_ok:
+                    leaf_success_counter[0] += 1
+                else:
+                    leaf_failure_flag[0] = True
+        except Exception as e_nest_proc:
+            self.log(f"ERROR processing nested archive '{leaf['label']}': {e_nest_proc}", "ERROR")
+            leaf_results.append({"file": leaf['label'], "success": False, "detail": str(e_nest_proc)})
+            leaf_failure_flag[0] = True
+        finally:
+            leaf['source'] = None # Drop the in-memory copy of the nested ZIP as soon as this leaf is done
+        return leaf_results, leaf_success_counter[0], leaf_failure_flag[0]
+
+    def _process_zip_pack(self,
+                          outer_zip_source: Path,
+                          pack_label: str,
+                          zip_probe: dict,
+                          archive_temp_base: Path,
+                          common_config: dict,
+                          results_summary_list: list[dict],
+                          batch_success_counter: list[int],
+                          batch_failure_flag_for_archive: list[bool]
+                          ) -> None:
+        """
+        Installs every livery archive inside a ZIP pack, including packs nested inside it (up to MAX_NESTED_ARCHIVE_DEPTH).
+        Leaves found by _iter_zip_pack_leaves are installed on a pool of 'pack_workers' threads; at most twice that many
+        leaves are held in memory at once. Results are added to the summary in pack order, one entry per leaf livery.
+        """
+        nested_members = zip_probe['nested_archives']
+        if not nested_members:
+            self.log(f"Pack '{pack_label}' contains no processable sub-archives.", "WARNING")
+            results_summary_list.append({"file": pack_label, "success": False, "detail": "ZIP Pack empty or no recognized sub-archives."})
+            batch_failure_flag_for_archive[0] = True
+            return
+
+        pack_workers = max(1, common_config.get('pack_workers', 1))
+        # Leaves already run in parallel; extracting each one on several threads too would only oversubscribe the CPU
+        leaf_config = dict(common_config, extract_workers=1) if pack_workers > 1 else common_config
+        leaves_in_flight = threading.BoundedSemaphore(pack_workers * 2)
+        pack_start_time = time.perf_counter()
+
+        def run_leaf(leaf: dict) -> tuple[list[dict], int, bool]:
+            try:
+                return self._install_pack_leaf(leaf, leaf_config)
+            finally:
+                leaves_in_flight.release()
+
+        leaf_futures = []
+        with ThreadPoolExecutor(max_workers=pack_workers, thread_name_prefix="pack_livery") as pool:
+            for leaf in self._iter_zip_pack_leaves(outer_zip_source, pack_label, zip_probe, archive_temp_base):
+                leaves_in_flight.acquire() # Blocks discovery while the pool is saturated
+                leaf_futures.append(pool.submit(run_leaf, leaf))
+
+        for leaf_future in leaf_futures: # Discovery order, not completion order
+            leaf_results, leaf_successes, leaf_had_failure = leaf_future.result()
+            results_summary_list.extend(leaf_results)
+            batch_success_counter[0] += leaf_successes
+            if leaf_had_failure:
+                batch_failure_flag_for_archive[0] = True
+        self.log(f"Pack '{pack_label}': {len(leaf_futures)} livery archive(s) processed in "
+                 f"{time.perf_counter() - pack_start_time:.1f}s ({pack_workers} worker(s)).", "INFO")
+
+    def _build_common_install_config(self) -> dict:
+        """
+        Resolves the paths and names used by an install for the selected variant (the 'common_config' passed down
+        to every livery). Raises ValueError when the setup is incomplete; nothing is created or modified on disk.
+        """
+        community_path = Path(self.community_path_var.get())
+        reference_livery_path = Path(self.reference_path_var.get())
+        selected_variant_for_install = self.aircraft_variant_var.get()
+
+        pmdg_localstate_base_package_path_str = ""
+        if selected_variant_for_install.startswith("777"):
+            if selected_variant_for_install == "777-200ER": pmdg_localstate_base_package_path_str = self.pmdg_77er_path_var.get()
+            elif selected_variant_for_install == "777-300ER": pmdg_localstate_base_package_path_str = self.pmdg_77w_path_var.get()
+            elif selected_variant_for_install == "777F": pmdg_localstate_base_package_path_str = self.pmdg_77f_path_var.get()
+        elif selected_variant_for_install.startswith("737"):
+            if "600" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_736_path_var.get()
+            elif "700" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_737_path_var.get()
+            elif "800" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_738_path_var.get()
+            elif "900" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_739_path_var.get()
+
+        if not pmdg_localstate_base_package_path_str:
+            raise ValueError(f"PMDG Base Package Path for '{selected_variant_for_install}' is not set in Setup.")
+        pmdg_localstate_for_variant_base_pkg = Path(pmdg_localstate_base_package_path_str)
+        if not pmdg_localstate_for_variant_base_pkg.is_dir():
+            raise ValueError(f"PMDG Base Package Path for '{selected_variant_for_install}' ('{pmdg_localstate_for_variant_base_pkg}') is not a valid directory.")
+
+        target_community_package_name = VARIANT_PACKAGE_MAP.get(selected_variant_for_install)
+        if not target_community_package_name:
+            raise ValueError(f"Community package mapping missing for variant: {selected_variant_for_install}")
+        target_community_package_root_path = community_path / target_community_package_name
+        
+        base_simobject_pmdg_folder_name = VARIANT_BASE_AIRCRAFT_MAP.get(selected_variant_for_install)
+        if not base_simobject_pmdg_folder_name:
+            raise ValueError(f"PMDG base SimObject folder name missing for variant: {selected_variant_for_install}")
+
+        return {
+            'reference_livery_path': reference_livery_path,
+            'pmdg_localstate_package_path': pmdg_localstate_for_variant_base_pkg,
+            'aircraft_variant': selected_variant_for_install,
+            'main_package_folder': target_community_package_root_path, # e.g., .../Community/pmdg-aircraft-737-liveries
+            'base_aircraft_folder_name': base_simobject_pmdg_folder_name, # e.g., PMDG 737-700
+            'extract_workers': self._get_extract_workers(),
+            'copy_workers': self._get_extract_workers(), # Same setting: threads per livery for extraction and copying
+            'pack_workers': self._get_pack_workers(),
+            'converter_slots': threading.BoundedSemaphore(self._get_pack_workers()), # Concurrent PTP conversions, all pools together
+            'verify_stored_crc': self.verify_stored_crc_var.get(),
+            'incremental_reinstall': self.incremental_reinstall_var.get(),
+            'skip_installed_archives': self.skip_installed_archives_var.get(),
+            'installed_livery_folders': [], # Livery folders installed for the current top-level archive
+            'archive_sha256': {}, # Selected archive path -> SHA-256, from fingerprinting
+            'staged_file_crcs': {}, # Normalized path of each file extracted from a ZIP -> its stored CRC-32 (incremental updates)
+            # None disables the PTP cache; stats are shared by all pool threads of the batch (guarded by _ptp_cache_lock)
+            'ptp_cache_dir': Path.home() / CONFIG_DIR_NAME / PTP_CACHE_DIR_NAME if self._get_ptp_cache_max_bytes() > 0 else None,
+            'ptp_cache_stats': {'hits': 0, 'misses': 0},
+            'converter_runs': [], # One record per ptp_converter.exe run, for the batch summary
+        }
+
+    def install_livery_logic(self, archive_paths_to_process: list[str], archive_probes: dict[str, dict] | None = None, dry_run: bool = False):
+        if dry_run:
+            # Plan only: destinations, replaced folders, .ini targets and layout.json delta; nothing is written
+            self._run_dry_run(archive_paths_to_process, archive_probes)
+            return
+
         num_files_initial = len(archive_paths_to_process)
         total_archives_processed_count = 0
         successful_liveries_installed_count_ref = [0] # Passed by reference to updating functions
@@ -1823,44 +3765,12 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
 
         # --- Common Configuration Setup ---
         try:
-            community_path = Path(self.community_path_var.get())
-            reference_livery_path = Path(self.reference_path_var.get())
-            selected_variant_for_install = self.aircraft_variant_var.get()
-
-            pmdg_localstate_base_package_path_str = ""
-            if selected_variant_for_install.startswith("777"):
-                if selected_variant_for_install == "777-200ER": pmdg_localstate_base_package_path_str = self.pmdg_77er_path_var.get()
-                elif selected_variant_for_install == "777-300ER": pmdg_localstate_base_package_path_str = self.pmdg_77w_path_var.get()
-                elif selected_variant_for_install == "777F": pmdg_localstate_base_package_path_str = self.pmdg_77f_path_var.get()
-            elif selected_variant_for_install.startswith("737"):
-                if "600" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_736_path_var.get()
-                elif "700" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_737_path_var.get()
-                elif "800" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_738_path_var.get()
-                elif "900" in selected_variant_for_install: pmdg_localstate_base_package_path_str = self.pmdg_739_path_var.get()
-
-            if not pmdg_localstate_base_package_path_str:
-                raise ValueError(f"PMDG Base Package Path for '{selected_variant_for_install}' is not set in Setup.")
-            pmdg_localstate_for_variant_base_pkg = Path(pmdg_localstate_base_package_path_str)
-            if not pmdg_localstate_for_variant_base_pkg.is_dir():
-                raise ValueError(f"PMDG Base Package Path for '{selected_variant_for_install}' ('{pmdg_localstate_for_variant_base_pkg}') is not a valid directory.")
-
-            target_community_package_name = VARIANT_PACKAGE_MAP.get(selected_variant_for_install)
-            if not target_community_package_name:
-                raise ValueError(f"Community package mapping missing for variant: {selected_variant_for_install}")
-            target_community_package_root_path = community_path / target_community_package_name
-            
-            base_simobject_pmdg_folder_name = VARIANT_BASE_AIRCRAFT_MAP.get(selected_variant_for_install)
-            if not base_simobject_pmdg_folder_name:
-                raise ValueError(f"PMDG base SimObject folder name missing for variant: {selected_variant_for_install}")
-
-            common_install_config = {
-                'reference_livery_path': reference_livery_path,
-                'pmdg_localstate_package_path': pmdg_localstate_for_variant_base_pkg,
-                'aircraft_variant': selected_variant_for_install,
-                'main_package_folder': target_community_package_root_path, # e.g., .../Community/pmdg-aircraft-737-liveries
-                'base_aircraft_folder_name': base_simobject_pmdg_folder_name, # e.g., PMDG 737-700
-            }
-
+            common_install_config = self._build_common_install_config()
+            reference_livery_path = common_install_config['reference_livery_path']
+            selected_variant_for_install = common_install_config['aircraft_variant']
+            target_community_package_root_path = common_install_config['main_package_folder']
+            target_community_package_name = target_community_package_root_path.name
+            base_simobject_pmdg_folder_name = common_install_config['base_aircraft_folder_name']
             target_community_package_root_path.mkdir(parents=True, exist_ok=True)
             manifest_path_in_package = target_community_package_root_path / "manifest.json"
             layout_path_in_package = target_community_package_root_path / "layout.json"
@@ -1869,7 +3779,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 ref_manifest_path = reference_livery_path / "manifest.json"
                 if not ref_manifest_path.is_file():
                     raise FileNotFoundError(f"Reference manifest.json missing at '{reference_livery_path}' and no destination manifest exists for '{target_community_package_name}'.")
-                shutil.copy2(ref_manifest_path, manifest_path_in_package)
+                _copy_files([(ref_manifest_path, manifest_path_in_package)])
                 self.log(f"Copied manifest.json from reference to '{manifest_path_in_package}'", "INFO")
             
             try:
@@ -1900,7 +3810,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 # Decide if this is critical enough to stop; for now, it logs and continues
 
             if not layout_path_in_package.exists() and (reference_livery_path / "layout.json").is_file():
-                shutil.copy2(reference_livery_path / "layout.json", layout_path_in_package)
+                _copy_files([(reference_livery_path / "layout.json", layout_path_in_package)])
                 self.log(f"Copied layout.json from reference to '{layout_path_in_package}'", "INFO")
 
         except Exception as config_err:
@@ -1908,10 +3818,22 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             import traceback
             self.log(f"Traceback: {traceback.format_exc()}", "DETAIL")
             self.master.after(0, lambda: self.status_var.set("Installation failed! (Setup Error)"))
-            self.master.after(0, lambda: self.install_button.config(state=tk.NORMAL))
+            self.master.after(0, lambda: self._finalize_installation_ui(reset_fields=False))
             messagebox.showerror("Critical Error", f"Could not configure installation environment:\n{config_err}")
             return
 
+        # --- Classify ZIPs from their central directory before anything is extracted (normally done by the preflight) ---
+        if archive_probes is None:
+            archive_probes = self._probe_archive_batch(archive_paths_to_process)
+        batch_work_bytes = self._estimate_batch_requirements(archive_paths_to_process, archive_probes)['work_bytes']
+        batch_start_time = time.perf_counter()
+
+        # Fingerprints of installed archives, so unchanged archives (and duplicates within the batch) are skipped
+        installed_archives = self._load_installed_archives()
+        batch_archive_keys: dict[str, str] = {} # Archive key -> name of the archive that installed it (or found it installed) in this batch
+        batch_livery_folders: set[str] = set() # Livery folders written in this batch: always rescanned for layout.json
+        skipped_archives_count = 0
+
         # --- Main loop to process each selected archive file ---
         for idx, archive_file_path_str in enumerate(archive_paths_to_process):
             original_archive_path = Path(archive_file_path_str)
@@ -1919,6 +3841,28 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             self.log(f"--- Processing Archive: {log_archive_name} ({idx + 1}/{num_files_initial}) ---", "STEP")
             self.master.after(0, lambda i=idx, n=log_archive_name: self.status_var.set(f"Processing {i+1}/{num_files_initial}: {n}..."))
 
+            archive_key: str | None = None
+            skip_detail: str | None = None
+            if common_install_config['skip_installed_archives']:
+                archive_fingerprint = self._archive_fingerprint(original_archive_path, installed_archives)
+                if archive_fingerprint:
+                    common_install_config['archive_sha256'][str(original_archive_path)] = archive_fingerprint.split(":", 1)[1]
+                    archive_key = self._installed_archive_key(archive_fingerprint, original_archive_path, common_install_config)
+                    if archive_key in batch_archive_keys:
+                        skip_detail = f"Same content as '{batch_archive_keys[archive_key]}' earlier in this batch. Skipped."
+                    else:
+                        skip_detail = self._installed_archive_skip_detail(installed_archives, archive_key, common_install_config)
+                        if skip_detail:
+                            batch_archive_keys[archive_key] = log_archive_name
+            if skip_detail:
+                self.log(f"'{log_archive_name}': {skip_detail}", "INFO")
+                results_summary.append({"file": log_archive_name, "success": True, "detail": skip_detail, "skipped": True})
+                skipped_archives_count += 1
+                total_archives_processed_count += 1
+                self.master.after(0, lambda p=((idx + 1) / num_files_initial) * 85.0: self.progress_var.set(p))
+                continue
+            common_install_config['installed_livery_folders'] = []
+
             # Temporary base directory for this specific archive's processing
             # Placed inside the target community package to handle long paths better if Community is on a drive with long paths enabled.
             archive_temp_base = target_community_package_root_path / f"__temp_archive_{original_archive_path.stem}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -1929,15 +3873,9 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 archive_temp_base.mkdir(parents=True, exist_ok=True)
 
                 if original_archive_path.suffix.lower() == ".ptp":
-                    conv_ok, initial_extract_folder, ptp_conv_err_msg = self._run_ptp_converter(original_archive_path, archive_temp_base)
-                    if not conv_ok:
-                        error_detail = ptp_conv_err_msg if ptp_conv_err_msg else f"Initial PTP conversion failed for {log_archive_name}."
-                        raise RuntimeError(error_detail)
-                    
-                    # initial_extract_folder is where _run_ptp_converter has staged the PTP's content
-                    self._process_extracted_ptp_content(
-                        initial_extract_folder,
-                        original_archive_path, # Pass the original top-level PTP path for context
+                    self._process_ptp_file(
+                        original_archive_path,
+                        archive_temp_base,
                         common_install_config,
                         results_summary,
                         successful_liveries_installed_count_ref,
@@ -1945,77 +3883,42 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                     )
                 
                 elif original_archive_path.suffix.lower() == ".zip":
-                    zip_extract_target_dir = archive_temp_base / f"__extracted_zip_{original_archive_path.stem}"
-                    zip_extract_target_dir.mkdir(parents=True, exist_ok=True)
-                    self._extract_archive(original_archive_path, zip_extract_target_dir)
-
-                    # Determine the effective content directory (handles ZIPs with a single root folder)
-                    items_in_zip_extract = list(zip_extract_target_dir.iterdir())
-                    effective_content_dir_for_zip = zip_extract_target_dir
-                    if len(items_in_zip_extract) == 1 and items_in_zip_extract[0].is_dir() and \
-                       not items_in_zip_extract[0].name.startswith(('.', '__MACOSX', '__temp_')):
-                        effective_content_dir_for_zip = items_in_zip_extract[0]
-
-                    if self._is_nested_archive(effective_content_dir_for_zip):
-                        self.log(f"'{log_archive_name}' is a ZIP pack. Processing nested archives...", "INFO")
-                        nested_archives = list(effective_content_dir_for_zip.glob('*.zip')) + \
-                                          list(effective_content_dir_for_zip.glob('*.ptp'))
-                        if not nested_archives:
-                            self.log(f"Pack '{log_archive_name}' contains no processable sub-archives.", "WARNING")
-                            results_summary.append({"file": log_archive_name, "success": False, "detail": "ZIP Pack empty or no recognized sub-archives."})
-                            current_top_level_archive_had_failure[0] = True
+                    zip_probe = archive_probes.get(archive_file_path_str) or self._probe_zip_archive(original_archive_path, log_archive_name)
+                    if zip_probe['kind'] == 'error':
+                        raise ValueError(zip_probe['error']) # Corrupt ZIPs fail here, before any extraction
+                    self.log(f"'{log_archive_name}' classified as '{zip_probe['kind']}' "
+                             f"({zip_probe['member_count']} members, {zip_probe['total_uncompressed_bytes']} bytes uncompressed"
+                             f"{', title: ' + repr(zip_probe['title']) if zip_probe['title'] else ''}).", "DETAIL")
+
+                    if zip_probe['kind'] == 'single':
+                        # Plain single-livery ZIP: members go straight to SimObjects/Airplanes/<livery>, no temp copy
+                        livery_ok, detail = self._process_single_livery_from_zip(original_archive_path, original_archive_path, zip_probe, common_install_config)
+                        results_summary.append({"file": log_archive_name, "success": livery_ok, "detail": detail})
+                        if livery_ok:
+                            successful_liveries_installed_count_ref[0] += 1
                         else:
-                            for nested_idx, nested_archive_path_obj in enumerate(nested_archives):
-                                nested_log_name_display = f"{log_archive_name} -> {nested_archive_path_obj.name}"
-                                self.log(f"--- Nested {nested_idx + 1}/{len(nested_archives)}: {nested_archive_path_obj.name} ---", "STEP")
-                                
-                                # Create a unique temp subdir for this nested archive's processing
-                                nested_temp_sub_proc_dir = archive_temp_base / f"__zip_nested_proc_{nested_archive_path_obj.stem}_{nested_idx}_{datetime.now().strftime('%f')}"
-                                try:
-                                    nested_temp_sub_proc_dir.mkdir(parents=True, exist_ok=True)
-                                    
-                                    if nested_archive_path_obj.suffix.lower() == ".ptp":
-                                        # Handle PTP nested within a ZIP
-                                        s_conv_ok, s_conv_folder, s_ptp_err = self._run_ptp_converter(nested_archive_path_obj, nested_temp_sub_proc_dir)
-                                        if not s_conv_ok:
-                                            s_err_detail = s_ptp_err if s_ptp_err else f"PTP conversion failed for nested {nested_archive_path_obj.name}"
-                                            raise RuntimeError(s_err_detail)
-                                        
-                                        self._process_extracted_ptp_content(
-                                            s_conv_folder,
-                                            nested_archive_path_obj, # Pass the path of the nested PTP itself
-                                            common_install_config,
-                                            results_summary,
-                                            successful_liveries_installed_count_ref,
-                                            current_top_level_archive_had_failure # If any sub-PTP fails, it flags the main archive
-                                        )
-                                    elif nested_archive_path_obj.suffix.lower() == ".zip":
-                                        # Handle ZIP nested within a ZIP (assuming it's a single livery)
-                                        nested_zip_extract_target = nested_temp_sub_proc_dir / f"__extracted_sub_zip_{nested_archive_path_obj.stem}"
-                                        nested_zip_extract_target.mkdir(exist_ok=True)
-                                        self._extract_archive(nested_archive_path_obj, nested_zip_extract_target)
-                                        
-                                        items_in_sub_extract = list(nested_zip_extract_target.iterdir())
-                                        prepared_sub_archive_folder = nested_zip_extract_target
-                                        if len(items_in_sub_extract) == 1 and items_in_sub_extract[0].is_dir() and not items_in_sub_extract[0].name.startswith(('.', '__MACOSX')):
-                                            prepared_sub_archive_folder = items_in_sub_extract[0]
-                                        
-                                        if prepared_sub_archive_folder:
-                                            # For nested ZIPs, specific_livery_name is None; _process_single_livery will auto-detect.
-                                            liv_ok, det = self._process_single_livery(prepared_sub_archive_folder, nested_archive_path_obj, common_install_config)
-                                            results_summary.append({"file": nested_log_name_display, "success": liv_ok, "detail": det})
-                                            if liv_ok:
-                                                successful_liveries_installed_count_ref[0] += 1
-                                            else:
-                                                current_top_level_archive_had_failure[0] = True
-                                        else:
-                                            raise RuntimeError(f"Could not prepare content from nested ZIP: {nested_archive_path_obj.name}")
-                                except Exception as e_nest_proc:
-                                    self.log(f"ERROR processing nested archive '{nested_archive_path_obj.name}': {e_nest_proc}", "ERROR")
-                                    results_summary.append({"file": nested_log_name_display, "success": False, "detail": str(e_nest_proc)})
-                                    current_top_level_archive_had_failure[0] = True
-                                # No explicit cleanup of nested_temp_sub_proc_dir here, as it's inside archive_temp_base
-                    else: # Simple (non-nested) ZIP
+                            current_top_level_archive_had_failure[0] = True
+                    elif zip_probe['kind'] == 'nested':
+                        self.log(f"'{log_archive_name}' is a ZIP pack. Processing nested archives...", "INFO")
+                        self._process_zip_pack(
+                            original_archive_path,
+                            log_archive_name,
+                            zip_probe,
+                            archive_temp_base,
+                            common_install_config,
+                            results_summary,
+                            successful_liveries_installed_count_ref,
+                            current_top_level_archive_had_failure
+                        )
+                    else: # Multi-livery or unrecognized layout: extract and process like a simple ZIP
+                        zip_extract_target_dir = archive_temp_base / f"__extracted_zip_{original_archive_path.stem}"
+                        zip_extract_target_dir.mkdir(parents=True, exist_ok=True)
+                        self._extract_archive(original_archive_path, zip_extract_target_dir, common_install_config['extract_workers'],
+                                              verify_stored_crc=common_install_config['verify_stored_crc'],
+                                              staged_file_crcs=common_install_config['staged_file_crcs'])
+
+                        # Determine the effective content directory (handles ZIPs with a single root folder)
+                        effective_content_dir_for_zip = zip_extract_target_dir / zip_probe['content_root']
                         # For a top-level simple ZIP, specific_livery_name is None.
                         livery_ok, detail = self._process_single_livery(effective_content_dir_for_zip, original_archive_path, common_install_config)
                         results_summary.append({"file": log_archive_name, "success": livery_ok, "detail": detail})
@@ -2052,19 +3955,57 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             total_archives_processed_count += 1
             if current_top_level_archive_had_failure[0]:
                 failed_top_level_archives_count += 1
+            batch_livery_folders.update(common_install_config['installed_livery_folders'])
+            if common_install_config['installed_livery_folders']:
+                self._record_installed_archive(installed_archives, None if current_top_level_archive_had_failure[0] else archive_key,
+                                               log_archive_name, common_install_config['installed_livery_folders'], common_install_config)
+                if archive_key and not current_top_level_archive_had_failure[0]:
+                    batch_archive_keys[archive_key] = log_archive_name # Later copies are skipped only once this one installed cleanly
             
             progress = ((idx + 1) / num_files_initial) * 85.0 # 85% for processing, 15% for layout/manifest
             self.master.after(0, lambda p=progress: self.progress_var.set(p))
         # --- End of loop for processing each selected archive file ---
+        self._save_installed_archives(installed_archives)
+
+        ptp_cache_stats = common_install_config['ptp_cache_stats']
+        if ptp_cache_stats['hits'] or ptp_cache_stats['misses']:
+            self.log(f"PTP cache: {ptp_cache_stats['hits']} hit(s), {ptp_cache_stats['misses']} miss(es).", "INFO")
+        if common_install_config['ptp_cache_dir']:
+            try:
+                self._evict_ptp_cache(common_install_config['ptp_cache_dir'], self._get_ptp_cache_max_bytes())
+            except OSError as e_evict:
+                self.log(f"Could not trim the PTP cache: {e_evict}", "WARNING")
 
         final_successful_liveries = successful_liveries_installed_count_ref[0]
         layout_manifest_ok = False
+
+        # Remember the throughput of clean batches for the next preflight time estimate
+        batch_elapsed = time.perf_counter() - batch_start_time
+        if final_successful_liveries > 0 and failed_top_level_archives_count == 0 and skipped_archives_count == 0 and batch_work_bytes > 0 and batch_elapsed >= 1.0:
+            batch_throughput = batch_work_bytes / batch_elapsed
+            if self.measured_install_throughput:
+                batch_throughput = (self.measured_install_throughput + batch_throughput) / 2
+            self.measured_install_throughput = batch_throughput
+            self._update_config_file({"measured_install_throughput": batch_throughput})
+            self.log(f"Batch throughput: {batch_work_bytes / (1024 * 1024) / batch_elapsed:.1f} MB/s "
+                     f"(estimate for next batches: {batch_throughput / (1024 * 1024):.1f} MB/s).", "DETAIL")
         final_post_proc_msg = ""
 
-        if final_successful_liveries > 0 and failed_top_level_archives_count == 0:
+        if final_successful_liveries == 0 and failed_top_level_archives_count == 0 and skipped_archives_count > 0:
+            # Every archive was skipped as already installed: nothing changed, so layout.json/manifest.json stay as they are
+            layout_manifest_ok = True
+            final_post_proc_msg = "Nothing changed in the package; layout.json and manifest.json left as they are."
+            self.log(final_post_proc_msg, "INFO")
+            self.master.after(0, lambda: self.progress_var.set(100))
+        elif final_successful_liveries > 0 and failed_top_level_archives_count == 0:
             self.log(f"All {final_successful_liveries} livery(s) from {total_archives_processed_count} archive(s) appear to have installed correctly. Generating layout/manifest...", "STEP")
+            if self.dedupe_after_install_var.get():
+                self.master.after(0, lambda: self.status_var.set("Deduplicating textures..."))
+                self._dedupe_package_textures(target_community_package_root_path)
             try:
-                layout_ok, layout_err, content_total_size, layout_file_size = self._generate_layout_file(target_community_package_root_path)
+                layout_ok, layout_err, content_total_size, layout_file_size = self._generate_layout_file(target_community_package_root_path, batch_livery_folders,
+                                                                                                                  full_rescan=self.layout_full_rescan_var.get(),
+                                                                                                                  compact=self.layout_compact_var.get())
                 if layout_ok:
                     self.master.after(0, lambda: self.progress_var.set(95))
                     self.master.after(0, lambda: self.status_var.set("Updating manifest.json..."))
@@ -2118,15 +4059,161 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 final_status_message = "All operations failed."
         
         self.master.after(0, lambda s=final_status_message: self.status_var.set(s))
-        self.master.after(100, lambda: self.show_multi_final_message(results_summary, layout_manifest_ok, final_post_proc_msg, str(target_community_package_root_path)))
+        self.master.after(100, lambda: self.show_multi_final_message(results_summary, layout_manifest_ok, final_post_proc_msg, str(target_community_package_root_path),
+                                                                   common_install_config['converter_runs']))
         self.master.after(200, self._finalize_installation_ui)
 
 
-    def _finalize_installation_ui(self):
-        """Resets UI elements after an installation attempt."""
+    def _plan_zip_livery(self, zip_source: Path | bytes, archive_label: str, naming_path: Path, zip_probe: dict,
+                         common_config: dict, planned_destinations: set[str]) -> dict:
+        """
+        Dry-run plan for one livery ZIP, built from its central directory with the same member mapping
+        (_plan_livery_zip_members) and naming (_resolve_livery_destination) as a real install.
+        """
+        with _open_zip_source(zip_source) as zip_ref:
+            member_paths = [info.filename.replace('\\', '/') for info in zip_ref.infolist()]
+        planned_members, ini_member_path = _plan_livery_zip_members(
+            member_paths, zip_probe['livery_root'], zip_probe['texture_folders'], zip_probe['atc_id'])
+        livery_display_name, livery_dest_path = self._resolve_livery_destination(
+            naming_path, common_config, None,
+            lambda: zip_probe['title'] or self._livery_name_from_filename(naming_path))
+
+        planned_files = sorted({rel_dest for _, rel_dest in planned_members})
+        existing_files: set[str] = set()
+        if livery_dest_path.is_dir():
+            for root_str, _, files in os.walk(livery_dest_path):
+                for filename in files:
+                    if filename.startswith('.') or filename.lower() == 'thumbs.db': continue # Not in layout.json either
+                    existing_files.add((Path(root_str) / filename).relative_to(livery_dest_path).as_posix())
+
+        livery_layout_prefix = livery_dest_path.relative_to(common_config['main_package_folder']).as_posix() + "/"
+        destination_key = str(livery_dest_path).lower()
+        plan_notes = []
+        if zip_probe['kind'] != 'single':
+            plan_notes.append("ZIP layout not recognized from its directory; file list is approximate.")
+        if destination_key in planned_destinations:
+            plan_notes.append("Same destination as a livery planned earlier in this batch; that one would be replaced.")
+        planned_destinations.add(destination_key)
+
+        return {
+            'archive': archive_label,
+            'livery': livery_display_name,
+            'destination': livery_dest_path,
+            'replaces_existing': livery_dest_path.exists(),
+            'files': planned_files,
+            'ini_source': ini_member_path,
+            'ini_target': (common_config['pmdg_localstate_package_path'] / "work" / "Aircraft" / f"{zip_probe['atc_id']}.ini")
+                          if ini_member_path and zip_probe['atc_id'] else None,
+            'layout_added': [livery_layout_prefix + f for f in planned_files if f not in existing_files],
+            'layout_removed': sorted(livery_layout_prefix + f for f in existing_files - set(planned_files)),
+            'layout_updated': len(existing_files.intersection(planned_files)),
+            'notes': plan_notes,
+        }
+
+    def _plan_archive(self, zip_source: Path | bytes, archive_label: str, naming_path: Path, zip_probe: dict,
+                      common_config: dict, planned_destinations: set[str], spill_dir: Path, depth: int = 1) -> list[dict]:
+        """Dry-run plan entries for a ZIP, recursing into packs the same way _iter_zip_pack_leaves does."""
+        if zip_probe['kind'] != 'nested':
+            return [self._plan_zip_livery(zip_source, archive_label, naming_path, zip_probe, common_config, planned_destinations)]
+
+        pack_plan = []
+        with _open_zip_source(zip_source) as zip_ref:
+            for nested_member in zip_probe['nested_archives']:
+                nested_name = nested_member.rsplit('/', 1)[-1]
+                nested_label = f"{archive_label} -> {nested_name}"
+                try:
+                    if nested_name.lower().endswith(".ptp"):
+                        pack_plan.append({'archive': nested_label, 'notes': ["PTP content is only known after conversion; not planned in detail."]})
+                        continue
+                    nested_zip_source = self._load_nested_zip(zip_ref, zip_ref.getinfo(nested_member), spill_dir)
+                    nested_zip_probe = self._probe_zip_archive(nested_zip_source, nested_label)
+                    if nested_zip_probe['kind'] == 'nested' and depth >= MAX_NESTED_ARCHIVE_DEPTH:
+                        raise ValueError(f"Pack nested more than {MAX_NESTED_ARCHIVE_DEPTH} levels deep; not processed.")
+                    pack_plan.extend(self._plan_archive(nested_zip_source, nested_label, Path(nested_name), nested_zip_probe,
+                                                        common_config, planned_destinations, spill_dir, depth + 1))
+                except Exception as e_plan:
+                    pack_plan.append({'archive': nested_label, 'error': str(e_plan)})
+        return pack_plan
+
+    def _run_dry_run(self, archive_paths: list[str], archive_probes: dict[str, dict] | None):
+        """
+        Dry-run mode of install_livery_logic: logs the full install plan for every archive and writes nothing
+        to the Community package or LocalState. Works from ZIP central directories only; nested ZIPs are read
+        into memory (or a system temp file that is removed afterwards), never extracted.
+        """
+        try:
+            common_config = self._build_common_install_config()
+        except Exception as config_err:
+            self.log(f"CRITICAL SETUP ERROR: {config_err}", "ERROR")
+            self.master.after(0, lambda: self.status_var.set("Dry run failed! (Setup Error)"))
+            self.master.after(0, lambda: self._finalize_installation_ui(reset_fields=False))
+            messagebox.showerror("Critical Error", f"Could not configure installation environment:\n{config_err}")
+            return
+
+        if archive_probes is None:
+            archive_probes = self._probe_archive_batch(archive_paths)
+        plan_start_time = time.perf_counter()
+        install_plan: list[dict] = []
+        planned_destinations: set[str] = set()
+        with tempfile.TemporaryDirectory(prefix="pmdg_dry_run_") as spill_dir_str:
+            for idx, archive_path_str in enumerate(archive_paths):
+                archive_path = Path(archive_path_str)
+                try:
+                    if archive_path.suffix.lower() == ".ptp":
+                        install_plan.append({'archive': archive_path.name, 'notes': ["PTP content is only known after conversion; not planned in detail."]})
+                    elif archive_path.suffix.lower() == ".zip":
+                        zip_probe = archive_probes.get(archive_path_str) or self._probe_zip_archive(archive_path, archive_path.name)
+                        if zip_probe['kind'] == 'error':
+                            raise ValueError(zip_probe['error'])
+                        install_plan.extend(self._plan_archive(archive_path, archive_path.name, archive_path, zip_probe,
+                                                               common_config, planned_destinations, Path(spill_dir_str)))
+                    else:
+                        raise ValueError(f"Unsupported archive type: {archive_path.name}")
+                except Exception as e_plan:
+                    install_plan.append({'archive': archive_path.name, 'error': str(e_plan)})
+                progress = ((idx + 1) / len(archive_paths)) * 100.0
+                self.master.after(0, lambda p=progress: self.progress_var.set(p))
+
+        planned_liveries = [entry for entry in install_plan if 'destination' in entry]
+        for entry in install_plan:
+            self.log(f"--- Plan: {entry['archive']} ---", "STEP")
+            if 'error' in entry:
+                self.log(f"Would fail: {entry['error']}", "ERROR")
+                continue
+            for note in entry.get('notes', []):
+                self.log(note, "WARNING")
+            if 'destination' not in entry:
+                continue
+            destination_rel = entry['destination'].relative_to(common_config['main_package_folder']).as_posix()
+            self.log(f"Livery '{entry['livery']}' -> {destination_rel} ({len(entry['files'])} file(s))", "INFO")
+            if entry['replaces_existing']:
+                self.log(f"Existing folder '{entry['destination'].name}' would be deleted and replaced.", "WARNING")
+            for planned_file in entry['files']:
+                self.log(f"    {planned_file}", "DETAIL")
+            if entry['ini_target']:
+                self.log(f"'{entry['ini_source']}' -> {entry['ini_target']}", "INFO")
+            self.log(f"layout.json: +{len(entry['layout_added'])} new, -{len(entry['layout_removed'])} removed, "
+                     f"{entry['layout_updated']} updated entries.", "INFO")
+
+        replaced_count = sum(1 for entry in planned_liveries if entry['replaces_existing'])
+        failed_count = sum(1 for entry in install_plan if 'error' in entry)
+        plan_summary = (f"{len(planned_liveries)} livery(s) planned from {len(archive_paths)} archive(s) in {time.perf_counter() - plan_start_time:.2f}s; "
+                        f"{replaced_count} existing folder(s) would be replaced, {failed_count} archive(s) would fail. "
+                        f"layout.json: +{sum(len(e['layout_added']) for e in planned_liveries)} / "
+                        f"-{sum(len(e['layout_removed']) for e in planned_liveries)} entries.")
+        self.log(f"Dry run complete: {plan_summary} Nothing was written.", "STEP")
+        self.master.after(0, lambda: self.status_var.set("Dry run complete"))
+        self.master.after(100, lambda: messagebox.showinfo("Dry Run Complete", plan_summary + "\n\nNothing was written. See the log for the full plan."))
+        self.master.after(200, lambda: self._finalize_installation_ui(reset_fields=False))
+
+    def _finalize_installation_ui(self, reset_fields: bool = True):
+        """Resets UI elements after an installation attempt (keeps the selection after a dry run)."""
         self.install_button.config(state=tk.NORMAL)
-        self._reset_install_fields()
-        self.log("Batch installation process finished. Ready for new operation.", "STEP")
+        self.dry_run_button.config(state=tk.NORMAL)
+        self.dedupe_button.config(state=tk.NORMAL)
+        if reset_fields:
+            self._reset_install_fields()
+            self.log("Batch installation process finished. Ready for new operation.", "STEP")
 
     def _reset_install_fields(self):
         self.log("Resetting install tab fields.", "DETAIL")
@@ -2386,46 +4473,314 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
         else:
             self.log(f"No modifications deemed necessary for aircraft.cfg '{cfg_path.name}'.", "DETAIL")
 
-    def _generate_layout_file(self, package_root_path: Path) -> tuple[bool, str, int, int]:
-        self.log(f"Generating layout.json for: {package_root_path}", "STEP")
-        content_entries = []
-        files_scanned_count = 0
-        content_total_size = 0
-        layout_file_size_on_disk = 0
-        layout_json_path = package_root_path / "layout.json"
-        excluded_dir_prefixes = ("__temp_",) # Temp folders created by this tool
+    def start_dedupe_thread(self):
+        community_path_str = self.community_path_var.get()
+        selected_variant = self.aircraft_variant_var.get()
+        if not community_path_str or not Path(community_path_str).is_dir():
+            messagebox.showerror("Configuration Errors", "Set a valid MSFS Community Folder in the Setup tab first.")
+            self.notebook.select(0)
+            return
+        if not selected_variant:
+            messagebox.showerror("Configuration Errors", "Select the aircraft variant whose livery package should be deduplicated.")
+            return
+        package_root_path = Path(community_path_str) / VARIANT_PACKAGE_MAP[selected_variant]
+        if not (package_root_path / "SimObjects" / "Airplanes").is_dir():
+            messagebox.showerror("Nothing to Deduplicate", f"No installed liveries found in:\n{package_root_path}")
+            return
 
+        self.status_var.set("Deduplicating textures...")
+        self.install_button.config(state=tk.DISABLED)
+        self.dry_run_button.config(state=tk.DISABLED)
+        self.dedupe_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._run_texture_dedupe, args=(package_root_path,), daemon=True).start()
+
+    def _run_texture_dedupe(self, package_root_path: Path):
+        """On-demand deduplication of a package; layout.json and manifest.json are refreshed when files were linked."""
+        dedupe_stats = self._dedupe_package_textures(package_root_path)
+        status_message = "Texture deduplication complete"
+        if dedupe_stats['linked_files']:
+            # Linked files share the store copy's modification time, so the layout dates are rewritten
+            layout_ok, layout_err, content_total_size, layout_file_size = self._generate_layout_file(package_root_path, full_rescan=self.layout_full_rescan_var.get(),
+                                                                                                      compact=self.layout_compact_var.get())
+            manifest_path = package_root_path / "manifest.json"
+            if layout_ok and manifest_path.is_file():
+                self._update_manifest_file(manifest_path, content_total_size + layout_file_size + manifest_path.stat().st_size)
+            elif not layout_ok:
+                status_message = "Deduplication done, layout.json update failed"
+        summary = (f"{dedupe_stats['linked_files']} duplicate texture(s) linked, "
+                   f"{dedupe_stats['reclaimed_bytes'] / (1024 * 1024):.1f} MB reclaimed.")
+        self.master.after(0, lambda: self.status_var.set(status_message))
+        self.master.after(100, lambda: messagebox.showinfo("Texture Deduplication", summary))
+        self.master.after(200, lambda: self._finalize_installation_ui(reset_fields=False))
+
+    def _load_dedupe_hash_cache(self) -> dict:
+        cache_path = Path.home() / CONFIG_DIR_NAME / DEDUPE_HASH_CACHE_FILE_NAME
         try:
-            for root_str, dirs, files in os.walk(str(package_root_path), topdown=True):
-                dirs[:] = [d for d in dirs if not d.startswith(excluded_dir_prefixes)]
-                current_root_path = Path(root_str)
-                
-                for filename in files:
-                    files_scanned_count += 1
-                    if files_scanned_count % 200 == 0:
-                        self.log(f"    ... {files_scanned_count} files scanned for layout...", "DETAIL")
+            with open(cache_path, "r", encoding='utf-8') as f:
+                hash_cache = json.load(f)
+            if hash_cache.get('format') == DEDUPE_HASH_CACHE_FORMAT:
+                return hash_cache
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.log(f"Could not read texture hash cache '{cache_path}': {e}. Starting a new one.", "WARNING")
+        return {'format': DEDUPE_HASH_CACHE_FORMAT, 'packages': {}}
+
+    def _save_dedupe_hash_cache(self, hash_cache: dict):
+        cache_path = Path.home() / CONFIG_DIR_NAME / DEDUPE_HASH_CACHE_FILE_NAME
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w", encoding='utf-8') as f:
+                json.dump(hash_cache, f)
+        except OSError as e:
+            self.log(f"Could not save texture hash cache '{cache_path}': {e}", "WARNING")
 
-                    file_abs_path = current_root_path / filename
-                    try:
-                        rel_path_str = file_abs_path.relative_to(package_root_path).as_posix()
-                        if rel_path_str.lower() in ('layout.json', 'manifest.json') or \
-                           filename.startswith('.') or filename.lower() == 'thumbs.db':
+    def _dedupe_package_textures(self, package_root_path: Path) -> dict:
+        """
+        Replaces identical texture files in the package's 'SimObjects/Airplanes/*/texture.*' folders with hardlinks
+        to one copy in DEDUPE_STORE_DIR_NAME. Only files sharing a size with another file are hashed (in parallel);
+        hashes are cached by path and reused while size and mtime are unchanged, so repeat runs only hash new files.
+        Each duplicate is swapped atomically (link to a temp name, then os.replace), and layout.json sizes are
+        unaffected because every path keeps its own entry. Store copies no livery links to anymore are removed.
+        """
+        dedupe_stats = {'scanned_files': 0, 'hashed_files': 0, 'linked_files': 0, 'reclaimed_bytes': 0, 'failed_files': 0}
+        airplanes_path = package_root_path / "SimObjects" / "Airplanes"
+        store_path = package_root_path / DEDUPE_STORE_DIR_NAME
+        self.log(f"Deduplicating textures in: {package_root_path}", "STEP")
+        dedupe_start_time = time.perf_counter()
+
+        # size -> {(st_dev, st_ino): [(path, stat), ...]}; paths already sharing an inode are hashed once
+        files_by_size: dict[int, dict[tuple[int, int], list]] = {}
+        try:
+            livery_dirs = [d for d in airplanes_path.iterdir() if d.is_dir() and not d.name.startswith("__temp_")]
+        except OSError as e:
+            self.log(f"Cannot read '{airplanes_path}' for deduplication: {e}", "WARNING")
+            return dedupe_stats
+        for livery_dir in livery_dirs:
+            for texture_dir in livery_dir.iterdir():
+                if not (texture_dir.is_dir() and texture_dir.name.lower().startswith("texture.")):
+                    continue
+                for dir_path, _, file_names in os.walk(texture_dir):
+                    for file_name in file_names:
+                        file_path = Path(dir_path) / file_name
+                        if file_name.endswith(DEDUPE_TEMP_SUFFIX):
+                            file_path.unlink(missing_ok=True)
                             continue
-                        
-                        file_stat = file_abs_path.stat()
-                        content_entries.append({
-                            "path": rel_path_str, "size": file_stat.st_size,
-                            "date": _unix_to_filetime(file_stat.st_mtime)
-                        })
-                        content_total_size += file_stat.st_size
-                    except Exception as e_file:
-                        self.log(f"Warning: Error processing file '{file_abs_path}' for layout: {e_file}. Skipping.", "WARNING")
-            
-            self.log(f"Layout scan complete. {len(content_entries)} files included. Total content size: {content_total_size} bytes.", "INFO")
-            content_entries.sort(key=lambda x: x['path'])
-            
-            with open(layout_json_path, 'w', encoding='utf-8', newline='\n') as f_out:
-                json.dump({"content": content_entries}, f_out, indent=4)
+                        if not file_name.lower().endswith(DEDUPE_FILE_EXTENSIONS):
+                            continue
+                        try:
+                            file_stat = file_path.stat()
+                        except OSError:
+                            continue
+                        dedupe_stats['scanned_files'] += 1
+                        if file_stat.st_size >= DEDUPE_MIN_FILE_SIZE:
+                            files_by_size.setdefault(file_stat.st_size, {}).setdefault((file_stat.st_dev, file_stat.st_ino), []).append((file_path, file_stat))
+
+        hash_cache = self._load_dedupe_hash_cache()
+        cached_hashes = hash_cache['packages'].get(os.path.normcase(str(package_root_path)), {})
+        package_hashes: dict[str, list] = {} # Rebuilt from the files seen now, so removed liveries drop out
+        inode_groups = [paths for same_size in files_by_size.values() if len(same_size) > 1 for paths in same_size.values()]
+        inode_sha256: dict[int, str] = {}
+        to_hash = []
+        for group_idx, inode_paths in enumerate(inode_groups):
+            file_path, file_stat = inode_paths[0]
+            cached = cached_hashes.get(file_path.relative_to(package_root_path).as_posix())
+            if cached and cached[0] == file_stat.st_size and cached[1] == file_stat.st_mtime_ns:
+                inode_sha256[group_idx] = cached[2]
+            else:
+                to_hash.append(group_idx)
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=DEDUPE_HASH_WORKERS) as executor:
+                future_to_group = {executor.submit(_file_sha256, inode_groups[group_idx][0][0]): group_idx for group_idx in to_hash}
+                for future in as_completed(future_to_group):
+                    group_idx = future_to_group[future]
+                    try:
+                        inode_sha256[group_idx] = future.result()
+                        dedupe_stats['hashed_files'] += 1
+                    except OSError as e:
+                        self.log(f"Could not hash '{inode_groups[group_idx][0][0]}': {e}", "WARNING")
+        for group_idx, sha256 in inode_sha256.items():
+            for file_path, file_stat in inode_groups[group_idx]:
+                package_hashes[file_path.relative_to(package_root_path).as_posix()] = [file_stat.st_size, file_stat.st_mtime_ns, sha256]
+
+        groups_by_sha256: dict[str, list[int]] = {}
+        for group_idx, sha256 in inode_sha256.items():
+            groups_by_sha256.setdefault(sha256, []).append(group_idx)
+        for sha256, group_indexes in groups_by_sha256.items():
+            if len(group_indexes) < 2:
+                continue
+            store_file_path = store_path / sha256
+            try:
+                if not store_file_path.is_file():
+                    store_path.mkdir(exist_ok=True)
+                    os.link(inode_groups[group_indexes[0]][0][0], store_file_path)
+                store_stat = store_file_path.stat()
+            except OSError as e:
+                self.log(f"Hardlinks are not available for '{package_root_path}' ({e}); textures left as they are.", "WARNING")
+                break
+            for group_idx in group_indexes:
+                inode_paths = inode_groups[group_idx]
+                first_stat = inode_paths[0][1]
+                if (first_stat.st_dev, first_stat.st_ino) == (store_stat.st_dev, store_stat.st_ino):
+                    continue
+                relinked_count = 0
+                for file_path, file_stat in inode_paths:
+                    temp_link_path = file_path.with_name(file_path.name + DEDUPE_TEMP_SUFFIX)
+                    try:
+                        os.link(store_file_path, temp_link_path)
+                        os.replace(temp_link_path, file_path)
+                    except OSError as e:
+                        temp_link_path.unlink(missing_ok=True)
+                        dedupe_stats['failed_files'] += 1
+                        self.log(f"Could not link '{file_path}' to the dedupe store: {e}", "WARNING")
+                        continue
+                    relinked_count += 1
+                    package_hashes[file_path.relative_to(package_root_path).as_posix()] = [store_stat.st_size, store_stat.st_mtime_ns, sha256]
+                dedupe_stats['linked_files'] += relinked_count
+                if relinked_count == first_stat.st_nlink: # No other link kept the old copy alive
+                    dedupe_stats['reclaimed_bytes'] += first_stat.st_size
+
+        # Store copies whose only link left is the store's own are no longer used by any livery
+        if store_path.is_dir():
+            for store_file_path in store_path.iterdir():
+                try:
+                    if store_file_path.stat().st_nlink <= 1:
+                        store_file_path.unlink()
+                except OSError:
+                    pass
+
+        hash_cache['packages'][os.path.normcase(str(package_root_path))] = package_hashes
+        self._save_dedupe_hash_cache(hash_cache)
+        self.log(f"Texture deduplication: {dedupe_stats['scanned_files']} texture(s) scanned, {dedupe_stats['hashed_files']} hashed, "
+                 f"{dedupe_stats['linked_files']} duplicate(s) linked, {dedupe_stats['reclaimed_bytes'] / (1024 * 1024):.1f} MB reclaimed "
+                 f"in {time.perf_counter() - dedupe_start_time:.2f}s.", "SUCCESS" if not dedupe_stats['failed_files'] else "WARNING")
+        return dedupe_stats
+
+    def _layout_records_path(self, package_root_path: Path) -> Path:
+        return Path.home() / CONFIG_DIR_NAME / LAYOUT_RECORDS_DIR_NAME / f"{package_root_path.name}.json"
+
+    def _load_layout_records(self, package_root_path: Path) -> dict:
+        """Per-livery layout records of a package (livery folder name -> record); empty if missing, unreadable or of another package."""
+        records_path = self._layout_records_path(package_root_path)
+        try:
+            with open(records_path, "r", encoding='utf-8') as f:
+                layout_records = json.load(f)
+            if layout_records.get('format') == LAYOUT_RECORDS_FORMAT and layout_records.get('package') == os.path.normcase(str(package_root_path)):
+                return layout_records['liveries']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            self.log(f"Could not read layout records '{records_path}': {e}. Rescanning every livery.", "WARNING")
+        return {}
+
+    def _save_layout_records(self, package_root_path: Path, livery_records: dict):
+        records_path = self._layout_records_path(package_root_path)
+        try:
+            records_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(records_path, "w", encoding='utf-8') as f:
+                json.dump({'format': LAYOUT_RECORDS_FORMAT, 'package': os.path.normcase(str(package_root_path)), 'liveries': livery_records}, f)
+        except OSError as e:
+            self.log(f"Could not save layout records '{records_path}': {e}", "WARNING")
+
+    def _scan_layout_entries(self, package_root_path: Path, scan_root_path: Path, skip_dir_path: str | None = None) -> tuple[list[tuple], dict[str, int]]:
+        """
+        Walks 'scan_root_path' with os.scandir and the layout.json exclusion rules; sizes and dates come from the
+        DirEntry stat (free on Windows). Returns ((path, size, date) entries, directory mtimes by package-relative
+        path); a folder's mtime is read before it is listed. The subfolders of 'skip_dir_path' (SimObjects/Airplanes,
+        whose liveries are scanned separately) are not descended into. Symlinked folders are listed but not followed.
+        """
+        layout_entries: list[tuple] = []
+        dir_mtimes: dict[str, int] = {}
+        excluded_dir_prefixes = ("__temp_", DEDUPE_STORE_DIR_NAME) # Temp folders and the texture dedupe store created by this tool
+        package_root_str = str(package_root_path)
+        def package_relative(path_str: str) -> str:
+            return path_str[len(package_root_str) + 1:].replace(os.sep, '/') if path_str != package_root_str else '.'
+
+        try:
+            pending_dirs = [(str(scan_root_path), os.stat(scan_root_path).st_mtime_ns)]
+        except OSError:
+            return layout_entries, dir_mtimes
+        while pending_dirs:
+            dir_path, dir_mtime = pending_dirs.pop()
+            dir_mtimes[package_relative(dir_path)] = dir_mtime
+            descend = skip_dir_path is None or os.path.normcase(dir_path) != skip_dir_path
+            try:
+                with os.scandir(dir_path) as dir_entries:
+                    dir_entries = list(dir_entries)
+            except OSError:
+                continue # Unreadable folder: skipped, as os.walk does
+            for dir_entry in dir_entries:
+                try:
+                    if dir_entry.is_dir():
+                        if descend and not dir_entry.is_symlink() and not dir_entry.name.startswith(excluded_dir_prefixes):
+                            pending_dirs.append((dir_entry.path, dir_entry.stat().st_mtime_ns))
+                        continue
+                    if dir_entry.name.startswith('.') or dir_entry.name.lower() == 'thumbs.db':
+                        continue
+                    rel_path_str = package_relative(dir_entry.path)
+                    if rel_path_str.lower() in ('layout.json', 'manifest.json'):
+                        continue
+                    file_stat = dir_entry.stat()
+                    layout_entries.append((rel_path_str, file_stat.st_size, _unix_to_filetime(file_stat.st_mtime)))
+                except OSError as e_file:
+                    self.log(f"Warning: Error processing file '{dir_entry.path}' for layout: {e_file}. Skipping.", "WARNING")
+        return layout_entries, dir_mtimes
+
+    def _layout_record_is_current(self, package_root_path: Path, livery_record: dict) -> bool:
+        """True when no folder of a recorded livery was modified since it was scanned (files added, removed or replaced)."""
+        try:
+            return all(os.stat(package_root_path / rel_dir).st_mtime_ns == dir_mtime for rel_dir, dir_mtime in livery_record['dir_mtimes'].items())
+        except OSError:
+            return False
+
+    def _generate_layout_file(self, package_root_path: Path, rescan_livery_folders: set[str] | None = None,
+                              full_rescan: bool = False, compact: bool = False) -> tuple[bool, str, int, int]:
+        """
+        Writes layout.json for the whole package. Each livery folder in SimObjects/Airplanes has a record of its
+        entries (see _load_layout_records): liveries in 'rescan_livery_folders' (written in this batch) and those
+        with a modified folder are rescanned, the others are taken from their record without touching their files.
+        Files edited in place do not change their folder's mtime; 'full_rescan' ignores the records.
+        Entries are kept as (path, size, date) tuples and streamed to disk by _write_layout_json ('compact' output).
+        """
+        self.log(f"Generating layout.json for: {package_root_path}{' (full rescan)' if full_rescan else ''}", "STEP")
+        layout_file_size_on_disk = 0
+        layout_json_path = package_root_path / "layout.json"
+        airplanes_path = package_root_path / "SimObjects" / "Airplanes"
+        rescan_livery_folders = rescan_livery_folders or set()
+
+        try:
+            # Files outside the livery folders (package root, SimObjects/Airplanes itself) are always scanned
+            content_entries, _ = self._scan_layout_entries(package_root_path, package_root_path, os.path.normcase(str(airplanes_path)))
+            stored_records = {} if full_rescan else self._load_layout_records(package_root_path)
+            livery_records: dict[str, dict] = {}
+            try:
+                livery_dirs = sorted(d for d in airplanes_path.iterdir()
+                                     if d.is_dir() and not d.is_symlink() and not d.name.startswith(("__temp_", DEDUPE_STORE_DIR_NAME)))
+            except FileNotFoundError:
+                livery_dirs = []
+            dirs_to_rescan = []
+            for livery_dir in livery_dirs:
+                livery_record = stored_records.get(livery_dir.name)
+                if livery_record is None or livery_dir.name in rescan_livery_folders or not self._layout_record_is_current(package_root_path, livery_record):
+                    dirs_to_rescan.append(livery_dir)
+                else:
+                    livery_records[livery_dir.name] = livery_record
+            rescanned_count = len(dirs_to_rescan)
+            if dirs_to_rescan:
+                with ThreadPoolExecutor(max_workers=LAYOUT_SCAN_WORKERS, thread_name_prefix="layout_scan") as scan_pool:
+                    for livery_dir, (livery_entries, dir_mtimes) in zip(dirs_to_rescan, scan_pool.map(
+                            lambda scan_dir: self._scan_layout_entries(package_root_path, scan_dir), dirs_to_rescan)):
+                        livery_records[livery_dir.name] = {'dir_mtimes': dir_mtimes, 'entries': livery_entries}
+            for livery_record in livery_records.values():
+                content_entries.extend(livery_record['entries'])
+            self._save_layout_records(package_root_path, livery_records)
+
+            content_entries.sort(key=lambda entry: entry[0])
+            content_total_size = sum(entry[1] for entry in content_entries)
+            self.log(f"Layout scan complete. {len(content_entries)} files included ({rescanned_count} of {len(livery_dirs)} livery folder(s) rescanned). "
+                     f"Total content size: {content_total_size} bytes.", "INFO")
+
+            _write_layout_json(layout_json_path, content_entries, compact)
             self.log(f"{layout_json_path.name} generated/updated successfully.", "SUCCESS")
             layout_file_size_on_disk = layout_json_path.stat().st_size
             return True, "", content_total_size, layout_file_size_on_disk
@@ -2463,9 +4818,11 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             import traceback; self.log(f"Traceback: {traceback.format_exc()}", "DETAIL")
             return False
 
-    def show_multi_final_message(self, results: list[dict], layout_manifest_pkg_postproc_success: bool, layout_manifest_pkg_postproc_detail: str, community_pkg_path_str: str):
-        successful_individual_liveries = sum(1 for r in results if r["success"])
-        failed_individual_liveries_or_archives = len(results) - successful_individual_liveries
+    def show_multi_final_message(self, results: list[dict], layout_manifest_pkg_postproc_success: bool, layout_manifest_pkg_postproc_detail: str, community_pkg_path_str: str,
+                                 converter_runs: list[dict] | None = None):
+        skipped_archives = sum(1 for r in results if r.get("skipped"))
+        successful_individual_liveries = sum(1 for r in results if r["success"]) - skipped_archives
+        failed_individual_liveries_or_archives = len(results) - successful_individual_liveries - skipped_archives
         total_processed_input_archives = len(self.selected_zip_files)
 
         title = "Installation Batch Result"
@@ -2475,10 +4832,14 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
 
         if not results and total_processed_input_archives == 0:
             summary_lines.append("No livery archive files were selected or no operations were performed.")
+        elif failed_individual_liveries_or_archives == 0 and successful_individual_liveries == 0:
+            summary_lines.append(f"All {skipped_archives} archive(s) are already installed and unchanged. Nothing was copied.")
+            log_level_for_summary_msg = "SUCCESS"
         elif failed_individual_liveries_or_archives == 0 :
             if layout_manifest_pkg_postproc_success:
                 summary_lines.append(f"All {successful_individual_liveries} livery(s) (from {total_processed_input_archives} archive(s)) installed successfully!")
                 summary_lines.append(f"Package layout.json and manifest.json for '{Path(community_pkg_path_str).name}' also generated/updated.")
+                if skipped_archives: summary_lines.append(f"{skipped_archives} archive(s) already installed and unchanged were skipped.")
                 summary_lines.append("\nThe livery/liveries should now be available in MSFS (restart MSFS if running).")
                 log_level_for_summary_msg = "SUCCESS"
             else: 
@@ -2490,6 +4851,7 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
             summary_lines.append(f"Batch completed with {failed_individual_liveries_or_archives} error(s) out of {total_processed_input_archives} archive(s).")
             summary_lines.append(f" - Successful individual liveries: {successful_individual_liveries}")
             summary_lines.append(f" - Failed items: {failed_individual_liveries_or_archives}")
+            if skipped_archives: summary_lines.append(f" - Skipped (already installed): {skipped_archives}")
             
             if layout_manifest_pkg_postproc_detail:
                  summary_lines.append(f"\nPackage Layout/Manifest Status: {layout_manifest_pkg_postproc_detail}")
@@ -2501,6 +4863,15 @@ Press Windows Key + R, type `%localappdata%` and press Enter to open the Local f
                 summary_lines.append(f" - '{Path(res_item['file']).name}': {short_err}")
             log_level_for_summary_msg = "ERROR"; messagebox_func = messagebox.showerror
 
+        if converter_runs:
+            # Failed, killed and slow ptp_converter.exe runs, so problem PTPs stand out
+            summary_lines.append(f"\n{PTP_CONVERTER_EXE_NAME}: {len(converter_runs)} run(s), {sum(run['wall_time'] for run in converter_runs):.0f}s in total.")
+            notable_runs = [run for run in converter_runs if run['abort_reason'] or run['returncode'] != 0 or run['wall_time'] >= PTP_CONVERTER_SLOW_SECONDS]
+            for i, run in enumerate(sorted(notable_runs, key=lambda run: run['wall_time'], reverse=True)):
+                if i >= 5: summary_lines.append(f"    (... and {len(notable_runs) - 5} more.)"); break
+                run_status = run['abort_reason'] or f"exit code {run['returncode']}"
+                summary_lines.append(f" - '{run['file']}': {run_status}, {run['wall_time']:.1f}s, {run['peak_output_bytes'] / (1024 * 1024):.1f} MB output")
+
         final_summary_msg = "\n".join(summary_lines)
         self.log(f"FINAL BATCH SUMMARY:\n{final_summary_msg}", log_level_for_summary_msg)
         messagebox_func(title, final_summary_msg)
@@ -0,0 +1,267 @@
+"""
+Reproducible check of the built-in PTP (Microsoft cabinet) reader of LiveryInstaller.py, on any OS:
+    python tools/check_cab_reader.py
+
+It writes real cabinets: stored and MSZIP folders, several files per folder, files split across data blocks,
+reserved areas, a PTP-style header before 'MSCF', with and without block checksums. What _extract_cab_files
+writes is compared byte for byte with the original files. When a libarchive 'bsdtar' is found (Windows 10+
+ships one as tar.exe), it extracts the same cabinets too, as an independent check of the cabinets written here.
+
+Damaged cabinets (header, folder table, data blocks, truncation) must make the built-in reader give up
+without leaving any output, and the installer must then fall back to the converter; tools/fake_ptp_converter.py
+stands in for ptp_converter.exe. Exits with 1 if any check fails.
+"""
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS_DIR.parent))
+import LiveryInstaller as installer # noqa: E402
+import fake_ptp_converter # noqa: E402
+
+DOS_DATE = (44 << 9) | (3 << 5) | 15 # 2024-03-15
+DOS_TIME = (10 << 11) | (30 << 5) | (10 // 2) # 10:30:10
+CAB_FLAG_RESERVE = 0x0004
+CAB_BLOCK_SIZE = 32 * 1024 # Uncompressed size of every data block makecab writes, except the last one of a folder
+PTP_HEADER = b"PTP\0" + bytes(range(256)) * 2 # Stands in for the header some PTPs have before the cabinet
+
+
+def sample_files(seed: int, folder: str = "") -> list[tuple[str, bytes]]:
+    """
+    Livery-like files: incompressible and repetitive content, an empty file, a non-ASCII name, sizes across
+    block boundaries. 'folder' (ending with '\\') keeps the names of different cabinet folders apart.
+    """
+    rng = random.Random(seed)
+    return [(folder + name, data) for name, data in (
+        ("Config.cfg", b'[fltsim.0]\r\ntitle="Check Air"\r\natc_id="CHK001"\r\ntexture=CHK\r\n'),
+        ("texture.CHK\\FUSELAGE_ALBD.PNG.DDS", rng.randbytes(70000)),
+        ("texture.CHK\\texture.cfg", b"[fltsim]\r\nfallback.1=..\\..\\PMDG 737-800\\texture\r\n" * 50),
+        ("texture.CHK\\TAIL_ALBD.PNG.DDS", b"DDS " + bytes(rng.choice(b"ab") for _ in range(40000))),
+        ("model.CHK\\model.cfg", b"[models]\r\nnormal=..\\..\\PMDG 737-800\\model\\B737_800.xml\r\n"),
+        ("Empty.txt", b""),
+        ("texture.CHK\\Señal.dds", rng.randbytes(33000)),
+        ("Aircraft.ini", b"[Livery]\r\nAirline=Check\r\n"),
+    )]
+
+
+def build_cabinet(folders: list[tuple[int, list[tuple[str, bytes]]]], reserve: tuple[bytes, int, int] | None = None,
+                  checksums: bool = True) -> bytes:
+    """
+    A single cabinet, laid out like makecab output. 'folders' are (compression, files); file names use '\\'
+    as makecab does. 'reserve' is (header reserve bytes, folder reserve size, data reserve size).
+    """
+    header_reserve, folder_reserve, data_reserve = reserve or (b"", 0, 0)
+    file_records = b""
+    file_count = 0
+    folder_blocks: list[list[bytes]] = []
+    for folder_index, (compression, files) in enumerate(folders):
+        folder_offset = 0
+        for name, data in files:
+            attributes = 0x20 if name.isascii() else 0x20 | 0x80 # 0x80: name is UTF-8
+            file_records += struct.pack("<IIHHHH", len(data), folder_offset, folder_index, DOS_DATE, DOS_TIME, attributes)
+            file_records += name.encode("cp1252" if name.isascii() else "utf-8") + b"\0"
+            folder_offset += len(data)
+            file_count += 1
+
+        folder_stream = b"".join(data for _, data in files)
+        blocks, history = [], b""
+        for block_start in range(0, len(folder_stream), CAB_BLOCK_SIZE):
+            block = folder_stream[block_start:block_start + CAB_BLOCK_SIZE]
+            if compression == installer.CAB_COMPRESSION_NONE:
+                packed = block
+            else: # One raw deflate stream per block, with the previous output as its window
+                compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=history) if history else zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+                packed = b"CK" + compressor.compress(block) + compressor.flush()
+                history = (history + block)[-installer.CAB_MSZIP_WINDOW:]
+            size_fields = struct.pack("<HH", len(packed), len(block))
+            checksum = installer._cab_block_checksum(packed, size_fields) if checksums else 0
+            blocks.append(struct.pack("<I", checksum) + size_fields + b"\0" * data_reserve + packed)
+        folder_blocks.append(blocks)
+
+    header_size = installer.CAB_HEADER_SIZE + (4 + len(header_reserve) if reserve else 0)
+    files_offset = header_size + len(folders) * (8 + folder_reserve)
+    data_offset = files_offset + len(file_records)
+    folder_records = b""
+    for (compression, _), blocks in zip(folders, folder_blocks):
+        folder_records += struct.pack("<IHH", data_offset, len(blocks), compression) + b"\0" * folder_reserve
+        data_offset += sum(len(block) for block in blocks)
+    header = struct.pack("<4sIIIIIBBHHHHH", installer.CAB_SIGNATURE, 0, data_offset, 0, files_offset, 0, 3, 1,
+                         len(folders), file_count, CAB_FLAG_RESERVE if reserve else 0, 0, 0)
+    if reserve:
+        header += struct.pack("<HBB", len(header_reserve), folder_reserve, data_reserve) + header_reserve
+    return header + folder_records + file_records + b"".join(b"".join(blocks) for blocks in folder_blocks)
+
+
+def expected_tree(folders) -> dict[str, bytes]:
+    return {name.replace("\\", "/"): data for _, files in folders for name, data in files}
+
+
+def extracted_tree(root: Path) -> dict[str, bytes]:
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def compare_trees(expected: dict[str, bytes], actual: dict[str, bytes]) -> str:
+    """'' when equal, else what differs."""
+    if expected.keys() != actual.keys():
+        return f"files differ: missing {sorted(expected.keys() - actual.keys())}, unexpected {sorted(actual.keys() - expected.keys())}"
+    wrong = [name for name in expected if expected[name] != actual[name]]
+    return f"content differs: {wrong}" if wrong else ""
+
+
+def find_bsdtar() -> str | None:
+    for candidate in ("bsdtar", "tar"):
+        tool = shutil.which(candidate)
+        if tool:
+            try:
+                version = subprocess.run([tool, "--version"], capture_output=True, text=True, timeout=10).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if "bsdtar" in version or "libarchive" in version:
+                return tool
+    return None
+
+
+BIG_TEXTURE = ("texture.CHK\\BIG_ALBD.PNG.DDS", b"".join(random.Random(7).randbytes(700) * 3 for _ in range(200))) # 420 KB, 13 blocks
+
+ROUND_TRIP_CASES = [
+    # (label, folders, reserve, checksums, PTP header)
+    ("stored + MSZIP folders, reserved areas, PTP header",
+     [(installer.CAB_COMPRESSION_NONE, sample_files(1)[:3]),
+      (installer.CAB_COMPRESSION_MSZIP, sample_files(2)[3:]),
+      (installer.CAB_COMPRESSION_MSZIP, sample_files(3, "SubLivery\\"))],
+     (b"R" * 20, 4, 8), True, True),
+    ("single MSZIP folder without checksums",
+     [(installer.CAB_COMPRESSION_MSZIP, sample_files(4))], None, False, False),
+    ("large files split over many blocks",
+     [(installer.CAB_COMPRESSION_MSZIP, sample_files(5) + [BIG_TEXTURE]),
+      (installer.CAB_COMPRESSION_NONE, sample_files(6, "SubLivery\\") + [("SubLivery\\" + BIG_TEXTURE[0], BIG_TEXTURE[1])])],
+     None, True, True),
+]
+
+
+def check_round_trips(work_dir: Path, bsdtar: str | None) -> list[str]:
+    failures = []
+    for case_index, (label, folders, reserve, checksums, with_header) in enumerate(ROUND_TRIP_CASES):
+        cabinet = build_cabinet(folders, reserve, checksums)
+        ptp_path = work_dir / f"round_trip_{case_index}.ptp"
+        ptp_path.write_bytes((PTP_HEADER if with_header else b"") + cabinet)
+        target_dir = work_dir / f"round_trip_{case_index}"
+        with open(ptp_path, "rb") as cab_file:
+            cab_directory = installer._read_cab_directory(cab_file)
+            installer._extract_cab_files(cab_file, cab_directory, target_dir)
+        problem = compare_trees(expected_tree(folders), extracted_tree(target_dir))
+        if not problem:
+            wrong_mtimes = [path.name for path in target_dir.rglob("*") if path.is_file()
+                            and datetime.fromtimestamp(path.stat().st_mtime).timetuple()[:6] != (2024, 3, 15, 10, 30, 10)]
+            problem = f"wrong modification times: {wrong_mtimes}" if wrong_mtimes else ""
+        if not problem and bsdtar:
+            cab_path, bsdtar_dir = work_dir / f"round_trip_{case_index}.cab", work_dir / f"round_trip_{case_index}_bsdtar"
+            cab_path.write_bytes(cabinet)
+            bsdtar_dir.mkdir()
+            result = subprocess.run([bsdtar, "-xf", str(cab_path), "-C", str(bsdtar_dir)], capture_output=True, text=True)
+            problem = f"bsdtar failed: {result.stderr.strip()}" if result.returncode else compare_trees(expected_tree(folders), extracted_tree(bsdtar_dir))
+            problem = f"bsdtar disagrees: {problem}" if problem else ""
+        report(f"round trip: {label}", problem, failures)
+    return failures
+
+
+def damaged_cabinets() -> list[tuple[str, bytes, bool]]:
+    """(label, damaged PTP bytes, also checked through the converter fallback)."""
+    folders, reserve = ROUND_TRIP_CASES[0][1], ROUND_TRIP_CASES[0][2]
+    intact = PTP_HEADER + build_cabinet(folders, reserve)
+    unchecked = PTP_HEADER + build_cabinet(folders, reserve, checksums=False)
+    cab_base = len(PTP_HEADER)
+    header_size = installer.CAB_HEADER_SIZE + 4 + len(reserve[0])
+    # Data of the first block of the stored folder (first folder record) and of the first MSZIP folder (second one)
+    stored_block_data = cab_base + struct.unpack_from("<I", intact, cab_base + header_size)[0] + 8 + reserve[2]
+    folder_record = cab_base + header_size + (8 + reserve[1])
+    block_offset = cab_base + struct.unpack_from("<I", intact, folder_record)[0]
+    block_data = block_offset + 8 + reserve[2]
+
+    def patched(ptp_bytes: bytes, offset: int, new_bytes: bytes) -> bytes:
+        return ptp_bytes[:offset] + new_bytes + ptp_bytes[offset + len(new_bytes):]
+    def flipped(ptp_bytes: bytes, offset: int) -> bytes:
+        return patched(ptp_bytes, offset, bytes([ptp_bytes[offset] ^ 0xFF]))
+    return [
+        ("unsupported cabinet version", patched(intact, cab_base + 25, b"\x02"), True),
+        ("truncated cabinet header", PTP_HEADER + intact[cab_base:cab_base + 20], False),
+        ("file refers to a missing folder", patched(intact, cab_base + struct.unpack_from("<I", intact, cab_base + 16)[0] + 8, b"\x09\x00"), True),
+        ("flipped byte in a stored block (only the checksum shows it)", flipped(intact, stored_block_data + 10), True),
+        ("flipped byte in an MSZIP block", flipped(intact, block_data + 100), True),
+        ("bad MSZIP block signature", patched(unchecked, block_data, b"XX"), True),
+        ("wrong uncompressed block size", patched(unchecked, block_offset + 6, struct.pack("<H", 100)), True),
+        ("unsupported compression (LZX)", patched(intact, folder_record + 6, struct.pack("<H", 3)), True),
+        ("cabinet cut off in its data", intact[:len(intact) - 5000], False),
+    ]
+
+
+def check_damaged(work_dir: Path) -> list[str]:
+    failures = []
+    log_lines: list[str] = []
+    app = installer.PMDGLiveryInstaller.__new__(installer.PMDGLiveryInstaller) # No window: only the PTP methods are used
+    app.log = lambda message, level="INFO": log_lines.append(f"[{level}] {message}")
+    app.ptp_converter_exe = str(TOOLS_DIR / "fake_ptp_converter.py")
+    converter_files = fake_ptp_converter._sub_livery_files(1, 64 * 1024)
+
+    for case_index, (label, ptp_bytes, via_converter) in enumerate(damaged_cabinets()):
+        output_dir = work_dir / f"damaged_{case_index}"
+        output_dir.mkdir()
+        ptp_path = work_dir / f"damaged_{case_index}.ptp"
+        ptp_path.write_bytes(ptp_bytes)
+        staged_dir = app._extract_ptp_natively(ptp_path, output_dir)
+        problem = ""
+        if staged_dir is not None:
+            problem = f"built-in reader accepted it; wrote {sorted(extracted_tree(staged_dir))}"
+        elif any(output_dir.iterdir()):
+            problem = f"left output behind: {[path.name for path in output_dir.iterdir()]}"
+        report(f"damaged, rejected by the built-in reader: {label}", problem, failures)
+        if problem or not via_converter:
+            continue
+
+        # Same damage inside a fake PTP the stand-in converter can read: the install must go through the converter
+        fallback_ptp_path = work_dir / f"fallback_{case_index}.ptp"
+        fake_ptp_converter._write_fake_ptp(fallback_ptp_path, {"damaged.cab": ptp_bytes, **converter_files}, None)
+        converter_runs: list[dict] = []
+        converted, staged_dir, error = app._run_ptp_converter(fallback_ptp_path, output_dir, converter_runs)
+        if not converted:
+            problem = f"converter fallback failed: {error}"
+        elif len(converter_runs) != 1:
+            problem = f"expected one converter run, got {len(converter_runs)}"
+        else:
+            converted_files = {path.name: path.read_bytes() for path in staged_dir.rglob("*") if path.is_file()}
+            if converted_files.get("Config.cfg") != converter_files["Config.cfg"]:
+                problem = f"converter output incomplete: {sorted(converted_files)}"
+        report(f"damaged, installed through the converter: {label}", problem, failures)
+    if failures:
+        print("Installer log:\n  " + "\n  ".join(log_lines))
+    return failures
+
+
+def report(label: str, problem: str, failures: list[str]):
+    print(f"{'FAIL' if problem else 'ok  '} {label}{f': {problem}' if problem else ''}")
+    if problem:
+        failures.append(label)
+
+
+def main() -> int:
+    bsdtar = find_bsdtar()
+    if not bsdtar:
+        print("(no libarchive bsdtar found: cabinets are not cross-checked)")
+    work_dir = Path(tempfile.mkdtemp(prefix="check_cab_reader_"))
+    try:
+        failures = check_round_trips(work_dir, bsdtar) + check_damaged(work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"\n{len(failures)} check(s) failed." if failures else "\nAll checks passed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
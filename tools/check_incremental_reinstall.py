@@ -0,0 +1,210 @@
+"""
+Reproducible check of the incremental reinstall of LiveryInstaller.py, on any OS:
+    python tools/check_incremental_reinstall.py
+
+A livery is installed from a ZIP, then reinstalled over itself from a second ZIP where one file changed, one
+was added and one was removed, with 'Incremental reinstall' on. Both ZIPs are written with and without
+explicit folder entries ('texture.CHK/', 'model.CHK/'), as many archivers add them. The same update is also
+installed from a folder, and from a ZIP extracted into the package's temp folders, whose files must then be
+compared by the CRC-32 stored in the ZIP without being read. After every reinstall, the installed livery must
+hold exactly the files of the new version, byte for byte. Exits with 1 if any check fails.
+"""
+import queue
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS_DIR.parent))
+import LiveryInstaller as installer # noqa: E402
+
+LIVERY_ROOT = "Check Livery/"
+
+
+class Value:
+    """Stands in for the Tk variables the install reads."""
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def livery_files(version: int) -> dict[str, bytes]:
+    """The files of a livery, relative to its folder. Version 2 changes, adds and removes one file each."""
+    rng = random.Random(1)
+    files = {
+        "aircraft.cfg": b'[VERSION]\r\nmajor=1\r\n[FLTSIM.0]\r\ntitle="Check Air"\r\natc_id="CHK001"\r\n',
+        "texture.CHK/texture.cfg": b"[fltsim]\r\nfallback.1=..\\..\\PMDG 737-800\\texture\r\n",
+        "texture.CHK/FUSELAGE_ALBD.PNG.DDS": rng.randbytes(300000),
+        "texture.CHK/TAIL_ALBD.PNG.DDS": rng.randbytes(120000),
+        "texture.CHK/WING_ALBD.PNG.DDS": rng.randbytes(80000),
+        "model.CHK/model.cfg": b"[models]\r\nnormal=..\\..\\PMDG 737-800\\model\\B737_800.xml\r\n",
+    }
+    if version == 2:
+        files["texture.CHK/TAIL_ALBD.PNG.DDS"] = rng.randbytes(120000) # Changed, same size
+        files["texture.CHK/ENGINE_ALBD.PNG.DDS"] = rng.randbytes(50000) # Added
+        del files["texture.CHK/WING_ALBD.PNG.DDS"] # Removed
+    return files
+
+
+def write_zip(zip_path: Path, files: dict[str, bytes], folder_entries: bool):
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        if folder_entries:
+            zip_file.writestr(LIVERY_ROOT, b"")
+            for folder in sorted({name.rsplit("/", 1)[0] + "/" for name in files if "/" in name}):
+                zip_file.writestr(LIVERY_ROOT + folder, b"")
+        for name, data in files.items():
+            zip_file.writestr(LIVERY_ROOT + name, data)
+
+
+def installed_tree(livery_dir: Path) -> dict[str, bytes]:
+    return {path.relative_to(livery_dir).as_posix(): path.read_bytes() for path in livery_dir.rglob("*") if path.is_file()}
+
+
+def compare_trees(expected: dict[str, bytes], actual: dict[str, bytes]) -> str:
+    """The installer may add files of its own next to the livery's (layout.json is not inside the livery)."""
+    missing = sorted(set(expected) - set(actual))
+    extra = sorted(name for name in set(actual) - set(expected) if name != "aircraft.cfg")
+    differing = sorted(name for name in set(expected) & set(actual) if name != "aircraft.cfg" and actual[name] != expected[name])
+    problems = [f"{label}: {', '.join(names)}" for label, names in (("missing", missing), ("extra", extra), ("differ", differing)) if names]
+    return "; ".join(problems)
+
+
+def unchanged_problem(log_lines: list[str]) -> str:
+    """The files both versions share must be kept, not written again (aircraft.cfg is always rewritten)."""
+    old_files, new_files = livery_files(1), livery_files(2)
+    expected = sum(1 for name, data in new_files.items() if name != "aircraft.cfg" and old_files.get(name) == data)
+    kept = sum(int(count) for line in log_lines for count in re.findall(r"(\d+) unchanged file\(s\) kept", line))
+    return "" if kept == expected else f"{kept} unchanged file(s) kept, expected {expected}"
+
+
+def make_installer(work_dir: Path) -> tuple[installer.PMDGLiveryInstaller, dict, list[str]]:
+    """An installer without a window, and the per-batch config the install reads."""
+    log_lines = []
+    app = installer.PMDGLiveryInstaller.__new__(installer.PMDGLiveryInstaller)
+    app.log = lambda message, level="INFO": log_lines.append(f"[{level}] {message}")
+    app.master = type("NoWindow", (), {"after": lambda self, delay, callback=None, *args: None})()
+    app.status_var = Value("")
+    app.selected_zip_files = []
+    app.custom_name_var = Value("")
+    app._destination_locks = {}
+    app._destination_locks_guard = threading.Lock()
+    app._deferred_deletions = queue.Queue()
+    app._deferred_deletion_thread = None
+    package_dir = work_dir / "Community" / "pmdg-aircraft-738-liveries"
+    localstate_dir = work_dir / "LocalState" / "pmdg-aircraft-738"
+    package_dir.mkdir(parents=True)
+    localstate_dir.mkdir(parents=True)
+    config = {
+        "reference_livery_path": work_dir / "reference", "pmdg_localstate_package_path": localstate_dir,
+        "aircraft_variant": "737-800", "main_package_folder": package_dir, "base_aircraft_folder_name": "PMDG 737-800",
+        "extract_workers": 2, "copy_workers": 2, "verify_stored_crc": True, "incremental_reinstall": True,
+        "staged_file_crcs": {},
+    }
+    return app, config, log_lines
+
+
+def livery_folder(config: dict) -> Path:
+    return config["main_package_folder"] / "SimObjects" / "Airplanes" / "PMDG 737-800 Check Air"
+
+
+def install_zip(app, config: dict, zip_path: Path) -> str:
+    probe = app._probe_zip_archive(zip_path, zip_path.name)
+    success, message = app._process_single_livery_from_zip(zip_path, zip_path, probe, config)[:2]
+    return "" if success else f"install failed: {message}"
+
+
+def check_zip_reinstalls(work_dir: Path) -> list[str]:
+    failures = []
+    for folder_entries in (False, True):
+        label = f"ZIP {'with' if folder_entries else 'without'} folder entries"
+        case_dir = work_dir / ("folders" if folder_entries else "plain")
+        case_dir.mkdir()
+        app, config, log_lines = make_installer(case_dir)
+        for version in (1, 2):
+            zip_path = case_dir / f"v{version}.zip"
+            write_zip(zip_path, livery_files(version), folder_entries)
+            log_lines.clear()
+            problem = install_zip(app, config, zip_path)
+            if not problem:
+                problem = compare_trees(livery_files(version), installed_tree(livery_folder(config)))
+            if not problem and version == 2:
+                problem = unchanged_problem(log_lines)
+            report(f"{label}, {'install' if version == 1 else 'incremental reinstall'}", problem, failures)
+            if problem:
+                print("\n".join(f"    {line}" for line in log_lines[-30:]))
+                break
+    return failures
+
+
+def check_folder_reinstalls(work_dir: Path) -> list[str]:
+    failures = []
+    for extracted in (False, True):
+        label = f"{'Extracted ZIP' if extracted else 'Folder'}, incremental reinstall"
+        case_dir = work_dir / ("extracted" if extracted else "folder")
+        case_dir.mkdir()
+        app, config, log_lines = make_installer(case_dir)
+        zip_path = case_dir / "v1.zip"
+        write_zip(zip_path, livery_files(1), folder_entries=True)
+        problem = install_zip(app, config, zip_path)
+        hashed_files = []
+        if not problem:
+            if extracted: # Staged like a multi-livery ZIP: moved into place, compared by stored CRC
+                write_zip(case_dir / "v2.zip", livery_files(2), folder_entries=False)
+                extract_dir = config["main_package_folder"] / "__temp_archive_check" / "__extracted_zip_v2"
+                app._extract_archive(case_dir / "v2.zip", extract_dir, staged_file_crcs=config["staged_file_crcs"])
+                source_dir = extract_dir / LIVERY_ROOT
+            else:
+                source_dir = case_dir / "v2" / LIVERY_ROOT
+                for name, data in livery_files(2).items():
+                    (source_dir / name).parent.mkdir(parents=True, exist_ok=True)
+                    (source_dir / name).write_bytes(data)
+            log_lines.clear()
+            file_crc32 = installer._file_crc32
+            installer._file_crc32 = lambda file_path: hashed_files.append(Path(file_path)) or file_crc32(file_path)
+            try:
+                success, message = app._process_single_livery(source_dir, source_dir, config)[:2]
+            finally:
+                installer._file_crc32 = file_crc32
+            problem = "" if success else f"install failed: {message}"
+        if not problem:
+            problem = compare_trees(livery_files(2), installed_tree(livery_folder(config)))
+        if not problem:
+            problem = unchanged_problem(log_lines)
+        if not problem and extracted and any(source_dir in path.parents for path in hashed_files):
+            problem = "staged source files were read to compare them"
+        if not problem and not extracted and not (source_dir / "texture.CHK" / "FUSELAGE_ALBD.PNG.DDS").is_file():
+            problem = "the source folder was consumed"
+        report(label, problem, failures)
+        if problem:
+            print("\n".join(f"    {line}" for line in log_lines[-30:]))
+    return failures
+
+
+def report(label: str, problem: str, failures: list[str]):
+    print(f"{'FAIL' if problem else 'ok  '} {label}{f': {problem}' if problem else ''}")
+    if problem:
+        failures.append(label)
+
+
+def main() -> int:
+    work_dir = Path(tempfile.mkdtemp(prefix="check_incremental_reinstall_"))
+    try:
+        failures = check_zip_reinstalls(work_dir) + check_folder_reinstalls(work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"\n{len(failures)} check(s) failed." if failures else "\nAll checks passed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Stand-in for ptp_converter.exe, so the PTP code paths of LiveryInstaller.py can be run off Windows
+(tests, benchmarks, concurrency checks).
+
+It follows the contract _run_ptp_converter relies on:
+    fake_ptp_converter.py <path/to/input.ptp>
+extracts the PTP into a folder named after the PTP's stem, next to the PTP, and prints "DONE!".
+
+Fake PTPs are ZIP files with the same content as a real PTP (Config.cfg, root model.cfg, Aircraft.ini,
+texture folder, Settings.dat and, for multi-livery PTPs, sub-PTPs). The built-in cabinet reader rejects
+them, so the installer takes the converter path. Create them with:
+    fake_ptp_converter.py --make-sample out.ptp [--liveries N] [--texture-mb M] [--delay S] [--fail MODE]
+
+Delays and failures are set per PTP (--delay/--fail when making it, stored in a 'fake_converter.json'
+member) or for every run with environment variables:
+    FAKE_PTP_CONVERTER_DELAY   seconds to wait before extracting
+    FAKE_PTP_CONVERTER_FAIL    'cab'   print the CAB extraction error and exit
+                               'exit'  exit with code 1
+                               'hang'  never finish (for the converter timeout)
+                               'empty' report DONE! without producing any output
+
+Point the installer at it with the PMDG_PTP_CONVERTER environment variable:
+    PMDG_PTP_CONVERTER=tools/fake_ptp_converter.py python LiveryInstaller.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+BEHAVIOUR_MEMBER_NAME = "fake_converter.json"
+FAIL_MODES = ("cab", "exit", "hang", "empty")
+
+
+def _sub_livery_files(livery_number: int, texture_bytes: int) -> dict[str, bytes]:
+    """Files of one converted (single-livery) PTP, laid out like ptp_converter.exe output."""
+    return {
+        "Config.cfg": (f'[fltsim.{livery_number - 1}]\r\ntitle="Fake Airline {livery_number}"\r\n'
+                       f'atc_id="FAKE{livery_number:03d}"\r\natc_airline="FAKE"\r\nmodel=\r\ntexture=FAKE{livery_number}\r\n').encode(),
+        "model.cfg": b"[models]\r\nnormal=..\\..\\PMDG 737-800\\model\\B737_800.xml\r\n",
+        "Aircraft.ini": b"[Livery]\r\nAirline=Fake\r\n",
+        f"texture.FAKE{livery_number}/texture.cfg": b"[fltsim]\r\nfallback.1=..\\..\\PMDG 737-800\\texture\r\n",
+        f"texture.FAKE{livery_number}/FUSELAGE_ALBD.PNG.DDS": os.urandom(min(texture_bytes, 64 * 1024)) * max(1, texture_bytes // (64 * 1024)),
+        "Settings.dat": b"[Settings]\r\nType=Livery\r\n",
+        "Product.ini": b"[Product]\r\nName=Fake\r\n",
+    }
+
+
+def _write_fake_ptp(target, files: dict[str, bytes], behaviour: dict | None):
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED) as ptp_zip:
+        for member_path, data in files.items():
+            ptp_zip.writestr(member_path, data)
+        if behaviour:
+            ptp_zip.writestr(BEHAVIOUR_MEMBER_NAME, json.dumps(behaviour))
+
+
+def make_sample(target_path: Path, livery_count: int, texture_mb: float, behaviour: dict | None):
+    """Writes a fake single-livery PTP, or a multi-livery PTP with sub-PTPs when livery_count > 1."""
+    texture_bytes = int(texture_mb * 1024 * 1024)
+    if livery_count <= 1:
+        _write_fake_ptp(target_path, _sub_livery_files(1, texture_bytes), behaviour)
+        return
+    settings_lines = ["[Settings]", "Type=Multi Livery", f"Count={livery_count}"]
+    files = {}
+    for livery_number in range(1, livery_count + 1):
+        settings_lines += [f"[Livery {livery_number}]", f"Filename=livery{livery_number}.ptp", f"Name=Fake Airline {livery_number}"]
+        sub_ptp_path = target_path.with_name(f"{target_path.stem}.sub{livery_number}.tmp")
+        _write_fake_ptp(sub_ptp_path, _sub_livery_files(livery_number, texture_bytes), behaviour)
+        files[f"livery{livery_number}.ptp"] = sub_ptp_path.read_bytes()
+        sub_ptp_path.unlink()
+    files["Settings.dat"] = ("\r\n".join(settings_lines) + "\r\n").encode()
+    _write_fake_ptp(target_path, files, behaviour)
+
+
+def convert(ptp_path: Path) -> int:
+    """Extracts 'ptp_path' into '<ptp dir>/<ptp stem>/' following ptp_converter.exe's stdout/exit code contract."""
+    print(f"Processing {ptp_path}", flush=True)
+    try:
+        ptp_zip = zipfile.ZipFile(ptp_path)
+    except (OSError, zipfile.BadZipFile):
+        print("Error: System.ApplicationException: CAB extraction error", flush=True)
+        return 1
+
+    with ptp_zip:
+        behaviour = {}
+        if BEHAVIOUR_MEMBER_NAME in ptp_zip.namelist():
+            behaviour = json.loads(ptp_zip.read(BEHAVIOUR_MEMBER_NAME))
+        delay = float(os.environ.get("FAKE_PTP_CONVERTER_DELAY") or behaviour.get("delay") or 0)
+        fail_mode = os.environ.get("FAKE_PTP_CONVERTER_FAIL") or behaviour.get("fail") or ""
+
+        if delay:
+            time.sleep(delay)
+        if fail_mode == "cab":
+            print("Error: System.ApplicationException: CAB extraction error", flush=True)
+            time.sleep(3600) # The real tool does not always exit after this
+            return 1
+        if fail_mode == "exit":
+            print("Fatal: fake converter failure", file=sys.stderr, flush=True)
+            return 1
+        if fail_mode == "hang":
+            while True:
+                time.sleep(60)
+
+        output_dir = ptp_path.parent / ptp_path.stem
+        output_dir.mkdir(exist_ok=True)
+        if fail_mode != "empty":
+            for member_info in ptp_zip.infolist():
+                if member_info.filename != BEHAVIOUR_MEMBER_NAME:
+                    ptp_zip.extract(member_info, output_dir)
+    print("DONE!", flush=True)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stand-in for ptp_converter.exe (see module docstring).")
+    parser.add_argument("ptp", type=Path, help="PTP to convert, or the file to create with --make-sample")
+    parser.add_argument("--make-sample", action="store_true", help="Create a fake PTP instead of converting one")
+    parser.add_argument("--liveries", type=int, default=1, help="Sub-liveries of the sample (more than 1 makes a multi-livery PTP)")
+    parser.add_argument("--texture-mb", type=float, default=1.0, help="Size of each sample texture in MB")
+    parser.add_argument("--delay", type=float, default=0, help="Seconds the converter waits for this sample")
+    parser.add_argument("--fail", choices=FAIL_MODES, help="How the converter fails on this sample")
+    args = parser.parse_args()
+
+    if args.make_sample:
+        behaviour = {key: value for key, value in (("delay", args.delay), ("fail", args.fail)) if value}
+        make_sample(args.ptp, args.liveries, args.texture_mb, behaviour or None)
+        return 0
+    return convert(args.ptp)
+
+
+if __name__ == "__main__":
+    sys.exit(main())